@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+
+class FakeSession:
+    """Stands in for RTLSDRSession: blocks like a USB read and pays a retune delay."""
+
+    def __init__(self, sample_rate_hz: float = 2.4e6, retune_ms: float = 0.0, seed: int = 0) -> None:
+        self.sample_rate_hz = sample_rate_hz
+        self.retune_ms = retune_ms
+        self.retunes = 0
+        self._center_hz: float | None = None
+        self._rng = np.random.default_rng(seed)
+
+    def tune(self, center_hz: float) -> None:
+        if center_hz != self._center_hz:
+            self._center_hz = center_hz
+            self.retunes += 1
+            if self.retune_ms:
+                time.sleep(self.retune_ms / 1000.0)
+
+    def read_samples(self, count: int) -> np.ndarray:
+        time.sleep(count / self.sample_rate_hz)
+        return self._rng.normal(size=count) + 1j * self._rng.normal(size=count)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from antennalab.analysis.alerts import AlertEngine, AlertRule
+from antennalab.core.models import Spectrum
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def nested_scan(rules: list[AlertRule], freq_hz: list[float], max_db: list[float]) -> int:
+    hits = 0
+    for rule in rules:
+        for freq, power in zip(freq_hz, max_db):
+            if freq == rule.freq_hz and power >= rule.threshold_db:
+                hits += 1
+    return hits
+
+
+def make_rules(rng: np.random.Generator, n_rules: int, spectrum: Spectrum) -> list[AlertRule]:
+    stop_hz = spectrum.start_hz + len(spectrum) * spectrum.bin_hz
+    starts = rng.uniform(spectrum.start_hz, stop_hz, size=n_rules)
+    rules = []
+    for i, start in enumerate(starts.tolist()):
+        if i % 2:
+            rules.append(AlertRule(freq_hz=start, threshold_db=-80.0))
+        else:
+            width = float(rng.uniform(1e4, 1e6))
+            rules.append(
+                AlertRule(freq_hz=start, threshold_db=-80.0, stop_hz=start + width, field="avg")
+            )
+    return rules
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'engine':>8} {'bins':>10} {'rules':>6} {'seconds':>8}")
+    for n_bins, n_rules in ((100_000, 50), (1_000_000, 5_000)):
+        avg_db = rng.normal(-90.0, 3.0, size=n_bins)
+        spectrum = Spectrum(start_hz=24e6, bin_hz=1e3, avg_db=avg_db, max_db=avg_db + 6.0)
+        rules = make_rules(rng, n_rules, spectrum)
+        if n_bins <= 100_000:
+            freq_hz = (spectrum.start_hz + np.arange(n_bins) * spectrum.bin_hz).tolist()
+            max_db = spectrum.max_db.tolist()
+            seconds = timed(lambda: nested_scan(rules, freq_hz, max_db))
+            print(f"{'nested':>8} {n_bins:>10} {n_rules:>6} {seconds:>8.3f}")
+        engine = AlertEngine(rules)
+        cold = timed(lambda: engine.evaluate_spectrum(spectrum))
+        warm = timed(lambda: engine.evaluate_spectrum(spectrum))
+        print(f"{'indexed':>8} {n_bins:>10} {n_rules:>6} {cold:>8.3f} (warm {warm:.3f})")
+
+
+if __name__ == "__main__":
+    main()
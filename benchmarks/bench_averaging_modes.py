@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from antennalab.analysis.scan import BinAccumulator, SweepPlan
+
+REPEATS = 7
+
+
+def post_fft_cpu(plan: SweepPlan, spectra: list[np.ndarray], averaging: str) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        acc = BinAccumulator(plan.n_bins, 1, averaging=averaging)
+        start = time.process_time()
+        for spectrum, (_, valid, indices) in zip(spectra, plan.iter_centers()):
+            if averaging == "linear":
+                power = spectrum.real**2 + spectrum.imag**2
+            else:
+                power = 20 * np.log10(np.abs(spectrum) + 1e-12)
+            acc.add(0, indices, power[valid])
+        acc.finish(-120.0)
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print("CPU per 24-1700 MHz sweep after the FFT (power conversion + accumulation)")
+    print(f"{'fft_size':>8} {'db_ms':>8} {'linear_ms':>10} {'saved':>7}")
+    for fft_size in (1024, 4096, 16384, 65536):
+        plan = SweepPlan.build(
+            start_hz=24e6,
+            stop_hz=1700e6,
+            bin_hz=10e3,
+            sample_rate_hz=2.4e6,
+            fft_size=fft_size,
+            step_hz=None,
+        )
+        spectra = [
+            np.fft.fftshift(np.fft.fft(rng.normal(size=fft_size) + 1j * rng.normal(size=fft_size)))
+            for _ in range(len(plan.centers))
+        ]
+        t_db = post_fft_cpu(plan, spectra, "db")
+        t_lin = post_fft_cpu(plan, spectra, "linear")
+        print(
+            f"{fft_size:>8} {t_db * 1e3:>8.1f} {t_lin * 1e3:>10.1f} "
+            f"{(1 - t_lin / t_db) * 100:>6.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from _fake_sdr import FakeSession
+from antennalab.analysis.scan import BinAccumulator, SweepPlan, run_capture_pipeline
+
+SWEEPS = 3
+
+
+def serial(plan: SweepPlan, session: FakeSession) -> float:
+    acc = BinAccumulator(plan.n_bins, SWEEPS)
+    start = time.perf_counter()
+    for sweep in range(SWEEPS):
+        for center, valid, indices in plan.iter_centers():
+            session.tune(center)
+            samples = session.read_samples(plan.fft_size)
+            spectrum = np.fft.fftshift(np.fft.fft(samples * plan.window))
+            power = 20 * np.log10(np.abs(spectrum) + 1e-12)
+            acc.add(sweep, indices, power[valid])
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'fft_size':>8} {'serial_s':>9} {'workers':>7} {'pipe_s':>8} {'speedup':>8}  stages")
+    for fft_size in (16384, 65536, 262144):
+        plan = SweepPlan.build(
+            start_hz=88e6,
+            stop_hz=108e6,
+            bin_hz=1e3,
+            sample_rate_hz=2.4e6,
+            fft_size=fft_size,
+            step_hz=None,
+        )
+        t_serial = serial(plan, FakeSession())
+        for workers in (1, 2):
+            acc = BinAccumulator(plan.n_bins, SWEEPS)
+            timings = run_capture_pipeline(
+                FakeSession(), plan, acc, sweeps=SWEEPS, dwell_ms=0, queue_depth=4, workers=workers
+            )
+            print(
+                f"{fft_size:>8} {t_serial:>9.3f} {workers:>7} {timings.wall_sec:>8.3f} "
+                f"{t_serial / timings.wall_sec:>7.2f}x  read {timings.read_sec:.3f}s "
+                f"fft {timings.fft_sec:.3f}s acc {timings.accumulate_sec:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.analysis.compare import CompareBin, compare_to_csv
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.scan_io import read_scan, write_scan
+
+REPEATS = 3
+
+
+def make_scan(n_bins: int, seed: int) -> ScanResult:
+    rng = np.random.default_rng(seed)
+    avg_db = rng.normal(-70.0, 5.0, size=n_bins)
+    spectrum = Spectrum(start_hz=24e6, bin_hz=1e3, avg_db=avg_db, max_db=avg_db + 3.0)
+    return ScanResult(
+        timestamp=ScanResult.now_iso(),
+        start_hz=24e6,
+        stop_hz=24e6 + n_bins * 1e3,
+        bin_hz=1e3,
+        bins=spectrum,
+    )
+
+
+def legacy_compare_to_csv(scan_a: Path, scan_b: Path, out_csv: Path) -> None:
+    _, bins_a = read_scan(scan_a)
+    _, bins_b = read_scan(scan_b)
+    by_freq_b = {bin_.freq_hz: bin_ for bin_ in bins_b}
+    compare_bins: list[CompareBin] = []
+    score_accum = 0.0
+    for bin_a in bins_a:
+        bin_b = by_freq_b.get(bin_a.freq_hz)
+        if bin_b is None:
+            continue
+        delta_avg = bin_b.avg_db - bin_a.avg_db
+        compare_bins.append(CompareBin(bin_a.freq_hz, delta_avg, bin_b.max_db - bin_a.max_db))
+        score_accum += delta_avg
+    with out_csv.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["scan_a", "scan_b", "score"])
+        writer.writerow([scan_a, scan_b, f"{score_accum / max(len(compare_bins), 1):.3f}"])
+        writer.writerow(["freq_hz", "delta_avg_db", "delta_max_db"])
+        for bin_ in compare_bins:
+            writer.writerow(
+                [f"{bin_.freq_hz:.0f}", f"{bin_.delta_avg_db:.2f}", f"{bin_.delta_max_db:.2f}"]
+            )
+
+
+def best_of(func) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    print(f"{'bins':>9} {'format':>7} {'legacy_s':>9} {'engine_s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bins in (100_000, 1_000_000):
+            for suffix in (".csv", ".alscan"):
+                path_a = write_scan(make_scan(n_bins, 0), Path(tmp) / f"a_{n_bins}{suffix}")
+                path_b = write_scan(make_scan(n_bins, 1), Path(tmp) / f"b_{n_bins}{suffix}")
+                out_csv = Path(tmp) / "compare.csv"
+                t_legacy = best_of(lambda: legacy_compare_to_csv(path_a, path_b, out_csv))
+                t_engine = best_of(lambda: compare_to_csv(path_a, path_b, out_csv))
+                print(f"{n_bins:>9} {suffix[1:]:>7} {t_legacy:>9.2f} {t_engine:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from antennalab.analysis.noise_floor import NoiseFloorEstimator
+from antennalab.core.models import Spectrum
+from antennalab.report.waterfall_io import WaterfallData
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'strategy':>10} {'cells':>10} {'window':>7} {'seconds':>8}")
+    for n_bins in (1_000_000, 3_000_000):
+        avg_db = rng.normal(-90.0, 2.0, size=n_bins)
+        spectrum = Spectrum(start_hz=24e6, bin_hz=1e3, avg_db=avg_db, max_db=avg_db)
+        for strategy in ("percentile", "median"):
+            for window in (15, 31, 101, 501):
+                estimator = NoiseFloorEstimator(strategy, window_bins=window)
+                seconds = timed(lambda: estimator.estimate(spectrum))
+                print(f"{strategy:>10} {n_bins:>10} {window:>7} {seconds:>8.2f}")
+
+    grid = rng.normal(-90.0, 2.0, size=(1000, 4000)).astype(np.float32)
+    data = WaterfallData(
+        start_hz=24e6, bin_hz=1e3, timestamps=np.arange(1000.0), avg_db=grid, max_db=grid
+    )
+    for window in (32, 256):
+        estimator = NoiseFloorEstimator("minstats", window_slices=window)
+        seconds = timed(lambda: estimator.estimate_waterfall(data))
+        print(f"{'minstats':>10} {grid.size:>10} {window:>7} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
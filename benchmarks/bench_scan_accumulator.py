@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+
+from antennalab.analysis.scan import BinAccumulator, bin_indices
+
+START_HZ = 88e6
+STOP_HZ = 108e6
+SAMPLE_RATE_HZ = 2.4e6
+SWEEPS = 3
+
+
+def _frames(fft_size: int) -> list[tuple[np.ndarray, np.ndarray]]:
+    rng = np.random.default_rng(0)
+    base = np.fft.fftshift(np.fft.fftfreq(fft_size, d=1.0 / SAMPLE_RATE_HZ))
+    frames = []
+    center = START_HZ + SAMPLE_RATE_HZ / 2.0
+    while center < STOP_HZ:
+        frames.append((base + center, rng.normal(-60.0, 5.0, fft_size)))
+        center += SAMPLE_RATE_HZ * 0.8
+    return frames
+
+
+def legacy(frames, bin_hz: float) -> None:
+    n_bins = int(math.ceil((STOP_HZ - START_HZ) / bin_hz))
+    sum_bins = [0.0] * n_bins
+    count_bins = [0] * n_bins
+    max_bins = [float("-inf")] * n_bins
+    for _ in range(SWEEPS):
+        per_sweep_sum = [0.0] * n_bins
+        per_sweep_count = [0] * n_bins
+        for freqs, power in frames:
+            for freq_hz, power_db in zip(freqs, power):
+                if freq_hz < START_HZ or freq_hz >= STOP_HZ:
+                    continue
+                idx = int((freq_hz - START_HZ) // bin_hz)
+                sum_bins[idx] += float(power_db)
+                count_bins[idx] += 1
+                if power_db > max_bins[idx]:
+                    max_bins[idx] = float(power_db)
+                per_sweep_sum[idx] += float(power_db)
+                per_sweep_count[idx] += 1
+
+
+def vectorized(frames, bin_hz: float) -> None:
+    n_bins = int(math.ceil((STOP_HZ - START_HZ) / bin_hz))
+    acc = BinAccumulator(n_bins, SWEEPS)
+    for sweep in range(SWEEPS):
+        for freqs, power in frames:
+            valid, indices = bin_indices(
+                freqs, start_hz=START_HZ, stop_hz=STOP_HZ, bin_hz=bin_hz, n_bins=n_bins
+            )
+            acc.add(sweep, indices, power[valid])
+    acc.finish(-120.0)
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'fft_size':>8} {'bin_hz':>8} {'legacy_s':>10} {'numpy_s':>10} {'speedup':>8}")
+    for fft_size in (1024, 4096, 16384):
+        frames = _frames(fft_size)
+        for bin_hz in (1e3, 25e3, 100e3):
+            t_legacy = _timed(legacy, frames, bin_hz)
+            t_numpy = _timed(vectorized, frames, bin_hz)
+            print(
+                f"{fft_size:>8} {bin_hz:>8.0f} {t_legacy:>10.4f} {t_numpy:>10.4f} "
+                f"{t_legacy / t_numpy:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
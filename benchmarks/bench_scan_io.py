@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.export_csv import read_scan_csv, write_scan_csv
+from antennalab.report.scan_io import read_scan_binary, write_scan_binary
+
+REPEATS = 3
+
+
+def make_scan(n_bins: int) -> ScanResult:
+    rng = np.random.default_rng(0)
+    avg_db = rng.normal(-70.0, 5.0, size=n_bins)
+    spectrum = Spectrum(start_hz=24e6, bin_hz=1e3, avg_db=avg_db, max_db=avg_db + 3.0)
+    return ScanResult(
+        timestamp=ScanResult.now_iso(),
+        start_hz=24e6,
+        stop_hz=24e6 + n_bins * 1e3,
+        bin_hz=1e3,
+        bins=spectrum,
+    )
+
+
+def write_scan_rows(scan: ScanResult, path: Path) -> Path:
+    # The per-row csv.writer loop the bulk writer replaced.
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["timestamp", "start_hz", "stop_hz", "bin_hz", "antenna_tag", "location_tag"])
+        writer.writerow([scan.timestamp, scan.start_hz, scan.stop_hz, scan.bin_hz, "", ""])
+        writer.writerow(["freq_hz", "avg_db", "max_db"])
+        for bin_ in scan.spectrum.iter_bins():
+            writer.writerow([f"{bin_.freq_hz:.0f}", f"{bin_.avg_db:.2f}", f"{bin_.max_db:.2f}"])
+    return path
+
+
+def read_scan_rows(path: Path) -> tuple[None, Spectrum]:
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        _, values, _ = next(reader), next(reader), next(reader)
+        rows = [row for row in reader if row]
+    avg_db = np.array([float(row[1]) for row in rows])
+    max_db = np.array([float(row[2]) for row in rows])
+    return None, Spectrum(
+        start_hz=float(values[1]), bin_hz=float(values[3]), avg_db=avg_db, max_db=max_db
+    )
+
+
+def best_of(func) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    print(f"{'bins':>9} {'format':>8} {'write_s':>8} {'read_s':>8} {'size_mb':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bins in (1_000_000, 4_000_000):
+            scan = make_scan(n_bins)
+            for name, writer, reader, suffix in (
+                ("csv-rows", write_scan_rows, read_scan_rows, ".rows.csv"),
+                ("csv", write_scan_csv, read_scan_csv, ".csv"),
+                ("alscan", write_scan_binary, read_scan_binary, ".alscan"),
+            ):
+                path = Path(tmp) / f"scan_{n_bins}{suffix}"
+                t_write = best_of(lambda: writer(scan, path))
+                # Touch every value so the memory-mapped read is charged for paging it in.
+                t_read = best_of(lambda: float(reader(path)[1].avg_db.max()))
+                size_mb = path.stat().st_size / 1e6
+                print(f"{n_bins:>9} {name:>8} {t_write:>8.3f} {t_read:>8.3f} {size_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
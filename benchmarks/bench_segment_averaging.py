@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import time
+
+from _fake_sdr import FakeSession
+from antennalab.analysis.scan import BinAccumulator, SegmentLayout, SweepPlan, run_capture_pipeline
+
+FFT_SIZE = 4096
+RETUNE_MS = 30.0
+
+
+def run(plan: SweepPlan, *, sweeps: int, segments: int, overlap: float) -> tuple[float, float, int]:
+    session = FakeSession(retune_ms=RETUNE_MS)
+    acc = BinAccumulator(plan.n_bins, sweeps)
+    layout = SegmentLayout(FFT_SIZE, segments=segments, overlap=overlap)
+    start = time.perf_counter()
+    run_capture_pipeline(
+        session, plan, acc, sweeps=sweeps, dwell_ms=0, queue_depth=4, workers=1, layout=layout
+    )
+    elapsed = time.perf_counter() - start
+    avg_db = acc.finish(-120.0)[0]
+    covered = acc.count > 0
+    return elapsed, float(avg_db[covered].var()), session.retunes
+
+
+def main() -> None:
+    plan = SweepPlan.build(
+        start_hz=88e6,
+        stop_hz=108e6,
+        bin_hz=25e3,
+        sample_rate_hz=2.4e6,
+        fft_size=FFT_SIZE,
+        step_hz=None,
+    )
+    print(f"retune delay {RETUNE_MS:.0f} ms, {len(plan.centers)} centers, fft_size {FFT_SIZE}")
+    print(f"{'mode':>24} {'wall_s':>8} {'retunes':>8} {'bin_var_db2':>12}")
+    for n in (4, 16):
+        for label, sweeps, segments, overlap in (
+            (f"--sweeps {n}", n, 1, 0.0),
+            (f"--segments {n}", 1, n, 0.0),
+            (f"--segments {n} --overlap 0.5", 1, n, 0.5),
+        ):
+            elapsed, variance, retunes = run(plan, sweeps=sweeps, segments=segments, overlap=overlap)
+            print(f"{label:>24} {elapsed:>8.3f} {retunes:>8} {variance:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.analysis.waterfall import WaterfallWriter
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.waterfall_grid import stream_waterfall_csv
+
+
+def write_synthetic(path: Path, slices: int, n_bins: int) -> Path:
+    rng = np.random.default_rng(0)
+    with WaterfallWriter(path, flush_every=slices) as writer:
+        for _ in range(slices):
+            avg_db = rng.normal(-70.0, 5.0, size=n_bins)
+            spectrum = Spectrum(start_hz=100e6, bin_hz=1e3, avg_db=avg_db, max_db=avg_db + 3.0)
+            writer.append(
+                ScanResult(
+                    timestamp=ScanResult.now_iso(),
+                    start_hz=100e6,
+                    stop_hz=100e6 + n_bins * 1e3,
+                    bin_hz=1e3,
+                    bins=spectrum,
+                )
+            )
+    return path
+
+
+def legacy_grid(path: Path) -> np.ndarray:
+    rows: list[tuple[int, float, float]] = []
+    freqs: list[float] = []
+    max_slice = -1
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        next(reader)
+        for row in reader:
+            if not row:
+                continue
+            slice_index = int(row[1])
+            freq_hz = float(row[2])
+            rows.append((slice_index, freq_hz, float(row[3])))
+            if freq_hz not in freqs:
+                freqs.append(freq_hz)
+            max_slice = max(max_slice, slice_index)
+    freqs = sorted(freqs)
+    freq_index = {f: i for i, f in enumerate(freqs)}
+    grid = np.full((max_slice + 1, len(freqs)), np.nan)
+    for slice_index, freq_hz, avg_db in rows:
+        grid[slice_index, freq_index[freq_hz]] = avg_db
+    return grid
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"{'bins':>6} {'slices':>7} {'size_mb':>8} {'legacy_s':>9} {'stream_s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bins, slices, run_legacy in ((1000, 100, True), (4000, 100, True), (4000, 1000, False)):
+            path = write_synthetic(Path(tmp) / f"wf_{n_bins}_{slices}.csv", slices, n_bins)
+            size_mb = path.stat().st_size / 1e6
+            t_legacy = timed(lambda: legacy_grid(path)) if run_legacy else float("nan")
+            t_stream = timed(lambda: stream_waterfall_csv(path))
+            legacy = f"{t_legacy:>9.2f}" if run_legacy else f"{'skipped':>9}"
+            print(f"{n_bins:>6} {slices:>7} {size_mb:>8.1f} {legacy} {t_stream:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Iterable, Protocol
+from urllib.parse import urlsplit
+
+
+class AlertSink(Protocol):
+    name: str
+
+    async def send(self, batch: list[dict]) -> None: ...
+
+
+@dataclass(frozen=True)
+class DispatchStats:
+    queued: int
+    sent: int
+    dropped: int
+    failed: int
+    retries: int
+    depth: int
+    max_depth: int
+
+
+class HttpSink:
+    def __init__(self, url: str, *, timeout_sec: float = 5.0) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"unsupported webhook url (plain http only): {url}")
+        self.name = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout_sec = timeout_sec
+
+    async def send(self, batch: list[dict]) -> None:
+        body = json.dumps({"events": batch}).encode("utf-8")
+        head = (
+            f"POST {self.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout_sec
+        )
+        try:
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout_sec)
+        finally:
+            writer.close()
+        status = status_line.split()
+        if len(status) < 2 or not status[1].startswith(b"2"):
+            answer = status_line.decode("latin-1").strip()
+            raise ConnectionError(f"{self.name} answered {answer or 'nothing'}")
+
+
+class UnixSocketSink:
+    def __init__(self, path: str | Path, *, timeout_sec: float = 5.0) -> None:
+        self.name = f"unix:{path}"
+        self.path = str(path)
+        self.timeout_sec = timeout_sec
+
+    async def send(self, batch: list[dict]) -> None:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_unix_connection(self.path), self.timeout_sec
+        )
+        try:
+            writer.write("".join(json.dumps(item) + "\n" for item in batch).encode("utf-8"))
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+class JsonlSink:
+    def __init__(self, path: str | Path) -> None:
+        self.name = str(path)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    async def send(self, batch: list[dict]) -> None:
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write("".join(json.dumps(item) + "\n" for item in batch))
+
+
+def sink_from_target(target: str) -> AlertSink:
+    if target.startswith("https://"):
+        raise ValueError(f"https webhooks are not supported, use local http://: {target}")
+    if target.startswith("http://"):
+        return HttpSink(target)
+    if target.startswith("unix:"):
+        return UnixSocketSink(target[len("unix:") :])
+    if target.startswith("jsonl:"):
+        return JsonlSink(target[len("jsonl:") :])
+    if target.endswith(".jsonl"):
+        return JsonlSink(target)
+    raise ValueError(f"unrecognised alert sink: {target} (use http://, unix:, or a .jsonl path)")
+
+
+class AlertDispatcher:
+    # Runs its own event loop on a daemon thread so the capture loop only pays
+    # for a call_soon_threadsafe; a full queue drops the newest items. Counts
+    # are per item: sent once every sink took it, failed if any sink gave up.
+    def __init__(
+        self,
+        sinks: Iterable[AlertSink],
+        *,
+        queue_size: int = 1024,
+        batch_size: int = 64,
+        batch_wait_sec: float = 0.05,
+        max_retries: int = 3,
+        backoff_sec: float = 0.1,
+        backoff_max_sec: float = 2.0,
+    ) -> None:
+        self.sinks = list(sinks)
+        if not self.sinks:
+            raise ValueError("alert dispatcher needs at least one sink")
+        if queue_size <= 0 or batch_size <= 0:
+            raise ValueError("queue_size and batch_size must be positive")
+        if max_retries < 0 or backoff_sec < 0 or batch_wait_sec < 0:
+            raise ValueError("retries, backoff and batch wait must be non-negative")
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_wait_sec = batch_wait_sec
+        self.max_retries = max_retries
+        self.backoff_sec = backoff_sec
+        self.backoff_max_sec = backoff_max_sec
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._batch: list[dict] = []
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._counts = {"queued": 0, "sent": 0, "dropped": 0, "failed": 0, "retries": 0}
+        self._max_depth = 0
+
+    def __enter__(self) -> "AlertDispatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> DispatchStats:
+        with self._lock:
+            return DispatchStats(**self._counts, depth=self.depth, max_depth=self._max_depth)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("alert dispatcher already started")
+        ready = threading.Event()
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._worker = loop.create_task(self._drain())
+            ready.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="antennalab-alert-dispatch", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def submit(self, items: Iterable[object]) -> None:
+        if self._loop is None:
+            raise RuntimeError("alert dispatcher is not running")
+        payload = [asdict(item) if is_dataclass(item) else dict(item) for item in items]
+        if payload:
+            self._loop.call_soon_threadsafe(self._enqueue, payload)
+
+    def close(self, timeout_sec: float = 10.0) -> DispatchStats:
+        # Waits up to timeout_sec for the queue to drain; whatever is still in
+        # flight is cancelled and counted as failed, the rest as dropped.
+        if self._loop is None or self._thread is None:
+            return self.stats()
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(timeout_sec), self._loop)
+        try:
+            future.result(timeout_sec + 5.0)
+        except (TimeoutError, asyncio.TimeoutError):
+            future.cancel()
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout_sec)
+            self._loop = None
+        return self.stats()
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += amount
+
+    def _enqueue(self, payload: list[dict]) -> None:
+        for item in payload:
+            try:
+                self._queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self._count("dropped")
+            else:
+                self._count("queued")
+        with self._lock:
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+
+    async def _drain(self) -> None:
+        while True:
+            # The batch lives on self so a cancelled shutdown can count it.
+            self._batch = batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.batch_wait_sec
+            while len(batch) < self.batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            delivered = await asyncio.gather(*(self._send(sink, batch) for sink in self.sinks))
+            self._count("sent" if all(delivered) else "failed", len(batch))
+            self._batch = []
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _send(self, sink: AlertSink, batch: list[dict]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await sink.send(batch)
+            except Exception:  # a failing sink must not stop the worker
+                if attempt == self.max_retries:
+                    return False
+                self._count("retries")
+                await asyncio.sleep(min(self.backoff_sec * 2**attempt, self.backoff_max_sec))
+            else:
+                return True
+        return False
+
+    async def _shutdown(self, timeout_sec: float) -> None:
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout_sec)
+        except asyncio.TimeoutError:
+            pass
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._count("failed", len(self._batch))
+        self._count("dropped", self._queue.qsize())
+        self._batch = []
+        while not self._queue.empty():
+            self._queue.get_nowait()
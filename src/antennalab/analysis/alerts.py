@@ -5,13 +5,27 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable
 
-from antennalab.report.export_csv import read_scan_csv
+import numpy as np
+
+from antennalab.analysis.resample import GridSignature
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.scan_io import read_scan
+
+FIELDS = ("avg", "max")
 
 
 @dataclass(frozen=True)
 class AlertRule:
     freq_hz: float
     threshold_db: float
+    stop_hz: float | None = None
+    field: str = "max"
+
+    def __post_init__(self) -> None:
+        if self.field not in FIELDS:
+            raise ValueError(f"unsupported alert field: {self.field}")
+        if self.stop_hz is not None and self.stop_hz <= self.freq_hz:
+            raise ValueError("alert range stop_hz must be above freq_hz")
 
 
 @dataclass(frozen=True)
@@ -22,26 +36,170 @@ class AlertHit:
     threshold_db: float
 
 
+@dataclass(frozen=True)
+class AlertEvent:
+    timestamp: str
+    edge: str
+    freq_hz: float
+    power_db: float
+    threshold_db: float
+
+
+@dataclass(frozen=True, eq=False)
+class _CompiledRules:
+    first: np.ndarray
+    last: np.ndarray
+    nonempty: np.ndarray
+
+
 class AlertEngine:
     def __init__(self, rules: Iterable[AlertRule]) -> None:
-        self.rules = list(rules)
+        self.rules = sorted(rules, key=lambda rule: (rule.freq_hz, rule.stop_hz or rule.freq_hz))
+        self._rule_freq_hz = np.array([rule.freq_hz for rule in self.rules], dtype=np.float64)
+        self._rule_stop_hz = np.array(
+            [np.nan if rule.stop_hz is None else rule.stop_hz for rule in self.rules],
+            dtype=np.float64,
+        )
+        self._rule_threshold_db = np.array(
+            [rule.threshold_db for rule in self.rules], dtype=np.float64
+        )
+        self._is_range = ~np.isnan(self._rule_stop_hz)
+        self._use_avg = np.array([rule.field == "avg" for rule in self.rules], dtype=bool)
+        self._compiled: dict[GridSignature, _CompiledRules] = {}
+
+    def compile(self, grid: GridSignature) -> _CompiledRules:
+        # Each rule becomes a [first, last) bin range: point rules cover the bin
+        # holding their frequency, range rules every bin they overlap.
+        compiled = self._compiled.get(grid)
+        if compiled is None:
+            edges = grid.edges_hz
+            first = np.searchsorted(edges, self._rule_freq_hz, side="right") - 1
+            last = np.where(
+                self._is_range,
+                np.searchsorted(edges, np.nan_to_num(self._rule_stop_hz), side="left"),
+                first + 1,
+            )
+            first = np.clip(first, 0, grid.n_bins)
+            last = np.clip(last, 0, grid.n_bins)
+            compiled = _CompiledRules(first=first, last=last, nonempty=last > first)
+            self._compiled[grid] = compiled
+        return compiled
+
+    def measure(self, spectrum: Spectrum) -> np.ndarray:
+        # Peak of the selected column over each rule's bins, NaN off the grid.
+        compiled = self.compile(GridSignature.of(spectrum))
+        power_db = np.full(len(self.rules), np.nan)
+        for use_avg, column in ((False, spectrum.max_db), (True, spectrum.avg_db)):
+            selected = np.flatnonzero((self._use_avg == use_avg) & compiled.nonempty)
+            if len(selected) == 0:
+                continue
+            # Interleaved starts and stops let reduceat handle overlapping
+            # ranges; the odd results span the gaps and are discarded.
+            bounds = np.column_stack((compiled.first[selected], compiled.last[selected])).ravel()
+            padded = np.append(np.asarray(column, dtype=np.float64), np.nan)
+            power_db[selected] = np.fmax.reduceat(padded, bounds)[::2]
+        return power_db
 
     def evaluate(self, scan_csv: str | Path) -> list[AlertHit]:
-        _, bins = read_scan_csv(scan_csv)
-        hits: list[AlertHit] = []
-        now = datetime.now(timezone.utc).isoformat()
-        for rule in self.rules:
-            for bin_ in bins:
-                if bin_.freq_hz == rule.freq_hz and bin_.max_db >= rule.threshold_db:
-                    hits.append(
-                        AlertHit(
-                            timestamp=now,
-                            freq_hz=bin_.freq_hz,
-                            power_db=bin_.max_db,
-                            threshold_db=rule.threshold_db,
-                        )
-                    )
-        return hits
+        _, spectrum = read_scan(scan_csv)
+        return self.evaluate_spectrum(spectrum)
+
+    def evaluate_scan(self, scan: ScanResult) -> list[AlertHit]:
+        return self.evaluate_spectrum(scan.spectrum, timestamp=scan.timestamp)
+
+    def evaluate_spectrum(
+        self, spectrum: Spectrum, *, timestamp: str | None = None
+    ) -> list[AlertHit]:
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+        power_db = self.measure(spectrum)
+        fired = np.flatnonzero(power_db >= self._rule_threshold_db)
+        return [
+            AlertHit(
+                timestamp=timestamp,
+                freq_hz=self.peak_freq_hz(spectrum, pos, power_db[pos]),
+                power_db=float(power_db[pos]),
+                threshold_db=self.rules[pos].threshold_db,
+            )
+            for pos in fired.tolist()
+        ]
+
+    def peak_freq_hz(self, spectrum: Spectrum, pos: int, power_db: float) -> float:
+        compiled = self.compile(GridSignature.of(spectrum))
+        index = int(compiled.first[pos])
+        if self._is_range[pos] and compiled.nonempty[pos]:
+            column = spectrum.avg_db if self._use_avg[pos] else spectrum.max_db
+            index += int(np.argmax(column[index : compiled.last[pos]] == power_db))
+        return spectrum.start_hz + index * spectrum.bin_hz
+
+
+class AlertTracker:
+    def __init__(
+        self,
+        engine: AlertEngine,
+        *,
+        hysteresis_db: float = 3.0,
+        hold_sec: float = 0.0,
+        cooldown_sec: float = 0.0,
+    ) -> None:
+        if hysteresis_db < 0 or hold_sec < 0 or cooldown_sec < 0:
+            raise ValueError("hysteresis, hold and cooldown must be non-negative")
+        self.engine = engine
+        self.hysteresis_db = hysteresis_db
+        self.hold_sec = hold_sec
+        self.cooldown_sec = cooldown_sec
+        n_rules = len(engine.rules)
+        self.active = np.zeros(n_rules, dtype=bool)
+        self._pending_since = np.full(n_rules, np.nan)
+        self._last_rise = np.full(n_rules, -np.inf)
+
+    def update(self, spectrum: Spectrum, *, timestamp: str, now: float) -> list[AlertEvent]:
+        # A rule rises once power stays at or above its threshold for hold_sec
+        # (and cooldown_sec has passed since it last rose), and falls once power
+        # stays hysteresis_db below the threshold for hold_sec. Off-grid rules
+        # (NaN power) keep their state.
+        power_db = self.engine.measure(spectrum)
+        threshold_db = self.engine._rule_threshold_db
+        with np.errstate(invalid="ignore"):
+            rising = ~self.active & (power_db >= threshold_db)
+            falling = self.active & (power_db < threshold_db - self.hysteresis_db)
+        candidate = rising | falling
+        self._pending_since[~candidate] = np.nan
+        starting = candidate & np.isnan(self._pending_since)
+        self._pending_since[starting] = now
+        held = candidate & (now - self._pending_since >= self.hold_sec)
+        rises = held & rising & (now - self._last_rise >= self.cooldown_sec)
+        falls = held & falling
+        flipped = rises | falls
+        self.active[flipped] = ~self.active[flipped]
+        self._pending_since[flipped] = np.nan
+        self._last_rise[rises] = now
+
+        events = []
+        for pos in np.flatnonzero(flipped).tolist():
+            events.append(
+                AlertEvent(
+                    timestamp=timestamp,
+                    edge="rise" if rises[pos] else "fall",
+                    freq_hz=self.engine.peak_freq_hz(spectrum, pos, power_db[pos]),
+                    power_db=float(power_db[pos]),
+                    threshold_db=self.engine.rules[pos].threshold_db,
+                )
+            )
+        return events
+
+
+def _parse_rule(line: str) -> AlertRule:
+    parts = [p.strip() for p in line.split(",")]
+    if len(parts) not in (2, 3):
+        raise ValueError(f"invalid alert rule: {line}")
+    start, _, stop = parts[0].partition(":")
+    field = parts[2] if len(parts) == 3 else "max"
+    return AlertRule(
+        freq_hz=float(start),
+        threshold_db=float(parts[1]),
+        stop_hz=float(stop) if stop else None,
+        field=field,
+    )
 
 
 def load_alert_rules(path: str | Path) -> list[AlertRule]:
@@ -52,10 +210,7 @@ def load_alert_rules(path: str | Path) -> list[AlertRule]:
     for line in input_path.read_text(encoding="utf-8").splitlines():
         if not line.strip() or line.strip().startswith("#"):
             continue
-        parts = [p.strip() for p in line.split(",")]
-        if len(parts) != 2:
-            raise ValueError(f"invalid alert rule: {line}")
-        rules.append(AlertRule(freq_hz=float(parts[0]), threshold_db=float(parts[1])))
+        rules.append(_parse_rule(line))
     return rules
 
 
@@ -71,3 +226,20 @@ def write_alert_hits(hits: list[AlertHit], path: str | Path) -> Path:
 
     output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
     return output_path
+
+
+def append_alert_events(events: list[AlertEvent], path: str | Path) -> Path:
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    lines = []
+    if not output_path.exists() or output_path.stat().st_size == 0:
+        lines.append("timestamp,edge,freq_hz,power_db,threshold_db")
+    for event in events:
+        lines.append(
+            f"{event.timestamp},{event.edge},{event.freq_hz:.0f},"
+            f"{event.power_db:.2f},{event.threshold_db:.2f}"
+        )
+    if lines:
+        with output_path.open("a", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+    return output_path
@@ -1,56 +1,121 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 
-from antennalab.core.models import ScanBin, ScanResult
-from antennalab.report.export_csv import ScanMeta, read_scan_csv
+import numpy as np
+
+from antennalab.analysis.calibration_profiles import BaselineProfile, load_profiles
+from antennalab.analysis.resample import GridSignature, resample_spectrum
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.export_csv import ScanMeta
+from antennalab.report.scan_io import read_scan
 
 
 @dataclass(frozen=True)
 class Baseline:
     meta: ScanMeta
-    bins: tuple[ScanBin, ...]
+    bins: Spectrum
 
 
 def load_baseline(path: str | Path) -> Baseline:
-    meta, bins = read_scan_csv(path)
-    return Baseline(meta=meta, bins=tuple(bins))
+    meta, spectrum = read_scan(path)
+    return Baseline(meta=meta, bins=spectrum)
 
 
-def apply_baseline(scan: ScanResult, baseline: Baseline) -> ScanResult:
-    _validate_compatible(scan, baseline.meta)
-    base_by_freq = {b.freq_hz: b for b in baseline.bins}
-    adjusted: list[ScanBin] = []
-
-    for bin_ in scan.bins:
-        base = base_by_freq.get(bin_.freq_hz)
-        if base is None:
-            adjusted.append(bin_)
-            continue
-        adjusted.append(
-            ScanBin(
-                freq_hz=bin_.freq_hz,
-                avg_db=bin_.avg_db - base.avg_db,
-                max_db=bin_.max_db - base.avg_db,
-            )
+def _file_stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class BaselineStore:
+    def __init__(
+        self, profiles_path: str | Path | None = None, *, max_grids: int = 16
+    ) -> None:
+        self.profiles_path = Path(profiles_path) if profiles_path is not None else None
+        self.max_grids = max_grids
+        self.loads = 0
+        self._baselines: dict[Path, tuple[tuple[int, int], Baseline]] = {}
+        self._on_grid: OrderedDict[tuple[Path, GridSignature], tuple[Baseline, Spectrum]] = (
+            OrderedDict()
         )
+        self._profiles: tuple[tuple[int, int], dict[str, BaselineProfile]] | None = None
+
+    def get(self, path: str | Path) -> Baseline:
+        # Reloads only when the file's mtime or size changes, so long runs pick
+        # up a re-captured baseline without reparsing it every iteration.
+        key = Path(path).resolve()
+        stamp = _file_stamp(key)
+        cached = self._baselines.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        baseline = load_baseline(key)
+        self.loads += 1
+        self._baselines[key] = (stamp, baseline)
+        return baseline
+
+    def resolve_tag(self, tag: str) -> str | None:
+        if self.profiles_path is None or not self.profiles_path.exists():
+            return None
+        stamp = _file_stamp(self.profiles_path)
+        if self._profiles is None or self._profiles[0] != stamp:
+            profiles = {profile.tag: profile for profile in load_profiles(self.profiles_path)}
+            self._profiles = (stamp, profiles)
+        profile = self._profiles[1].get(tag)
+        return profile.csv_path if profile is not None else None
+
+    def on_grid(self, path: str | Path, grid: GridSignature) -> tuple[Baseline, Spectrum]:
+        # Resampled baselines are kept per (path, grid), least recently used
+        # first out; an entry is stale once its file has been reloaded.
+        baseline = self.get(path)
+        key = (Path(path).resolve(), grid)
+        cached = self._on_grid.get(key)
+        if cached is not None and cached[0] is baseline:
+            self._on_grid.move_to_end(key)
+            return cached
+        cached = (baseline, resample_spectrum(baseline.bins, grid))
+        self._on_grid[key] = cached
+        self._on_grid.move_to_end(key)
+        while len(self._on_grid) > self.max_grids:
+            self._on_grid.popitem(last=False)
+        return cached
+
+    def apply(self, scan: ScanResult, path: str | Path) -> ScanResult:
+        baseline, base = self.on_grid(path, GridSignature.of(scan.spectrum))
+        return apply_baseline(scan, baseline, base)
+
+
+def apply_baseline(
+    scan: ScanResult, baseline: Baseline, base: Spectrum | None = None
+) -> ScanResult:
+    _validate_compatible(scan, baseline.meta)
+    spectrum = scan.spectrum
+    if base is None:
+        base = resample_spectrum(baseline.bins, GridSignature.of(spectrum))
+    # Bins the baseline does not cover are left unadjusted.
+    offset = np.where(np.isfinite(base.avg_db), base.avg_db, 0.0)
+    avg_db = spectrum.avg_db - offset
+    max_db = spectrum.max_db - offset
+    adjusted = Spectrum(
+        start_hz=spectrum.start_hz,
+        bin_hz=spectrum.bin_hz,
+        avg_db=avg_db,
+        max_db=max_db,
+    )
 
     return ScanResult(
         timestamp=scan.timestamp,
         start_hz=scan.start_hz,
         stop_hz=scan.stop_hz,
         bin_hz=scan.bin_hz,
-        bins=tuple(adjusted),
+        bins=adjusted,
         antenna_tag=scan.antenna_tag,
         location_tag=scan.location_tag,
     )
 
 
 def _validate_compatible(scan: ScanResult, baseline_meta: ScanMeta) -> None:
-    if scan.start_hz != baseline_meta.start_hz:
-        raise ValueError("baseline start_hz mismatch")
-    if scan.stop_hz != baseline_meta.stop_hz:
-        raise ValueError("baseline stop_hz mismatch")
-    if scan.bin_hz != baseline_meta.bin_hz:
-        raise ValueError("baseline bin_hz mismatch")
+    # Grids may differ (the baseline is resampled); they only need to overlap.
+    if scan.start_hz >= baseline_meta.stop_hz or baseline_meta.start_hz >= scan.stop_hz:
+        raise ValueError("baseline does not overlap the scan frequency range")
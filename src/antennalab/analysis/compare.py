@@ -1,10 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
-from antennalab.core.models import ScanBin
-from antennalab.report.export_csv import ScanMeta, read_scan_csv, write_compare_csv
+import numpy as np
+
+from antennalab.analysis.resample import (
+    GridSignature,
+    crop_spectrum,
+    overlap_grid,
+    resample_spectrum,
+)
+from antennalab.core.models import Spectrum
+from antennalab.report.export_csv import ScanMeta, write_compare_csv
+from antennalab.report.scan_io import read_scan
+
+DEFAULT_BANDS = 10
 
 
 @dataclass(frozen=True)
@@ -15,57 +27,177 @@ class CompareBin:
 
 
 @dataclass(frozen=True)
+class BandScore:
+    start_hz: float
+    stop_hz: float
+    n_bins: int
+    mean_db: float
+    rms_db: float
+    max_abs_db: float
+
+
+@dataclass(frozen=True)
+class CompareScores:
+    n_bins: int
+    mean_db: float
+    rms_db: float
+    p05_db: float
+    median_db: float
+    p95_db: float
+    max_abs_db: float
+    bands: tuple[BandScore, ...] = ()
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, eq=False)
 class CompareResult:
     scan_a: Path
     scan_b: Path
-    bins: tuple[CompareBin, ...]
-    score: float
+    start_hz: float
+    bin_hz: float
+    delta_avg_db: np.ndarray
+    delta_max_db: np.ndarray
+    scores: CompareScores
 
+    @property
+    def score(self) -> float:
+        return self.scores.mean_db
 
-def compare_scans(scan_a: str | Path, scan_b: str | Path) -> CompareResult:
-    meta_a, bins_a = read_scan_csv(scan_a)
-    meta_b, bins_b = read_scan_csv(scan_b)
-    _validate_compatible(meta_a, meta_b)
+    @property
+    def freq_hz(self) -> np.ndarray:
+        return self.start_hz + np.arange(len(self.delta_avg_db)) * self.bin_hz
 
-    by_freq_b = {bin_.freq_hz: bin_ for bin_ in bins_b}
-    compare_bins: list[CompareBin] = []
-    score_accum = 0.0
-    score_count = 0
-
-    for bin_a in bins_a:
-        bin_b = by_freq_b.get(bin_a.freq_hz)
-        if bin_b is None:
-            continue
-        delta_avg = bin_b.avg_db - bin_a.avg_db
-        delta_max = bin_b.max_db - bin_a.max_db
-        compare_bins.append(
-            CompareBin(
-                freq_hz=bin_a.freq_hz,
-                delta_avg_db=delta_avg,
-                delta_max_db=delta_max,
+    @property
+    def bins(self) -> tuple[CompareBin, ...]:
+        return tuple(
+            CompareBin(freq_hz=freq_hz, delta_avg_db=delta_avg, delta_max_db=delta_max)
+            for freq_hz, delta_avg, delta_max in zip(
+                self.freq_hz.tolist(), self.delta_avg_db.tolist(), self.delta_max_db.tolist()
             )
         )
-        score_accum += delta_avg
-        score_count += 1
 
-    score = score_accum / score_count if score_count else 0.0
+
+def compare_spectra(
+    spectrum_a: Spectrum, spectrum_b: Spectrum, *, bands: int = DEFAULT_BANDS
+) -> tuple[np.ndarray, np.ndarray, CompareScores]:
+    # Scan B is mapped onto A's grid, after which bins line up by index.
+    spectrum_b = resample_spectrum(spectrum_b, GridSignature.of(spectrum_a))
+    n_bins = min(len(spectrum_a), len(spectrum_b))
+    delta_avg = np.subtract(
+        spectrum_b.avg_db[:n_bins], spectrum_a.avg_db[:n_bins], dtype=np.float64
+    )
+    delta_max = np.subtract(
+        spectrum_b.max_db[:n_bins], spectrum_a.max_db[:n_bins], dtype=np.float64
+    )
+    freq_hz = spectrum_a.start_hz + np.arange(n_bins) * spectrum_a.bin_hz
+    return delta_avg, delta_max, score_deltas(delta_avg, freq_hz, spectrum_a.bin_hz, bands=bands)
+
+
+def score_deltas(
+    delta_db: np.ndarray, freq_hz: np.ndarray, bin_hz: float, *, bands: int = DEFAULT_BANDS
+) -> CompareScores:
+    finite = np.isfinite(delta_db)
+    values = delta_db if finite.all() else delta_db[finite]
+    if len(values) == 0:
+        return CompareScores(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    p05, median, p95 = np.percentile(values, (5.0, 50.0, 95.0)).tolist()
+    return CompareScores(
+        n_bins=len(values),
+        mean_db=float(values.mean()),
+        rms_db=float(np.sqrt(np.dot(values, values) / len(values))),
+        p05_db=p05,
+        median_db=median,
+        p95_db=p95,
+        max_abs_db=float(np.abs(values).max()),
+        bands=_band_scores(delta_db, finite, freq_hz, bin_hz, bands),
+    )
+
+
+def _band_scores(
+    delta_db: np.ndarray, finite: np.ndarray, freq_hz: np.ndarray, bin_hz: float, bands: int
+) -> tuple[BandScore, ...]:
+    n_bins = len(delta_db)
+    bands = min(max(bands, 0), n_bins)
+    if bands == 0:
+        return ()
+    edges = np.linspace(0, n_bins, bands + 1).astype(np.int64)
+    starts = edges[:-1]
+    clean = np.where(finite, delta_db, 0.0)
+    counts = np.add.reduceat(finite.astype(np.int64), starts)
+    sums = np.add.reduceat(clean, starts)
+    squares = np.add.reduceat(clean * clean, starts)
+    peaks = np.maximum.reduceat(np.abs(clean), starts)
+    safe = np.maximum(counts, 1)
+    means = np.where(counts > 0, sums / safe, 0.0)
+    rms = np.where(counts > 0, np.sqrt(squares / safe), 0.0)
+    return tuple(
+        BandScore(
+            start_hz=float(freq_hz[start]),
+            stop_hz=float(freq_hz[stop - 1] + bin_hz),
+            n_bins=count,
+            mean_db=mean,
+            rms_db=band_rms,
+            max_abs_db=peak,
+        )
+        for start, stop, count, mean, band_rms, peak in zip(
+            starts.tolist(),
+            edges[1:].tolist(),
+            counts.tolist(),
+            means.tolist(),
+            rms.tolist(),
+            peaks.tolist(),
+        )
+    )
+
+
+def compare_scans(
+    scan_a: str | Path, scan_b: str | Path, *, bands: int = DEFAULT_BANDS
+) -> CompareResult:
+    meta_a, spectrum_a = read_scan(scan_a)
+    meta_b, spectrum_b = read_scan(scan_b)
+    _validate_compatible(meta_a, meta_b)
+    # Only A's bins fully covered by B are compared.
+    grid = overlap_grid(GridSignature.of(spectrum_a), GridSignature.of(spectrum_b))
+    spectrum_a = crop_spectrum(spectrum_a, grid)
+
+    delta_avg, delta_max, scores = compare_spectra(spectrum_a, spectrum_b, bands=bands)
     return CompareResult(
         scan_a=Path(scan_a),
         scan_b=Path(scan_b),
-        bins=tuple(compare_bins),
-        score=score,
+        start_hz=spectrum_a.start_hz,
+        bin_hz=spectrum_a.bin_hz,
+        delta_avg_db=delta_avg,
+        delta_max_db=delta_max,
+        scores=scores,
     )
 
 
 def _validate_compatible(meta_a: ScanMeta, meta_b: ScanMeta) -> None:
-    if meta_a.start_hz != meta_b.start_hz:
-        raise ValueError("scan start_hz mismatch")
-    if meta_a.stop_hz != meta_b.stop_hz:
-        raise ValueError("scan stop_hz mismatch")
-    if meta_a.bin_hz != meta_b.bin_hz:
-        raise ValueError("scan bin_hz mismatch")
+    # Grids may differ (scan B is resampled); they only need to overlap.
+    if meta_a.start_hz >= meta_b.stop_hz or meta_b.start_hz >= meta_a.stop_hz:
+        raise ValueError("scans do not overlap in frequency")
 
 
-def compare_to_csv(scan_a: str | Path, scan_b: str | Path, out_csv: str | Path) -> Path:
-    result = compare_scans(scan_a, scan_b)
+def compare_to_csv(
+    scan_a: str | Path,
+    scan_b: str | Path,
+    out_csv: str | Path,
+    *,
+    bands: int = DEFAULT_BANDS,
+    scores_json: str | Path | None = None,
+) -> Path:
+    result = compare_scans(scan_a, scan_b, bands=bands)
+    if scores_json is not None:
+        write_compare_scores_json(result, scores_json)
     return write_compare_csv(result, out_csv)
+
+
+def write_compare_scores_json(result: CompareResult, path: str | Path) -> Path:
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"scan_a": str(result.scan_a), "scan_b": str(result.scan_b)}
+    payload.update(result.scores.to_dict())
+    output_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    return output_path
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from antennalab.analysis.compare import _validate_compatible
+from antennalab.analysis.resample import GridSignature, resample_spectrum
+from antennalab.report.export_csv import ScanMeta
+from antennalab.report.scan_io import read_scan
+
+METRICS = ("mean", "rms", "p95")
+POOL_MIN_PAIRS = 64
+
+_pool_matrix: np.ndarray | None = None
+
+
+@dataclass(frozen=True)
+class PairScore:
+    index_a: int
+    index_b: int
+    mean_db: float
+    rms_db: float
+    p95_abs_db: float
+
+    def metric(self, name: str) -> float:
+        if name == "mean":
+            return self.mean_db
+        if name == "rms":
+            return self.rms_db
+        return self.p95_abs_db
+
+
+@dataclass(frozen=True, eq=False)
+class BatchCompareResult:
+    paths: tuple[Path, ...]
+    labels: tuple[str, ...]
+    metas: tuple[ScanMeta, ...]
+    n_bins: int
+    mean_db: np.ndarray
+    rms_db: np.ndarray
+    p95_abs_db: np.ndarray
+    pairs: tuple[PairScore, ...]
+
+    def matrix(self, metric: str) -> np.ndarray:
+        if metric == "mean":
+            return self.mean_db
+        if metric == "rms":
+            return self.rms_db
+        if metric == "p95":
+            return self.p95_abs_db
+        raise ValueError(f"unsupported metric: {metric}")
+
+    def ranked(self, metric: str = "rms") -> list[PairScore]:
+        if metric not in METRICS:
+            raise ValueError(f"unsupported metric: {metric}")
+        # A higher mean delta means B is stronger; for rms/p95 smaller is closer.
+        reverse = metric == "mean"
+        return sorted(self.pairs, key=lambda pair: pair.metric(metric), reverse=reverse)
+
+
+def scan_label(meta: ScanMeta, path: Path) -> str:
+    tags = [tag for tag in (meta.antenna_tag, meta.location_tag) if tag]
+    return "@".join(tags) if tags else path.stem
+
+
+def _unique_labels(labels: list[str], paths: Sequence[Path]) -> tuple[str, ...]:
+    # Repeated labels get the file name, then the path below the common parent,
+    # then a running number, whichever first tells them apart.
+    unique = list(labels)
+    for label in dict.fromkeys(labels):
+        rows = [row for row, other in enumerate(labels) if other == label]
+        if len(rows) < 2:
+            continue
+        resolved = [paths[row].resolve() for row in rows]
+        common = Path(os.path.commonpath(resolved))
+        others = {other for other in labels if other != label}
+        for names in (
+            [path.name for path in resolved],
+            [path.relative_to(common).as_posix() for path in resolved],
+            [str(number) for number in range(1, len(rows) + 1)],
+        ):
+            candidates = [f"{label} ({name})" for name in names]
+            if len(set(candidates)) == len(candidates) and not others & set(candidates):
+                break
+        for row, candidate in zip(rows, candidates):
+            unique[row] = candidate
+    return tuple(unique)
+
+
+def load_scan_matrix(
+    paths: Sequence[str | Path],
+) -> tuple[tuple[ScanMeta, ...], np.ndarray]:
+    if len(paths) < 2:
+        raise ValueError("compare-batch needs at least two scans")
+    metas: list[ScanMeta] = []
+    matrix: np.ndarray | None = None
+    grid: GridSignature | None = None
+    for row, path in enumerate(paths):
+        meta, spectrum = read_scan(path)
+        if grid is None:
+            grid = GridSignature.of(spectrum)
+            matrix = np.empty((len(paths), grid.n_bins), dtype=np.float64)
+        else:
+            # Every scan is mapped onto the first scan's grid.
+            _validate_compatible(metas[0], meta)
+            spectrum = resample_spectrum(spectrum, grid)
+        metas.append(meta)
+        matrix[row] = spectrum.avg_db
+    return tuple(metas), matrix
+
+
+def _pool_init(matrix: np.ndarray) -> None:
+    global _pool_matrix
+    _pool_matrix = matrix
+
+
+def _pair_p95(pairs: list[tuple[int, int]], matrix: np.ndarray | None = None) -> list[float]:
+    # Pool workers read the matrix set by _pool_init; the serial path passes it.
+    if matrix is None:
+        matrix = _pool_matrix
+    return [float(np.percentile(np.abs(matrix[b] - matrix[a]), 95.0)) for a, b in pairs]
+
+
+def _p95_scores(matrix: np.ndarray, pairs: list[tuple[int, int]], workers: int) -> list[float]:
+    if workers <= 1 or len(pairs) < POOL_MIN_PAIRS:
+        return _pair_p95(pairs, matrix)
+    chunk = -(-len(pairs) // (workers * 4))
+    chunks = [pairs[start : start + chunk] for start in range(0, len(pairs), chunk)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_pool_init, initargs=(matrix,)
+    ) as pool:
+        return [value for values in pool.map(_pair_p95, chunks) for value in values]
+
+
+def compare_matrix(
+    matrix: np.ndarray,
+    *,
+    reference: int | None = None,
+    workers: int = 1,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, tuple[PairScore, ...]]:
+    n_scans, n_bins = matrix.shape
+    finite = np.isfinite(matrix).all(axis=0)
+    if not finite.all():
+        matrix = matrix[:, finite]
+        n_bins = matrix.shape[1]
+    if n_bins == 0:
+        raise ValueError("scans share no finite bins")
+
+    # Centering each bin across scans leaves every pairwise delta unchanged and
+    # keeps the Gram-matrix RMS away from cancellation at -70 dB magnitudes.
+    centered = matrix - matrix.mean(axis=0)
+    means = centered.mean(axis=1)
+    gram = centered @ centered.T / n_bins
+    norms = np.diag(gram)
+    mean_db = means[None, :] - means[:, None]
+    rms_db = np.sqrt(np.maximum(norms[:, None] + norms[None, :] - 2.0 * gram, 0.0))
+
+    if reference is None:
+        pairs = [(a, b) for a in range(n_scans) for b in range(a + 1, n_scans)]
+    else:
+        if not 0 <= reference < n_scans:
+            raise ValueError("reference index out of range")
+        pairs = [(reference, b) for b in range(n_scans) if b != reference]
+    p95 = _p95_scores(matrix, pairs, workers)
+
+    p95_abs_db = np.full((n_scans, n_scans), np.nan)
+    np.fill_diagonal(p95_abs_db, 0.0)
+    scores = []
+    for (a, b), value in zip(pairs, p95):
+        p95_abs_db[a, b] = p95_abs_db[b, a] = value
+        scores.append(
+            PairScore(
+                index_a=a,
+                index_b=b,
+                mean_db=float(mean_db[a, b]),
+                rms_db=float(rms_db[a, b]),
+                p95_abs_db=value,
+            )
+        )
+    return mean_db, rms_db, p95_abs_db, tuple(scores)
+
+
+def compare_batch(
+    paths: Sequence[str | Path],
+    *,
+    reference: str | Path | None = None,
+    workers: int = 1,
+) -> BatchCompareResult:
+    scan_paths = [Path(path) for path in paths]
+    reference_index = None
+    if reference is not None:
+        reference_path = Path(reference).resolve()
+        resolved = [path.resolve() for path in scan_paths]
+        if reference_path in resolved:
+            reference_index = resolved.index(reference_path)
+        else:
+            scan_paths.insert(0, Path(reference))
+            reference_index = 0
+
+    metas, matrix = load_scan_matrix(scan_paths)
+    mean_db, rms_db, p95_abs_db, pairs = compare_matrix(
+        matrix, reference=reference_index, workers=workers
+    )
+    labels = [scan_label(meta, path) for meta, path in zip(metas, scan_paths)]
+    return BatchCompareResult(
+        paths=tuple(scan_paths),
+        labels=_unique_labels(labels, scan_paths),
+        metas=metas,
+        n_bins=matrix.shape[1],
+        mean_db=mean_db,
+        rms_db=rms_db,
+        p95_abs_db=p95_abs_db,
+        pairs=pairs,
+    )
+
+
+def write_score_matrix_csv(
+    result: BatchCompareResult, path: str | Path, *, metric: str = "rms"
+) -> Path:
+    values = result.matrix(metric)
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow([f"{metric}_db (B - A)", *result.labels])
+        for label, row in zip(result.labels, values.tolist()):
+            writer.writerow([label, *("" if value != value else f"{value:.3f}" for value in row)])
+    return output_path
+
+
+def write_ranked_csv(
+    result: BatchCompareResult, path: str | Path, *, metric: str = "rms"
+) -> Path:
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(
+            [
+                "rank",
+                "label_a",
+                "label_b",
+                "scan_a",
+                "scan_b",
+                "mean_db",
+                "rms_db",
+                "p95_abs_db",
+            ]
+        )
+        for rank, pair in enumerate(result.ranked(metric), start=1):
+            writer.writerow(
+                [
+                    rank,
+                    result.labels[pair.index_a],
+                    result.labels[pair.index_b],
+                    result.paths[pair.index_a],
+                    result.paths[pair.index_b],
+                    f"{pair.mean_db:.3f}",
+                    f"{pair.rms_db:.3f}",
+                    f"{pair.p95_abs_db:.3f}",
+                ]
+            )
+    return output_path
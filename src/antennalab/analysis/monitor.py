@@ -2,15 +2,26 @@ from __future__ import annotations
 
 import json
 import time
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
-from antennalab.bookmarks import load_bookmarks, match_bookmarks_to_range
+from antennalab.analysis.alert_dispatch import AlertDispatcher, sink_from_target
+from antennalab.analysis.alerts import (
+    AlertEngine,
+    AlertTracker,
+    append_alert_events,
+    load_alert_rules,
+)
+from antennalab.analysis.calibration import BaselineStore
+from antennalab.bookmarks import BookmarkCache, match_bookmarks_to_range
 from antennalab.core.models import ScanResult
+from antennalab.core.scheduler import DeadlineScheduler
 from antennalab.instruments.rtlsdr import RTLSDRPlugin
-from antennalab.report.export_csv import write_scan_csv
+from antennalab.report.scan_io import scan_suffix, write_scan
 from antennalab.report.run_report import write_run_report
+from antennalab.report.write_behind import WriteBehindWriter
 
 
 @dataclass(frozen=True)
@@ -26,20 +37,38 @@ class MonitorSettings:
     sweeps: int
     dwell_ms: int
     missing_db: float
-    interval_sec: int
+    interval_sec: float
     iterations: int
     seed: int | None
     bookmarks_file: Path | None
+    plan_cache_dir: Path | None = None
+    queue_depth: int = 4
+    workers: int = 1
+    segments: int = 1
+    overlap: float = 0.0
+    averaging: str = "db"
+    scan_format: str = "csv"
+    baseline_csv: Path | None = None
+    alert_rules: Path | None = None
+    alert_hysteresis_db: float = 3.0
+    alert_hold_sec: float = 0.0
+    alert_cooldown_sec: float = 0.0
+    alert_sinks: tuple[str, ...] = ()
+    alert_queue_size: int = 1024
+    duration_sec: float | None = None
+    write_queue_depth: int = 4
+    write_policy: str = "block"
 
 
 def _timestamp_slug() -> str:
-    return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    # Millisecond suffix keeps sub-second intervals from overwriting files.
+    return datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")[:-3]
 
 
-def _bookmark_payload(bookmarks_file: Path | None, scan: ScanResult) -> list[dict] | None:
-    if not bookmarks_file:
+def _bookmark_payload(cache: BookmarkCache | None, scan: ScanResult) -> list[dict] | None:
+    if cache is None:
         return None
-    bookmarks = load_bookmarks(bookmarks_file)
+    bookmarks = cache.get()
     if not bookmarks:
         return []
     matched = match_bookmarks_to_range(bookmarks, scan.start_hz, scan.stop_hz)
@@ -49,6 +78,13 @@ def _bookmark_payload(bookmarks_file: Path | None, scan: ScanResult) -> list[dic
     ]
 
 
+def _write_outputs(
+    scan: ScanResult, scan_path: Path, report_path: Path, bookmarks: list[dict] | None
+) -> None:
+    write_scan(scan, scan_path)
+    write_run_report(scan, report_path, bookmarks=bookmarks)
+
+
 def run_monitor(
     settings: MonitorSettings,
     *,
@@ -58,6 +94,7 @@ def run_monitor(
         raise ValueError("interval_sec must be > 0")
     if settings.iterations <= 0:
         raise ValueError("iterations must be > 0")
+    suffix = scan_suffix(settings.scan_format)
 
     out_dir.mkdir(parents=True, exist_ok=True)
     scans_dir = out_dir / "scans"
@@ -65,61 +102,140 @@ def run_monitor(
     scans_dir.mkdir(parents=True, exist_ok=True)
     reports_dir.mkdir(parents=True, exist_ok=True)
 
-    plugin = RTLSDRPlugin()
+    plugin = RTLSDRPlugin(plan_cache_dir=settings.plan_cache_dir)
+    baselines = BaselineStore()
+    bookmarks = BookmarkCache(settings.bookmarks_file) if settings.bookmarks_file else None
     records: list[dict] = []
-
-    for idx in range(settings.iterations):
-        seed = settings.seed + idx if settings.seed is not None else None
-        if settings.mode == "sim":
-            scan = plugin.scan_simulated(
-                start_hz=settings.start_hz,
-                stop_hz=settings.stop_hz,
-                bin_hz=settings.bin_hz,
-                antenna_tag=None,
-                location_tag=None,
-                seed=seed,
-            )
-        else:
-            scan = plugin.scan_real(
-                start_hz=settings.start_hz,
-                stop_hz=settings.stop_hz,
-                bin_hz=settings.bin_hz,
-                sample_rate_hz=settings.sample_rate_hz,
-                gain_db=settings.gain_db,
-                fft_size=settings.fft_size,
-                step_hz=settings.step_hz,
-                sweeps=settings.sweeps,
-                dwell_ms=settings.dwell_ms,
-                missing_db=settings.missing_db,
-                antenna_tag=None,
-                location_tag=None,
-            )
-
-        stamp = _timestamp_slug()
-        scan_path = scans_dir / f"scan_{stamp}.csv"
-        report_path = reports_dir / f"report_{stamp}.json"
-
-        write_scan_csv(scan, scan_path)
-        bookmarks_payload = _bookmark_payload(settings.bookmarks_file, scan)
-        write_run_report(scan, report_path, bookmarks=bookmarks_payload)
-
-        records.append({
-            "timestamp": scan.timestamp,
-            "scan_csv": str(scan_path),
-            "report_json": str(report_path),
-        })
-
-        if idx < settings.iterations - 1:
-            time.sleep(settings.interval_sec)
+    tracker = None
+    alerts_path = out_dir / "alerts.csv"
+    if settings.alert_rules is not None:
+        tracker = AlertTracker(
+            AlertEngine(load_alert_rules(settings.alert_rules)),
+            hysteresis_db=settings.alert_hysteresis_db,
+            hold_sec=settings.alert_hold_sec,
+            cooldown_sec=settings.alert_cooldown_sec,
+        )
+    dispatcher = None
+    if tracker is not None and settings.alert_sinks:
+        dispatcher = AlertDispatcher(
+            [sink_from_target(target) for target in settings.alert_sinks],
+            queue_size=settings.alert_queue_size,
+        )
+        dispatcher.start()
+
+    scheduler = DeadlineScheduler(
+        settings.interval_sec, iterations=settings.iterations, duration_sec=settings.duration_sec
+    )
+    # Scan and report files are written behind the capture loop.
+    writer = WriteBehindWriter(
+        queue_depth=settings.write_queue_depth, policy=settings.write_policy
+    )
+    writer.start()
+    dispatch_stats = None
+    try:
+        with plugin.open_session() as session:
+            for tick in scheduler:
+                idx = tick.index
+                seed = settings.seed + idx if settings.seed is not None else None
+                if settings.mode == "sim":
+                    scan = plugin.scan_simulated(
+                        start_hz=settings.start_hz,
+                        stop_hz=settings.stop_hz,
+                        bin_hz=settings.bin_hz,
+                        antenna_tag=None,
+                        location_tag=None,
+                        seed=seed,
+                    )
+                else:
+                    scan = plugin.scan_real(
+                        start_hz=settings.start_hz,
+                        stop_hz=settings.stop_hz,
+                        bin_hz=settings.bin_hz,
+                        sample_rate_hz=settings.sample_rate_hz,
+                        gain_db=settings.gain_db,
+                        fft_size=settings.fft_size,
+                        step_hz=settings.step_hz,
+                        sweeps=settings.sweeps,
+                        dwell_ms=settings.dwell_ms,
+                        missing_db=settings.missing_db,
+                        antenna_tag=None,
+                        location_tag=None,
+                        session=session,
+                        queue_depth=settings.queue_depth,
+                        workers=settings.workers,
+                        segments=settings.segments,
+                        overlap=settings.overlap,
+                        averaging=settings.averaging,
+                    )
+
+                if settings.baseline_csv is not None:
+                    scan = baselines.apply(scan, settings.baseline_csv)
+
+                alert_record: dict = {}
+                if tracker is not None:
+                    # Rules run on the in-memory scan before anything is written.
+                    started = time.perf_counter()
+                    events = tracker.update(
+                        scan.spectrum, timestamp=scan.timestamp, now=time.monotonic()
+                    )
+                    if events:
+                        # Alert edges are never dropped, even under the drop policy.
+                        writer.submit(
+                            partial(append_alert_events, events, alerts_path), policy="block"
+                        )
+                    if dispatcher is not None:
+                        dispatcher.submit(events)
+                    alert_record = {
+                        "alert_events": len(events),
+                        "alert_latency_ms": (time.perf_counter() - started) * 1000.0,
+                    }
+                    if dispatcher is not None:
+                        alert_record["alert_queue_depth"] = dispatcher.depth
+
+                stamp = _timestamp_slug()
+                scan_path = scans_dir / f"scan_{stamp}{suffix}"
+                report_path = reports_dir / f"report_{stamp}.json"
+
+                bookmarks_payload = _bookmark_payload(bookmarks, scan)
+                queued = writer.submit(
+                    partial(_write_outputs, scan, scan_path, report_path, bookmarks_payload)
+                )
+
+                record = {
+                    "timestamp": scan.timestamp,
+                    "scan_csv": str(scan_path),
+                    "report_json": str(report_path),
+                    "slot": tick.slot,
+                    "lateness_ms": tick.lateness_sec * 1000.0,
+                    "missed_before": tick.missed_before,
+                    "queued": queued,
+                    **alert_record,
+                }
+                if settings.mode != "sim" and plugin.last_timings is not None:
+                    record["capture_timings"] = asdict(plugin.last_timings)
+                records.append(record)
+    finally:
+        # Each close is guarded so a failing one never skips the other.
+        try:
+            if dispatcher is not None:
+                dispatch_stats = asdict(dispatcher.close())
+        finally:
+            writer_stats = writer.close()
 
     summary = {
         "created_at": datetime.now(timezone.utc).isoformat(),
         "iterations": settings.iterations,
         "interval_sec": settings.interval_sec,
+        "duration_sec": settings.duration_sec,
+        "schedule": asdict(scheduler.stats()),
         "mode": settings.mode,
         "start_hz": settings.start_hz,
         "stop_hz": settings.stop_hz,
         "bin_hz": settings.bin_hz,
+        "baseline_csv": str(settings.baseline_csv) if settings.baseline_csv else None,
+        "alerts_csv": str(alerts_path) if tracker is not None else None,
+        "alert_dispatch": dispatch_stats,
+        "writer": asdict(writer_stats),
         "records": records,
     }
     summary_path = out_dir / "summary.json"
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import warnings
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Sequence
 
-from antennalab.core.models import ScanBin
-from antennalab.report.export_csv import read_scan_csv, write_noise_floor_csv
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from antennalab.core.models import ScanBin, Spectrum
+from antennalab.report.export_csv import ScanMeta, write_noise_floor_csv
+from antennalab.report.scan_io import read_scan
+from antennalab.report.waterfall_io import WaterfallData, read_waterfall
+
+STRATEGIES = ("avg", "percentile", "median", "minstats")
+
+_CHUNK_ROWS = 1 << 16
+_SELECT_ROWS = 1 << 12
+_PARTITION_MAX_WINDOW = 64
+_CHUNK_CELLS = 1 << 22
 
 
 @dataclass(frozen=True)
@@ -13,34 +27,238 @@ class NoiseFloorBin:
     noise_floor_db: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class NoiseFloorResult:
     source_scan: Path
-    bins: tuple[NoiseFloorBin, ...]
+    start_hz: float
+    bin_hz: float
+    noise_floor_db: np.ndarray
+
+    @property
+    def freq_hz(self) -> np.ndarray:
+        return self.start_hz + np.arange(len(self.noise_floor_db)) * self.bin_hz
+
+    @property
+    def bins(self) -> tuple[NoiseFloorBin, ...]:
+        return tuple(
+            NoiseFloorBin(freq_hz=freq_hz, noise_floor_db=value)
+            for freq_hz, value in zip(self.freq_hz.tolist(), self.noise_floor_db.tolist())
+        )
 
 
 class NoiseFloorEstimator:
-    def __init__(self, strategy: str = "avg") -> None:
+    def __init__(
+        self,
+        strategy: str = "avg",
+        *,
+        window_bins: int = 31,
+        percentile: float = 10.0,
+        smooth_slices: int = 4,
+        window_slices: int = 32,
+    ) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unsupported strategy: {strategy}")
+        if window_bins <= 0 or smooth_slices <= 0 or window_slices <= 0:
+            raise ValueError("window sizes must be positive")
+        if not 0.0 <= percentile <= 100.0:
+            raise ValueError("percentile must be between 0 and 100")
         self.strategy = strategy
+        self.window_bins = window_bins
+        self.percentile = percentile
+        self.smooth_slices = smooth_slices
+        self.window_slices = window_slices
 
-    def estimate(self, scan_bins: list[ScanBin]) -> NoiseFloorResult:
-        if self.strategy != "avg":
-            raise ValueError(f"unsupported strategy: {self.strategy}")
-        bins = tuple(
-            NoiseFloorBin(freq_hz=bin_.freq_hz, noise_floor_db=bin_.avg_db)
-            for bin_ in scan_bins
+    def estimate(
+        self, scan_bins: Spectrum | Sequence[ScanBin], *, bin_hz: float | None = None
+    ) -> NoiseFloorResult:
+        if self.strategy == "minstats":
+            raise ValueError("minstats needs waterfall input; use estimate_waterfall")
+        spectrum = _as_spectrum(scan_bins, bin_hz)
+        avg_db = np.asarray(spectrum.avg_db, dtype=np.float64)
+        if self.strategy == "avg":
+            floor = avg_db.copy()
+        else:
+            q = 50.0 if self.strategy == "median" else self.percentile
+            floor = sliding_percentile(avg_db, self.window_bins, q)
+        return NoiseFloorResult(
+            source_scan=Path(""),
+            start_hz=spectrum.start_hz,
+            bin_hz=spectrum.bin_hz,
+            noise_floor_db=floor,
         )
-        return NoiseFloorResult(source_scan=Path(""), bins=bins)
+
+    def estimate_waterfall(self, data: WaterfallData) -> NoiseFloorResult:
+        if self.strategy != "minstats":
+            raise ValueError(f"strategy {self.strategy} works on a single scan, not a waterfall")
+        floor = np.empty(data.n_bins, dtype=np.float64)
+        step = max(1, _CHUNK_CELLS // max(data.n_slices, 1))
+        for start in range(0, data.n_bins, step):
+            block = np.asarray(data.avg_db[:, start : start + step], dtype=np.float64)
+            track = minimum_statistics(block, self.smooth_slices, self.window_slices)
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="All-NaN slice encountered")
+                floor[start : start + step] = np.nanmedian(track, axis=0)
+        return NoiseFloorResult(
+            source_scan=Path(""),
+            start_hz=data.start_hz,
+            bin_hz=data.bin_hz,
+            noise_floor_db=floor,
+        )
+
+
+def sliding_percentile(values: np.ndarray, window: int, q: float) -> np.ndarray:
+    # Centred window with edge padding; NaN sorts last, so it only wins when
+    # the window has too few real values to reach the requested rank. Narrow
+    # windows partition each window directly (O(n*w)); wider ones use a
+    # wavelet matrix, O(n log w).
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return values.copy()
+    window = min(window, 2 * n - 1) | 1
+    half = window // 2
+    rank = int(round(q / 100.0 * (window - 1)))
+    padded = np.pad(values, half, mode="edge")
+    out = np.empty(n, dtype=np.float64)
+    if window < _PARTITION_MAX_WINDOW:
+        for start in range(0, n, _CHUNK_ROWS):
+            stop = min(n, start + _CHUNK_ROWS)
+            view = sliding_window_view(padded[start : stop + window - 1], window)
+            out[start:stop] = np.partition(view, rank, axis=1)[:, rank]
+        return out
+    step = max(_SELECT_ROWS, 4 * window)
+    for start in range(0, n, step):
+        stop = min(n, start + step)
+        out[start:stop] = _window_select(padded[start : stop + window - 1], window, rank)
+    return out
+
+
+def _window_select(values: np.ndarray, window: int, rank: int) -> np.ndarray:
+    # Value of the given rank in every length-window run of values. Values
+    # are replaced by their sort positions and split bit by bit, high bit
+    # first; each level keeps where the zeros fall, so a window's rank is
+    # found in one step per bit for all windows at once.
+    m = len(values)
+    order = np.argsort(values, kind="stable").astype(np.int32)
+    codes = np.empty(m, dtype=np.int32)
+    codes[order] = np.arange(m, dtype=np.int32)
+    levels = []
+    for bit in range(max(1, (m - 1).bit_length()) - 1, -1, -1):
+        zero = (codes >> bit) & 1 == 0
+        zeros_before = np.zeros(m + 1, dtype=np.int32)
+        np.cumsum(zero, out=zeros_before[1:])
+        levels.append((zeros_before, int(zeros_before[-1])))
+        codes = np.concatenate((codes[zero], codes[~zero]))
+
+    lo = np.arange(m - window + 1, dtype=np.int32)
+    hi = lo + np.int32(window)
+    k = np.full(len(lo), rank, dtype=np.int32)
+    found = np.zeros(len(lo), dtype=np.int32)
+    for zeros_before, total in levels:
+        zero_lo = zeros_before[lo]
+        zero_hi = zeros_before[hi]
+        zeros = zero_hi - zero_lo
+        one = k >= zeros
+        found <<= 1
+        found += one
+        k -= zeros * one
+        np.copyto(zero_lo, lo - zero_lo + total, where=one)
+        np.copyto(zero_hi, hi - zero_hi + total, where=one)
+        lo, hi = zero_lo, zero_hi
+    return values[order[found]]
+
+
+def running_min(values: np.ndarray, window: int) -> np.ndarray:
+    # van Herk / Gil-Werman: block prefix and suffix minima give every window
+    # minimum in O(n) regardless of the window length. Runs along axis 0.
+    values = np.where(np.isnan(values), np.inf, values)
+    n = values.shape[0]
+    window = min(window, n)
+    blocks = -(-n // window)
+    padded = np.full((blocks * window,) + values.shape[1:], np.inf)
+    padded[:n] = values
+    shaped = padded.reshape((blocks, window) + values.shape[1:])
+    prefix = np.minimum.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = np.minimum.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    out = np.minimum(suffix[: n - window + 1], prefix[window - 1 : n])
+    out[np.isinf(out)] = np.nan
+    return out
+
+
+def minimum_statistics(grid_db: np.ndarray, smooth_slices: int, window_slices: int) -> np.ndarray:
+    # Martin-style minimum statistics: smooth linear power over time, then
+    # track the minimum over a sliding window of slices, per frequency bin.
+    grid_db = np.asarray(grid_db, dtype=np.float64)
+    n_slices = grid_db.shape[0]
+    if n_slices == 0:
+        return grid_db.copy()
+    smooth_slices = min(smooth_slices, n_slices)
+    finite = np.isfinite(grid_db)
+    power = np.where(finite, np.power(10.0, np.where(finite, grid_db, 0.0) / 10.0), 0.0)
+    zeros = np.zeros((1,) + grid_db.shape[1:])
+    power_sum = np.concatenate((zeros, np.cumsum(power, axis=0)))
+    counts = np.concatenate((zeros, np.cumsum(finite, axis=0)))
+    window_power = power_sum[smooth_slices:] - power_sum[:-smooth_slices]
+    window_counts = counts[smooth_slices:] - counts[:-smooth_slices]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        smoothed = np.where(window_counts > 0, window_power / window_counts, np.nan)
+    minima = running_min(smoothed, window_slices)
+    with np.errstate(divide="ignore"):
+        return 10.0 * np.log10(minima)
+
+
+def _as_spectrum(scan_bins: Spectrum | Sequence[ScanBin], bin_hz: float | None) -> Spectrum:
+    if isinstance(scan_bins, Spectrum):
+        return scan_bins
+    # Plain bins carry no grid, so it must come from the caller's scan metadata
+    # or from evenly spaced frequencies.
+    freq_hz = np.array([bin_.freq_hz for bin_ in scan_bins], dtype=np.float64)
+    spacing = np.diff(freq_hz)
+    if bin_hz is None:
+        if len(spacing) == 0:
+            raise ValueError("bin_hz is required for fewer than two scan bins")
+        bin_hz = float(spacing[0])
+    if bin_hz <= 0 or not np.allclose(spacing, bin_hz, rtol=1e-9, atol=1e-6):
+        raise ValueError("scan bins are not evenly spaced at bin_hz")
+    start_hz = float(freq_hz[0]) if len(freq_hz) else 0.0
+    return Spectrum.from_bins(scan_bins, start_hz=start_hz, bin_hz=bin_hz)
+
+
+def _waterfall_meta(data: WaterfallData) -> ScanMeta:
+    return ScanMeta(
+        timestamp=data.iso_timestamp(0) if data.n_slices else "",
+        start_hz=data.start_hz,
+        stop_hz=data.stop_hz,
+        bin_hz=data.bin_hz,
+        antenna_tag=None,
+        location_tag=None,
+    )
 
 
 def estimate_noise_floor(
     scan_csv: str | Path,
     out_csv: str | Path,
     strategy: str = "avg",
+    *,
+    window_bins: int = 31,
+    percentile: float = 10.0,
+    smooth_slices: int = 4,
+    window_slices: int = 32,
 ) -> Path:
-    scan_meta, scan_bins = read_scan_csv(scan_csv)
-    estimator = NoiseFloorEstimator(strategy=strategy)
-    result = estimator.estimate(scan_bins)
+    estimator = NoiseFloorEstimator(
+        strategy=strategy,
+        window_bins=window_bins,
+        percentile=percentile,
+        smooth_slices=smooth_slices,
+        window_slices=window_slices,
+    )
+    if strategy == "minstats":
+        data = read_waterfall(scan_csv)
+        scan_meta = _waterfall_meta(data)
+        result = estimator.estimate_waterfall(data)
+    else:
+        scan_meta, scan_bins = read_scan(scan_csv)
+        result = estimator.estimate(scan_bins)
     return write_noise_floor_csv(
         result,
         out_csv,
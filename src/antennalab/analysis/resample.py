@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from antennalab.core.models import ScanResult, Spectrum
+
+# Fraction of a source bin below which an edge overlap is treated as rounding.
+_EDGE_TOLERANCE = 1e-9
+
+
+@dataclass(frozen=True)
+class GridSignature:
+    start_hz: float
+    bin_hz: float
+    n_bins: int
+
+    @classmethod
+    def of(cls, spectrum: Spectrum) -> "GridSignature":
+        return cls(
+            start_hz=float(spectrum.start_hz), bin_hz=float(spectrum.bin_hz), n_bins=len(spectrum)
+        )
+
+    @property
+    def stop_hz(self) -> float:
+        return self.start_hz + self.n_bins * self.bin_hz
+
+    @property
+    def edges_hz(self) -> np.ndarray:
+        return self.start_hz + np.arange(self.n_bins + 1) * self.bin_hz
+
+    def overlaps(self, other: "GridSignature") -> bool:
+        return self.start_hz < other.stop_hz and other.start_hz < self.stop_hz
+
+
+def _interpolate(source: Spectrum, target: GridSignature) -> tuple[np.ndarray, np.ndarray]:
+    # Finer target: linear in dB between source bin centres; max keeps the
+    # containing source bin since a peak can sit anywhere inside it.
+    src_centres = source.start_hz + (np.arange(len(source)) + 0.5) * source.bin_hz
+    centres = target.start_hz + (np.arange(target.n_bins) + 0.5) * target.bin_hz
+    avg = np.asarray(source.avg_db, dtype=np.float64)
+    finite = np.isfinite(avg)
+    if finite.any():
+        avg_db = np.interp(centres, src_centres[finite], avg[finite])
+    else:
+        avg_db = np.full(target.n_bins, np.nan)
+    index = np.floor((centres - source.start_hz) / source.bin_hz).astype(np.int64)
+    inside = (index >= 0) & (index < len(source))
+    max_db = np.full(target.n_bins, np.nan)
+    max_db[inside] = source.max_db[index[inside]]
+    avg_db[~inside] = np.nan
+    return avg_db, max_db
+
+
+def _rebin(source: Spectrum, target: GridSignature) -> tuple[np.ndarray, np.ndarray]:
+    # Coarser target: average linear power weighted by the overlap of each
+    # source bin, via cumulative integrals evaluated at the target edges.
+    avg = np.asarray(source.avg_db, dtype=np.float64)
+    finite = np.isfinite(avg)
+    power = np.where(finite, np.power(10.0, np.where(finite, avg, 0.0) / 10.0), 0.0)
+    width = finite * source.bin_hz
+    src_edges = source.start_hz + np.arange(len(source) + 1) * source.bin_hz
+    energy = np.concatenate(([0.0], np.cumsum(power * source.bin_hz)))
+    covered = np.concatenate(([0.0], np.cumsum(width)))
+    edges = target.edges_hz
+    energy_at = np.interp(edges, src_edges, energy)
+    covered_at = np.interp(edges, src_edges, covered)
+    band_energy = np.diff(energy_at)
+    band_width = np.diff(covered_at)
+    has_data = band_width > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        density = band_energy / np.where(has_data, band_width, 1.0)
+        avg_db = np.where(has_data, 10.0 * np.log10(density), np.nan)
+
+    position = (edges - source.start_hz) / source.bin_hz
+    first = np.floor(position[:-1] + _EDGE_TOLERANCE).astype(np.int64)
+    last = np.ceil(position[1:] - _EDGE_TOLERANCE).astype(np.int64)
+    first = np.clip(first, 0, len(source))
+    last = np.clip(last, 0, len(source))
+    nonempty = last > first
+    # Interleaving starts and stops lets reduceat handle overlapping runs; the
+    # even results are the per-target maxima, the odd ones are discarded.
+    bounds = np.column_stack((first, last)).ravel()
+    padded = np.append(np.asarray(source.max_db, dtype=np.float64), np.nan)
+    peaks = np.fmax.reduceat(padded, bounds)[::2]
+    max_db = np.where(nonempty, peaks, np.nan)
+    return avg_db, max_db
+
+
+def overlap_grid(grid: GridSignature, other: GridSignature) -> GridSignature:
+    # The bins of grid that lie entirely inside other's frequency range.
+    first = math.ceil((other.start_hz - grid.start_hz) / grid.bin_hz - _EDGE_TOLERANCE)
+    last = math.floor((other.stop_hz - grid.start_hz) / grid.bin_hz + _EDGE_TOLERANCE)
+    first = min(max(first, 0), grid.n_bins)
+    last = min(max(last, 0), grid.n_bins)
+    if last <= first:
+        raise ValueError("scans do not share a full bin of frequency range")
+    return GridSignature(
+        start_hz=grid.start_hz + first * grid.bin_hz, bin_hz=grid.bin_hz, n_bins=last - first
+    )
+
+
+def crop_spectrum(spectrum: Spectrum, grid: GridSignature) -> Spectrum:
+    if GridSignature.of(spectrum) == grid:
+        return spectrum
+    first = int(round((grid.start_hz - spectrum.start_hz) / spectrum.bin_hz))
+    stop = first + grid.n_bins
+    return Spectrum(
+        start_hz=grid.start_hz,
+        bin_hz=grid.bin_hz,
+        avg_db=spectrum.avg_db[first:stop],
+        max_db=spectrum.max_db[first:stop],
+    )
+
+
+def resample_spectrum(source: Spectrum, target: GridSignature) -> Spectrum:
+    if GridSignature.of(source) == target:
+        return source
+    if len(source) == 0:
+        avg_db = np.full(target.n_bins, np.nan)
+        max_db = avg_db.copy()
+    elif target.bin_hz < source.bin_hz:
+        avg_db, max_db = _interpolate(source, target)
+    else:
+        avg_db, max_db = _rebin(source, target)
+    return Spectrum(start_hz=target.start_hz, bin_hz=target.bin_hz, avg_db=avg_db, max_db=max_db)
+
+
+def resample_scan(scan: ScanResult, target: GridSignature) -> ScanResult:
+    spectrum = resample_spectrum(scan.spectrum, target)
+    return ScanResult(
+        timestamp=scan.timestamp,
+        start_hz=target.start_hz,
+        stop_hz=target.stop_hz,
+        bin_hz=target.bin_hz,
+        bins=spectrum,
+        antenna_tag=scan.antenna_tag,
+        location_tag=scan.location_tag,
+    )
+
+
+def bin_indices(grid: GridSignature, freq_hz: np.ndarray) -> np.ndarray:
+    index = np.floor((np.asarray(freq_hz, dtype=np.float64) - grid.start_hz) / grid.bin_hz)
+    index = index.astype(np.int64)
+    index[(index < 0) | (index >= grid.n_bins)] = -1
+    return index
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+PLAN_FORMAT_VERSION = 1
+AVERAGING_MODES = ("db", "linear")
+
+
+def bin_indices(
+    freqs: np.ndarray,
+    *,
+    start_hz: float,
+    stop_hz: float,
+    bin_hz: float,
+    n_bins: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    valid = (freqs >= start_hz) & (freqs < stop_hz)
+    indices = np.floor_divide(freqs[valid] - start_hz, bin_hz).astype(np.intp)
+    in_range = (indices >= 0) & (indices < n_bins)
+    if not in_range.all():
+        valid[np.flatnonzero(valid)[~in_range]] = False
+        indices = indices[in_range]
+    return valid, indices
+
+
+@dataclass(frozen=True, eq=False)
+class SweepPlan:
+    start_hz: float
+    stop_hz: float
+    bin_hz: float
+    sample_rate_hz: float
+    fft_size: int
+    step_hz: float
+    n_bins: int
+    centers: np.ndarray
+    masks: np.ndarray
+    indices: tuple[np.ndarray, ...]
+    window: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        *,
+        start_hz: float,
+        stop_hz: float,
+        bin_hz: float,
+        sample_rate_hz: float,
+        fft_size: int,
+        step_hz: float | None,
+    ) -> "SweepPlan":
+        step = step_hz or sample_rate_hz * 0.8
+        n_bins = int(math.ceil((stop_hz - start_hz) / bin_hz))
+        offsets = np.fft.fftshift(np.fft.fftfreq(fft_size, d=1.0 / sample_rate_hz))
+
+        centers: list[float] = []
+        center = start_hz + sample_rate_hz / 2.0
+        while center < stop_hz:
+            centers.append(center)
+            center += step
+
+        masks = np.zeros((len(centers), fft_size), dtype=bool)
+        indices: list[np.ndarray] = []
+        for row, center in enumerate(centers):
+            valid, idx = bin_indices(
+                offsets + center,
+                start_hz=start_hz,
+                stop_hz=stop_hz,
+                bin_hz=bin_hz,
+                n_bins=n_bins,
+            )
+            masks[row] = valid
+            indices.append(idx)
+
+        return cls(
+            start_hz=float(start_hz),
+            stop_hz=float(stop_hz),
+            bin_hz=float(bin_hz),
+            sample_rate_hz=float(sample_rate_hz),
+            fft_size=int(fft_size),
+            step_hz=float(step),
+            n_bins=n_bins,
+            centers=np.asarray(centers, dtype=np.float64),
+            masks=masks,
+            indices=tuple(indices),
+            window=np.hanning(fft_size),
+        )
+
+    @property
+    def params(self) -> tuple[float, float, float, float, int, float]:
+        return (
+            self.start_hz,
+            self.stop_hz,
+            self.bin_hz,
+            self.sample_rate_hz,
+            self.fft_size,
+            self.step_hz,
+        )
+
+    @property
+    def key(self) -> str:
+        return plan_key(*self.params)
+
+    def iter_centers(self) -> Iterator[tuple[float, np.ndarray, np.ndarray]]:
+        for row, center in enumerate(self.centers.tolist()):
+            yield center, self.masks[row], self.indices[row]
+
+    def save(self, path: str | Path) -> Path:
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        lengths = np.array([len(idx) for idx in self.indices], dtype=np.int64)
+        flat = np.concatenate(self.indices) if self.indices else np.zeros(0, dtype=np.intp)
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            np.savez(
+                handle,
+                version=np.array(PLAN_FORMAT_VERSION),
+                params=np.array(self.params, dtype=np.float64),
+                n_bins=np.array(self.n_bins),
+                centers=self.centers,
+                masks=self.masks,
+                lengths=lengths,
+                indices=flat,
+            )
+        tmp_path.replace(output_path)
+        return output_path
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SweepPlan":
+        with np.load(Path(path)) as data:
+            if int(data["version"]) != PLAN_FORMAT_VERSION:
+                raise ValueError("unsupported sweep plan version")
+            start_hz, stop_hz, bin_hz, sample_rate_hz, fft_size, step_hz = data["params"].tolist()
+            lengths = data["lengths"]
+            flat = data["indices"].astype(np.intp)
+            centers = data["centers"]
+            masks = data["masks"]
+            n_bins = int(data["n_bins"])
+        bounds = np.concatenate(([0], np.cumsum(lengths)))
+        indices = tuple(flat[bounds[i] : bounds[i + 1]] for i in range(len(lengths)))
+        return cls(
+            start_hz=start_hz,
+            stop_hz=stop_hz,
+            bin_hz=bin_hz,
+            sample_rate_hz=sample_rate_hz,
+            fft_size=int(fft_size),
+            step_hz=step_hz,
+            n_bins=n_bins,
+            centers=centers,
+            masks=masks,
+            indices=indices,
+            window=np.hanning(int(fft_size)),
+        )
+
+
+def plan_key(
+    start_hz: float,
+    stop_hz: float,
+    bin_hz: float,
+    sample_rate_hz: float,
+    fft_size: int,
+    step_hz: float,
+) -> str:
+    raw = repr(
+        (
+            PLAN_FORMAT_VERSION,
+            float(start_hz),
+            float(stop_hz),
+            float(bin_hz),
+            float(sample_rate_hz),
+            int(fft_size),
+            float(step_hz),
+        )
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def get_sweep_plan(
+    *,
+    start_hz: float,
+    stop_hz: float,
+    bin_hz: float,
+    sample_rate_hz: float,
+    fft_size: int,
+    step_hz: float | None,
+    cache_dir: str | Path | None = None,
+) -> SweepPlan:
+    step = step_hz or sample_rate_hz * 0.8
+    return _cached_plan(
+        float(start_hz),
+        float(stop_hz),
+        float(bin_hz),
+        float(sample_rate_hz),
+        int(fft_size),
+        float(step),
+        str(cache_dir) if cache_dir is not None else None,
+    )
+
+
+@lru_cache(maxsize=16)
+def _cached_plan(
+    start_hz: float,
+    stop_hz: float,
+    bin_hz: float,
+    sample_rate_hz: float,
+    fft_size: int,
+    step_hz: float,
+    cache_dir: str | None,
+) -> SweepPlan:
+    params = (start_hz, stop_hz, bin_hz, sample_rate_hz, fft_size, step_hz)
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"sweep_plan_{plan_key(*params)}.npz"
+        if cache_path.exists():
+            try:
+                plan = SweepPlan.load(cache_path)
+            except (OSError, ValueError, KeyError):
+                plan = None
+            if plan is not None and plan.params == params:
+                return plan
+
+    plan = SweepPlan.build(
+        start_hz=start_hz,
+        stop_hz=stop_hz,
+        bin_hz=bin_hz,
+        sample_rate_hz=sample_rate_hz,
+        fft_size=fft_size,
+        step_hz=step_hz,
+    )
+    if cache_path is not None:
+        plan.save(cache_path)
+    return plan
+
+
+@dataclass(frozen=True)
+class SegmentLayout:
+    fft_size: int
+    segments: int = 1
+    overlap: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.fft_size <= 0:
+            raise ValueError("fft_size must be positive")
+        if self.segments <= 0:
+            raise ValueError("segments must be positive")
+        if not 0.0 <= self.overlap < 1.0:
+            raise ValueError("overlap must be in [0, 1)")
+
+    @property
+    def hop(self) -> int:
+        return max(1, int(round(self.fft_size * (1.0 - self.overlap))))
+
+    @property
+    def block_size(self) -> int:
+        return self.fft_size + (self.segments - 1) * self.hop
+
+    def power_db(self, block: np.ndarray, window: np.ndarray) -> np.ndarray:
+        if self.segments == 1:
+            spectrum = np.fft.fftshift(np.fft.fft(block * window))
+            return 20 * np.log10(np.abs(spectrum) + 1e-12)
+        return 10 * np.log10(self.power_linear(block, window) + 1e-24)
+
+    def power_linear(self, block: np.ndarray, window: np.ndarray) -> np.ndarray:
+        if self.segments == 1:
+            spectrum = np.fft.fft(block * window)
+        else:
+            frames = np.lib.stride_tricks.sliding_window_view(block, self.fft_size)[:: self.hop]
+            spectrum = np.fft.fft(frames[: self.segments] * window, axis=1)
+        power = spectrum.real**2 + spectrum.imag**2
+        if power.ndim == 2:
+            power = power.mean(axis=0)
+        return np.fft.fftshift(power)
+
+    def power(self, block: np.ndarray, window: np.ndarray, averaging: str) -> np.ndarray:
+        if averaging == "linear":
+            return self.power_linear(block, window)
+        return self.power_db(block, window)
+
+
+def _to_db(power: np.ndarray) -> np.ndarray:
+    return 10 * np.log10(power + 1e-24)
+
+
+class BinAccumulator:
+    def __init__(self, n_bins: int, sweeps: int, averaging: str = "db") -> None:
+        if n_bins <= 0:
+            raise ValueError("n_bins must be positive")
+        if sweeps <= 0:
+            raise ValueError("sweeps must be positive")
+        if averaging not in AVERAGING_MODES:
+            raise ValueError(f"unsupported averaging mode: {averaging}")
+        self.n_bins = n_bins
+        self.sweeps = sweeps
+        self.averaging = averaging
+        self.sums = np.zeros(n_bins, dtype=np.float64)
+        self.count = np.zeros(n_bins, dtype=np.int64)
+        self.peaks = np.full(n_bins, -np.inf, dtype=np.float64)
+        self.sweep_sums = np.zeros((sweeps, n_bins), dtype=np.float64)
+        self.sweep_count = np.zeros((sweeps, n_bins), dtype=np.int64)
+
+    def add(self, sweep: int, indices: np.ndarray, power: np.ndarray) -> None:
+        if indices.size == 0:
+            return
+        lo = int(indices.min())
+        hi = int(indices.max()) + 1
+        local = indices - lo
+        sums = np.bincount(local, weights=power, minlength=hi - lo)
+        counts = np.bincount(local, minlength=hi - lo)
+        self.sums[lo:hi] += sums
+        self.count[lo:hi] += counts
+        np.maximum.at(self.peaks, indices, power)
+        self.sweep_sums[sweep, lo:hi] += sums
+        self.sweep_count[sweep, lo:hi] += counts
+
+    def finish(
+        self, missing_db: float
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        linear = self.averaging == "linear"
+        missing = 10 ** (missing_db / 10.0) if linear else missing_db
+
+        seen = self.count > 0
+        avg = np.full(self.n_bins, missing, dtype=np.float64)
+        np.divide(self.sums, self.count, out=avg, where=seen)
+        peak = np.where(seen, self.peaks, missing)
+
+        sweep_avg = np.full(self.sweep_sums.shape, missing, dtype=np.float64)
+        np.divide(
+            self.sweep_sums,
+            self.sweep_count,
+            out=sweep_avg,
+            where=self.sweep_count > 0,
+        )
+        if not linear:
+            return avg, peak, sweep_avg.min(axis=0), sweep_avg.mean(axis=0), sweep_avg.max(axis=0)
+
+        sweep_db = np.where(self.sweep_count > 0, _to_db(sweep_avg), missing_db)
+        return (
+            np.where(seen, _to_db(avg), missing_db),
+            np.where(seen, _to_db(peak), missing_db),
+            sweep_db.min(axis=0),
+            np.where(seen, _to_db(sweep_avg.mean(axis=0)), missing_db),
+            sweep_db.max(axis=0),
+        )
+
+
+@dataclass(frozen=True)
+class CaptureTimings:
+    blocks: int
+    read_sec: float
+    read_wait_sec: float
+    fft_sec: float
+    accumulate_sec: float
+    wall_sec: float
+
+
+def run_capture_pipeline(
+    session,
+    plan: SweepPlan,
+    accumulator: BinAccumulator,
+    *,
+    sweeps: int,
+    dwell_ms: int,
+    queue_depth: int,
+    workers: int,
+    layout: SegmentLayout | None = None,
+) -> CaptureTimings:
+    layout = layout or SegmentLayout(plan.fft_size)
+    if layout.fft_size != plan.fft_size:
+        raise ValueError("segment layout fft_size does not match plan")
+    if queue_depth <= 0:
+        raise ValueError("queue_depth must be positive")
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+
+    free_buffers: queue.Queue = queue.Queue()
+    for _ in range(queue_depth + workers):
+        free_buffers.put(np.empty(layout.block_size, dtype=np.complex128))
+    filled: queue.Queue = queue.Queue(maxsize=queue_depth)
+    lock = threading.Lock()
+    errors: list[BaseException] = []
+    worker_times: list[tuple[float, float]] = []
+
+    def work() -> None:
+        fft_sec = 0.0
+        accumulate_sec = 0.0
+        while True:
+            item = filled.get()
+            if item is None:
+                break
+            sweep, row, buffer = item
+            try:
+                if not errors:
+                    t0 = time.perf_counter()
+                    power = layout.power(buffer, plan.window, accumulator.averaging)
+                    t1 = time.perf_counter()
+                    with lock:
+                        accumulator.add(sweep, plan.indices[row], power[plan.masks[row]])
+                    fft_sec += t1 - t0
+                    accumulate_sec += time.perf_counter() - t1
+            except BaseException as exc:  # surfaced in the producer thread
+                errors.append(exc)
+            finally:
+                free_buffers.put(buffer)
+        with lock:
+            worker_times.append((fft_sec, accumulate_sec))
+
+    threads = [
+        threading.Thread(target=work, name=f"antennalab-fft-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    started = time.perf_counter()
+    read_sec = 0.0
+    read_wait_sec = 0.0
+    blocks = 0
+    try:
+        for sweep in range(sweeps):
+            for row, center in enumerate(plan.centers.tolist()):
+                if errors:
+                    break
+                t0 = time.perf_counter()
+                buffer = free_buffers.get()
+                t1 = time.perf_counter()
+                session.tune(center)
+                np.copyto(buffer, session.read_samples(layout.block_size))
+                read_sec += time.perf_counter() - t1
+                read_wait_sec += t1 - t0
+                filled.put((sweep, row, buffer))
+                blocks += 1
+                if dwell_ms:
+                    time.sleep(dwell_ms / 1000.0)
+    finally:
+        for _ in threads:
+            filled.put(None)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return CaptureTimings(
+        blocks=blocks,
+        read_sec=read_sec,
+        read_wait_sec=read_wait_sec,
+        fft_sec=sum(t[0] for t in worker_times),
+        accumulate_sec=sum(t[1] for t in worker_times),
+        wall_sec=time.perf_counter() - started,
+    )
@@ -3,7 +3,7 @@ from __future__ import annotations
 import math
 import random
 
-from antennalab.core.models import ScanBin, ScanResult
+from antennalab.core.models import ScanResult, Spectrum
 
 
 class ScanSimulator:
@@ -23,7 +23,8 @@ class ScanSimulator:
         if stop_hz <= start_hz:
             raise ValueError("stop_hz must be greater than start_hz")
 
-        bins: list[ScanBin] = []
+        avg_values: list[float] = []
+        max_values: list[float] = []
         freq = float(start_hz)
         center = (start_hz + stop_hz) / 2.0
         span = max(stop_hz - start_hz, 1.0)
@@ -36,7 +37,8 @@ class ScanSimulator:
                 peak = self._rng.uniform(8, 18)
             avg_db = noise + ripple
             max_db = avg_db + peak + self._rng.uniform(0, 4)
-            bins.append(ScanBin(freq_hz=freq, avg_db=avg_db, max_db=max_db))
+            avg_values.append(avg_db)
+            max_values.append(max_db)
             freq += bin_hz
 
         return ScanResult(
@@ -44,7 +46,12 @@ class ScanSimulator:
             start_hz=start_hz,
             stop_hz=stop_hz,
             bin_hz=bin_hz,
-            bins=tuple(bins),
+            bins=Spectrum(
+                start_hz=start_hz,
+                bin_hz=bin_hz,
+                avg_db=avg_values,
+                max_db=max_values,
+            ),
             antenna_tag=antenna_tag,
             location_tag=location_tag,
         )
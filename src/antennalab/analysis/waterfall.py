@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-import csv
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 
+import numpy as np
+
+from antennalab.analysis.calibration import BaselineStore
 from antennalab.analysis.spectrum import ScanSimulator
 from antennalab.core.models import ScanResult
 from antennalab.instruments.rtlsdr import RTLSDRPlugin
+from antennalab.report.csv_format import iter_csv_blocks
+from antennalab.report.waterfall_io import WATERFALL_BINARY_SUFFIX, DenseWaterfallWriter
 
 
 @dataclass(frozen=True)
@@ -26,28 +32,182 @@ class WaterfallSettings:
     dwell_ms: int
     missing_db: float
     seed: int | None
+    plan_cache_dir: Path | None = None
+    queue_depth: int = 4
+    workers: int = 1
+    segments: int = 1
+    overlap: float = 0.0
+    averaging: str = "db"
+    flush_every: int = 1
+    resume: bool = False
+    baseline_csv: Path | None = None
 
 
-def write_waterfall_csv(path: str | Path, slices: list[tuple[str, int, ScanResult]]) -> Path:
-    output_path = Path(path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+WATERFALL_HEADER = "timestamp,slice_index,freq_hz,avg_db,max_db\r\n"
 
-    with output_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(["timestamp", "slice_index", "freq_hz", "avg_db", "max_db"])
-        for timestamp, slice_index, scan in slices:
-            for bin_ in scan.bins:
-                writer.writerow(
-                    [
-                        timestamp,
-                        slice_index,
-                        f"{bin_.freq_hz:.0f}",
-                        f"{bin_.avg_db:.2f}",
-                        f"{bin_.max_db:.2f}",
-                    ]
+
+class WaterfallWriter:
+    def __init__(self, path: str | Path, *, flush_every: int = 1, resume: bool = False) -> None:
+        if flush_every <= 0:
+            raise ValueError("flush_every must be positive")
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.next_index = 0
+        self.written = 0
+        self._pending = 0
+        self._freq_hz: np.ndarray | None = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists() and self.path.stat().st_size > 0:
+            offset, last_index, self._freq_hz = _resume_point(self.path)
+            with self.path.open("r+b") as handle:
+                handle.truncate(offset)
+            self.next_index = last_index + 1 if last_index is not None else 0
+            self._handle = self.path.open("a", newline="", encoding="utf-8")
+            if offset == 0:
+                self._handle.write(WATERFALL_HEADER)
+        else:
+            self._handle = self.path.open("w", newline="", encoding="utf-8")
+            self._handle.write(WATERFALL_HEADER)
+
+    def append(self, scan: ScanResult, *, timestamp: str | None = None) -> int:
+        slice_index = self.next_index
+        spectrum = scan.spectrum
+        # Freqs are written rounded to whole Hz, so compare within half a Hz.
+        if self._freq_hz is None:
+            self._freq_hz = spectrum.freq_hz
+        elif len(spectrum) != len(self._freq_hz) or not np.allclose(
+            spectrum.freq_hz, self._freq_hz, rtol=1e-9, atol=0.5
+        ):
+            raise ValueError(f"scan does not match the waterfall frequency axis in {self.path}")
+        prefix = f"{timestamp or scan.timestamp},{slice_index},"
+        self._handle.write(
+            "".join(
+                iter_csv_blocks(
+                    (spectrum.freq_hz, spectrum.avg_db, spectrum.max_db),
+                    (0, 2, 2),
+                    prefix=prefix,
                 )
+            )
+        )
+        self.next_index += 1
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+        return slice_index
+
+    def flush(self) -> None:
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.flush()
+        self._handle.close()
+
+    def __enter__(self) -> "WaterfallWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _slice_index(line: bytes) -> int | None:
+    fields = line.split(b",", 2)
+    if len(fields) < 3:
+        return None
+    try:
+        return int(fields[1])
+    except ValueError:
+        return None
+
+
+def _slice_freqs(lines: list[bytes]) -> np.ndarray | None:
+    if not lines:
+        return None
+    return np.array([float(line.split(b",", 3)[2]) for line in lines])
 
-    return output_path
+
+def _resume_point(path: Path) -> tuple[int, int | None, np.ndarray | None]:
+    # Keep complete lines only, and drop a trailing slice that has fewer rows
+    # than the first one (the capture died while it was being written). Also
+    # returns the freq axis of the last slice kept.
+    with path.open("rb") as handle:
+        if not handle.readline().endswith(b"\n"):
+            return 0, None, None
+        body_start = handle.tell()
+        first_index = None
+        rows_per_slice = None
+        count = 0
+        for line in handle:
+            if not line.endswith(b"\n"):
+                break
+            index = _slice_index(line)
+            if first_index is None:
+                first_index = index
+            if index != first_index:
+                rows_per_slice = count
+                break
+            count += 1
+
+        size = handle.seek(0, os.SEEK_END)
+        window = 1 << 16
+        while True:
+            start = max(body_start, size - window)
+            handle.seek(start)
+            data = handle.read(size - start)
+            end = start + data.rfind(b"\n") + 1
+            if end <= start:
+                if start == body_start:
+                    return body_start, None, None
+                window *= 2
+                continue
+            lines = data[: end - start].split(b"\n")[:-1]
+            if start > body_start:
+                lines = lines[1:]
+            if not lines:
+                window *= 2
+                continue
+            last_index = _slice_index(lines[-1])
+            tail = 0
+            for line in reversed(lines):
+                if _slice_index(line) != last_index:
+                    break
+                tail += 1
+            partial = rows_per_slice is not None and tail < rows_per_slice
+            # The window must hold the whole slice that is kept.
+            if partial:
+                needed = tail + rows_per_slice
+            else:
+                needed = tail if rows_per_slice is not None else tail + 1
+            if start > body_start and len(lines) < needed:
+                window *= 2
+                continue
+            break
+
+    if partial:
+        kept = lines[-tail - rows_per_slice : -tail] if tail < len(lines) else []
+        previous = _slice_index(kept[-1]) if kept else None
+        return end - sum(len(line) + 1 for line in lines[-tail:]), previous, _slice_freqs(kept)
+    return end, last_index, _slice_freqs(lines[-tail:])
+
+
+def open_waterfall_writer(
+    path: str | Path, *, flush_every: int = 1, resume: bool = False
+) -> WaterfallWriter | DenseWaterfallWriter:
+    if Path(path).suffix.lower() == WATERFALL_BINARY_SUFFIX:
+        return DenseWaterfallWriter(path, flush_every=flush_every, resume=resume)
+    return WaterfallWriter(path, flush_every=flush_every, resume=resume)
+
+
+def write_waterfall_csv(path: str | Path, slices: Iterable[tuple[str, int, ScanResult]]) -> Path:
+    with WaterfallWriter(path, flush_every=1 << 30) as writer:
+        for timestamp, slice_index, scan in slices:
+            writer.next_index = slice_index
+            writer.append(scan, timestamp=timestamp)
+    return Path(path)
 
 
 def run_waterfall(settings: WaterfallSettings, out_csv: str | Path) -> Path:
@@ -56,37 +216,50 @@ def run_waterfall(settings: WaterfallSettings, out_csv: str | Path) -> Path:
     if settings.interval_ms < 0:
         raise ValueError("interval_ms must be >= 0")
 
-    plugin = RTLSDRPlugin()
+    plugin = RTLSDRPlugin(plan_cache_dir=settings.plan_cache_dir)
+    baselines = BaselineStore()
     simulator = ScanSimulator(seed=settings.seed) if settings.mode == "sim" else None
 
-    slices: list[tuple[str, int, ScanResult]] = []
-    for idx in range(settings.slices):
-        if settings.mode == "sim":
-            seed = None
-            if settings.seed is not None:
-                seed = settings.seed + idx
-            scan = ScanSimulator(seed=seed).simulate_scan(
-                start_hz=settings.start_hz,
-                stop_hz=settings.stop_hz,
-                bin_hz=settings.bin_hz,
-            )
-        else:
-            scan = plugin.scan_real(
-                start_hz=settings.start_hz,
-                stop_hz=settings.stop_hz,
-                bin_hz=settings.bin_hz,
-                sample_rate_hz=settings.sample_rate_hz,
-                gain_db=settings.gain_db,
-                fft_size=settings.fft_size,
-                step_hz=settings.step_hz,
-                sweeps=settings.sweeps,
-                dwell_ms=settings.dwell_ms,
-                missing_db=settings.missing_db,
-                antenna_tag=None,
-                location_tag=None,
-            )
-        slices.append((scan.timestamp, idx, scan))
-        if settings.interval_ms:
-            time.sleep(settings.interval_ms / 1000.0)
+    writer = open_waterfall_writer(
+        out_csv, flush_every=settings.flush_every, resume=settings.resume
+    )
+    with writer, plugin.open_session() as session:
+        for _ in range(settings.slices):
+            idx = writer.next_index
+            if settings.mode == "sim":
+                seed = None
+                if settings.seed is not None:
+                    seed = settings.seed + idx
+                scan = ScanSimulator(seed=seed).simulate_scan(
+                    start_hz=settings.start_hz,
+                    stop_hz=settings.stop_hz,
+                    bin_hz=settings.bin_hz,
+                )
+            else:
+                scan = plugin.scan_real(
+                    start_hz=settings.start_hz,
+                    stop_hz=settings.stop_hz,
+                    bin_hz=settings.bin_hz,
+                    sample_rate_hz=settings.sample_rate_hz,
+                    gain_db=settings.gain_db,
+                    fft_size=settings.fft_size,
+                    step_hz=settings.step_hz,
+                    sweeps=settings.sweeps,
+                    dwell_ms=settings.dwell_ms,
+                    missing_db=settings.missing_db,
+                    antenna_tag=None,
+                    location_tag=None,
+                    session=session,
+                    queue_depth=settings.queue_depth,
+                    workers=settings.workers,
+                    segments=settings.segments,
+                    overlap=settings.overlap,
+                    averaging=settings.averaging,
+                )
+            if settings.baseline_csv is not None:
+                scan = baselines.apply(scan, settings.baseline_csv)
+            writer.append(scan)
+            if settings.interval_ms:
+                time.sleep(settings.interval_ms / 1000.0)
 
-    return write_waterfall_csv(out_csv, slices)
+    return writer.path
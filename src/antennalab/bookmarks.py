@@ -5,7 +5,7 @@ import json
 from dataclasses import dataclass
 from pathlib import Path
 
-from antennalab.report.export_csv import read_scan_csv
+from antennalab.report.scan_io import read_scan
 
 
 @dataclass(frozen=True)
@@ -35,6 +35,32 @@ def load_bookmarks(path: str | Path) -> list[Bookmark]:
     return bookmarks
 
 
+def _file_stamp(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class BookmarkCache:
+    # Reloads only when the file's mtime or size changes (or it appears or
+    # disappears), so monitor loops do not reparse the CSV every iteration.
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.loads = 0
+        self._cached: tuple[tuple[int, int] | None, list[Bookmark]] | None = None
+
+    def get(self) -> list[Bookmark]:
+        stamp = _file_stamp(self.path)
+        if self._cached is not None and self._cached[0] == stamp:
+            return self._cached[1]
+        bookmarks = load_bookmarks(self.path)
+        self.loads += 1
+        self._cached = (stamp, bookmarks)
+        return bookmarks
+
+
 def save_bookmarks(path: str | Path, bookmarks: list[Bookmark]) -> Path:
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -95,7 +121,7 @@ def import_bookmarks_json(path: str | Path, in_json: str | Path) -> Path:
 
 
 def match_bookmarks_to_scan(scan_csv: str | Path, bookmarks_file: str | Path) -> list[Bookmark]:
-    meta, _ = read_scan_csv(scan_csv)
+    meta, _ = read_scan(scan_csv)
     bookmarks = load_bookmarks(bookmarks_file)
     return match_bookmarks_to_range(bookmarks, meta.start_hz, meta.stop_hz)
 
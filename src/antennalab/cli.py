@@ -1,21 +1,28 @@
 from __future__ import annotations
 
 import argparse
+import math
 from datetime import datetime, timezone
 from pathlib import Path
 
 from antennalab import __version__
 from antennalab.analysis.alerts import AlertEngine, load_alert_rules, write_alert_hits
-from antennalab.analysis.calibration import apply_baseline, load_baseline
+from antennalab.analysis.calibration import BaselineStore, apply_baseline, load_baseline
 from antennalab.analysis.calibration_profiles import (
     BaselineProfile,
-    get_profile,
     load_profiles,
     remove_profile,
     upsert_profile,
 )
 from antennalab.analysis.compare import compare_to_csv
+from antennalab.analysis.compare_batch import (
+    METRICS,
+    compare_batch,
+    write_ranked_csv,
+    write_score_matrix_csv,
+)
 from antennalab.analysis.monitor import MonitorSettings, run_monitor
+from antennalab.analysis.noise_floor import STRATEGIES as NOISE_FLOOR_STRATEGIES
 from antennalab.analysis.noise_floor import estimate_noise_floor
 from antennalab.analysis.waterfall import WaterfallSettings, run_waterfall
 from antennalab.bookmarks import (
@@ -32,14 +39,19 @@ from antennalab.config import load_config
 from antennalab.core.models import SweepStatsBin
 from antennalab.core.registry import get_instrument_plugins
 from antennalab.instruments.rtlsdr import RTLSDRPlugin
-from antennalab.report.export_csv import scan_from_csv, write_scan_csv, write_sweep_stats_csv
+from antennalab.report.export_csv import write_sweep_stats_csv
 from antennalab.report.plot import plot_scan_csv
 from antennalab.report.report_pack import build_report_pack
 from antennalab.report.report_pack_html import write_report_pack_html
 from antennalab.report.run_report import write_run_report
+from antennalab.report.scan_io import SCAN_FORMATS, convert_scan, load_scan, write_scan
 from antennalab.report.monitor_plot import plot_monitor_summary
+from antennalab.report.palettes import PALETTE_NAMES
 from antennalab.report.waterfall_plot import plot_waterfall_csv
-from antennalab.report.waterfall_html import write_waterfall_html
+from antennalab.report.waterfall_html import write_tiled_waterfall_html, write_waterfall_html
+from antennalab.report.waterfall_io import convert_waterfall
+from antennalab.report.waterfall_tiles import build_tile_pyramid
+from antennalab.report.write_behind import BACKPRESSURE_POLICIES
 
 
 def cmd_info(args: argparse.Namespace) -> int:
@@ -86,6 +98,16 @@ def _profiles_path(base_dir: Path) -> Path:
     return base_dir / "config" / "baseline_profiles.json"
 
 
+def _baseline_csv_from_args(args: argparse.Namespace, base_dir: Path) -> Path | None:
+    baseline_csv = getattr(args, "baseline_csv", None)
+    baseline_tag = getattr(args, "baseline_tag", None)
+    if baseline_tag:
+        baseline_csv = BaselineStore(_profiles_path(base_dir)).resolve_tag(baseline_tag)
+        if baseline_csv is None:
+            raise SystemExit(f"Baseline tag not found: {baseline_tag}")
+    return Path(baseline_csv) if baseline_csv else None
+
+
 def cmd_scan(args: argparse.Namespace) -> int:
     config, config_path = load_config(args.config)
     scan_cfg = config.get("scan", {}) if isinstance(config, dict) else {}
@@ -105,10 +127,12 @@ def cmd_scan(args: argparse.Namespace) -> int:
     scans_dir = _resolve_path(base_dir, Path(output_cfg.get("scans_dir", "data/scans")))
     reports_dir = _resolve_path(base_dir, Path(output_cfg.get("reports_dir", "data/reports")))
 
+    cache_dir = _resolve_path(base_dir, Path(output_cfg.get("cache_dir", "data/cache")))
+
     out_csv = Path(args.out_csv) if args.out_csv else scans_dir / "scan.csv"
     out_json = Path(args.out_json) if args.out_json else None
 
-    plugin = RTLSDRPlugin()
+    plugin = RTLSDRPlugin(plan_cache_dir=cache_dir)
     sweep_stats: tuple[SweepStatsBin, ...] | None = None
 
     if mode == "sim":
@@ -138,52 +162,70 @@ def cmd_scan(args: argparse.Namespace) -> int:
         sweeps = args.sweeps or device_cfg.get("sweeps", 3)
         dwell_ms = args.dwell_ms if args.dwell_ms is not None else device_cfg.get("dwell_ms", 0)
         missing_db = device_cfg.get("missing_db", -120.0)
+        queue_depth = device_cfg.get("queue_depth", 4)
+        workers = device_cfg.get("workers", 1)
+        segments = args.segments or device_cfg.get("segments", 1)
+        overlap = args.overlap if args.overlap is not None else device_cfg.get("overlap", 0.0)
+        averaging = args.averaging or device_cfg.get("averaging", "db")
 
         sweep_stats_path = getattr(args, "sweep_stats_csv", None)
-        if sweep_stats_path:
-            scan, sweep_stats = plugin.scan_real_with_sweep_stats(
-                start_hz=float(start_hz),
-                stop_hz=float(stop_hz),
-                bin_hz=float(bin_hz),
-                sample_rate_hz=float(sample_rate_hz),
-                gain_db=gain_db,
-                fft_size=int(fft_size),
-                step_hz=float(step_hz) if step_hz is not None else None,
-                sweeps=int(sweeps),
-                dwell_ms=int(dwell_ms),
-                missing_db=float(missing_db),
-                antenna_tag=args.antenna,
-                location_tag=args.location,
-            )
-        else:
-            scan = plugin.scan_real(
-                start_hz=float(start_hz),
-                stop_hz=float(stop_hz),
-                bin_hz=float(bin_hz),
-                sample_rate_hz=float(sample_rate_hz),
-                gain_db=gain_db,
-                fft_size=int(fft_size),
-                step_hz=float(step_hz) if step_hz is not None else None,
-                sweeps=int(sweeps),
-                dwell_ms=int(dwell_ms),
-                missing_db=float(missing_db),
-                antenna_tag=args.antenna,
-                location_tag=args.location,
-            )
+        with plugin.open_session() as session:
+            if sweep_stats_path:
+                scan, sweep_stats = plugin.scan_real_with_sweep_stats(
+                    start_hz=float(start_hz),
+                    stop_hz=float(stop_hz),
+                    bin_hz=float(bin_hz),
+                    sample_rate_hz=float(sample_rate_hz),
+                    gain_db=gain_db,
+                    fft_size=int(fft_size),
+                    step_hz=float(step_hz) if step_hz is not None else None,
+                    sweeps=int(sweeps),
+                    dwell_ms=int(dwell_ms),
+                    missing_db=float(missing_db),
+                    antenna_tag=args.antenna,
+                    location_tag=args.location,
+                    session=session,
+                    queue_depth=int(queue_depth),
+                    workers=int(workers),
+                    segments=int(segments),
+                    overlap=float(overlap),
+                    averaging=averaging,
+                )
+            else:
+                scan = plugin.scan_real(
+                    start_hz=float(start_hz),
+                    stop_hz=float(stop_hz),
+                    bin_hz=float(bin_hz),
+                    sample_rate_hz=float(sample_rate_hz),
+                    gain_db=gain_db,
+                    fft_size=int(fft_size),
+                    step_hz=float(step_hz) if step_hz is not None else None,
+                    sweeps=int(sweeps),
+                    dwell_ms=int(dwell_ms),
+                    missing_db=float(missing_db),
+                    antenna_tag=args.antenna,
+                    location_tag=args.location,
+                    session=session,
+                    queue_depth=int(queue_depth),
+                    workers=int(workers),
+                    segments=int(segments),
+                    overlap=float(overlap),
+                    averaging=averaging,
+                )
 
-    baseline_csv = getattr(args, "baseline_csv", None)
-    baseline_tag = getattr(args, "baseline_tag", None)
-    if baseline_tag:
-        profile = get_profile(_profiles_path(base_dir), baseline_tag)
-        if profile is None:
-            raise SystemExit(f"Baseline tag not found: {baseline_tag}")
-        baseline_csv = profile.csv_path
+        timings = plugin.last_timings
+        if timings is not None:
+            print(
+                f"Capture timings: {timings.blocks} blocks in {timings.wall_sec:.2f}s "
+                f"(read {timings.read_sec:.2f}s, fft {timings.fft_sec:.2f}s, "
+                f"accumulate {timings.accumulate_sec:.2f}s)"
+            )
 
+    baseline_csv = _baseline_csv_from_args(args, base_dir)
     if baseline_csv:
-        baseline = load_baseline(baseline_csv)
-        scan = apply_baseline(scan, baseline)
+        scan = BaselineStore().apply(scan, baseline_csv)
 
-    write_scan_csv(scan, out_csv)
+    write_scan(scan, out_csv)
     print(f"Scan CSV: {out_csv}")
 
     sweep_stats_path = getattr(args, "sweep_stats_csv", None)
@@ -259,14 +301,20 @@ def cmd_baseline_remove(args: argparse.Namespace) -> int:
 
 
 def cmd_baseline_apply(args: argparse.Namespace) -> int:
-    scan = scan_from_csv(args.scan_csv)
+    scan = load_scan(args.scan_csv)
     baseline = load_baseline(args.baseline_csv)
     adjusted = apply_baseline(scan, baseline)
-    write_scan_csv(adjusted, args.out_csv)
+    write_scan(adjusted, args.out_csv)
     print(f"Baseline-adjusted CSV: {args.out_csv}")
     return 0
 
 
+def cmd_convert_scan(args: argparse.Namespace) -> int:
+    output_path = convert_scan(args.in_path, args.out_path)
+    print(f"Converted scan: {output_path}")
+    return 0
+
+
 def cmd_plot_scan(args: argparse.Namespace) -> int:
     output_path = plot_scan_csv(args.in_csv, args.out_png)
     print(f"Plot image: {output_path}")
@@ -274,7 +322,7 @@ def cmd_plot_scan(args: argparse.Namespace) -> int:
 
 
 def cmd_waterfall(args: argparse.Namespace) -> int:
-    config, _ = load_config(args.config)
+    config, config_path = load_config(args.config)
     scan_cfg = config.get("scan", {}) if isinstance(config, dict) else {}
     device_cfg = config.get("device", {}) if isinstance(config, dict) else {}
     output_cfg = config.get("output", {}) if isinstance(config, dict) else {}
@@ -287,6 +335,7 @@ def cmd_waterfall(args: argparse.Namespace) -> int:
 
     mode = args.mode or scan_cfg.get("mode", "real")
     waterfalls_dir = Path(output_cfg.get("waterfalls_dir", "data/waterfalls"))
+    cache_dir = Path(output_cfg.get("cache_dir", "data/cache"))
     out_csv = Path(args.out_csv) if args.out_csv else waterfalls_dir / "waterfall.csv"
 
     sample_rate_hz = args.sample_rate or device_cfg.get("sample_rate_hz", 2_400_000)
@@ -296,6 +345,11 @@ def cmd_waterfall(args: argparse.Namespace) -> int:
     sweeps = args.sweeps or device_cfg.get("sweeps", 3)
     dwell_ms = args.dwell_ms if args.dwell_ms is not None else device_cfg.get("dwell_ms", 0)
     missing_db = device_cfg.get("missing_db", -120.0)
+    queue_depth = device_cfg.get("queue_depth", 4)
+    workers = device_cfg.get("workers", 1)
+    segments = args.segments or device_cfg.get("segments", 1)
+    overlap = args.overlap if args.overlap is not None else device_cfg.get("overlap", 0.0)
+    averaging = args.averaging or device_cfg.get("averaging", "db")
 
     settings = WaterfallSettings(
         mode=mode,
@@ -312,6 +366,15 @@ def cmd_waterfall(args: argparse.Namespace) -> int:
         dwell_ms=int(dwell_ms),
         missing_db=float(missing_db),
         seed=args.seed,
+        plan_cache_dir=cache_dir,
+        queue_depth=int(queue_depth),
+        workers=int(workers),
+        segments=int(segments),
+        overlap=float(overlap),
+        averaging=averaging,
+        flush_every=int(args.flush_every),
+        resume=bool(args.resume),
+        baseline_csv=_baseline_csv_from_args(args, _resolve_base_dir(config_path)),
     )
 
     out_path = run_waterfall(settings, out_csv)
@@ -332,6 +395,10 @@ def cmd_plot_waterfall(args: argparse.Namespace) -> int:
         cmap=cmap,
         vmin=vmin,
         vmax=vmax,
+        start_hz=args.start_hz,
+        stop_hz=args.stop_hz,
+        first_slice=args.first_slice,
+        stop_slice=args.stop_slice,
     )
     print(f"Waterfall image: {output_path}")
     return 0
@@ -344,11 +411,45 @@ def cmd_waterfall_html(args: argparse.Namespace) -> int:
         palette=args.palette,
         vmin=args.vmin,
         vmax=args.vmax,
+        start_hz=args.start_hz,
+        stop_hz=args.stop_hz,
+        first_slice=args.first_slice,
+        stop_slice=args.stop_slice,
+        width=args.width,
+        height=args.height,
+        encoding=args.encoding,
     )
     print(f"Waterfall HTML: {output_path}")
     return 0
 
 
+def cmd_waterfall_tiles(args: argparse.Namespace) -> int:
+    manifest_path = build_tile_pyramid(
+        args.in_csv,
+        args.out_dir,
+        tile_size=args.tile_size,
+        reducer=args.reducer,
+        vmin=args.vmin,
+        vmax=args.vmax,
+        tile_format=args.tile_format,
+    )
+    output_path = write_tiled_waterfall_html(
+        manifest_path.parent,
+        palette=args.palette,
+        width=args.width,
+        height=args.height,
+    )
+    print(f"Waterfall tiles: {manifest_path.parent}")
+    print(f"Waterfall viewer: {output_path}")
+    return 0
+
+
+def cmd_convert_waterfall(args: argparse.Namespace) -> int:
+    output_path = convert_waterfall(args.in_path, args.out_path)
+    print(f"Converted waterfall: {output_path}")
+    return 0
+
+
 def cmd_bookmark_add(args: argparse.Namespace) -> int:
     bookmark = Bookmark(freq_hz=float(args.freq_hz), label=args.label or "", notes=args.notes or "")
     add_bookmark(args.file, bookmark)
@@ -409,6 +510,10 @@ def cmd_noise_floor(args: argparse.Namespace) -> int:
         scan_csv=args.in_csv,
         out_csv=out_csv,
         strategy=args.strategy,
+        window_bins=args.window_bins,
+        percentile=args.percentile,
+        smooth_slices=args.smooth_slices,
+        window_slices=args.window_slices,
     )
     print(f"Noise floor CSV: {out_csv}")
     return 0
@@ -420,8 +525,30 @@ def cmd_compare(args: argparse.Namespace) -> int:
     reports_dir = Path(output_cfg.get("reports_dir", "data/reports"))
 
     out_csv = Path(args.out_csv) if args.out_csv else reports_dir / "compare.csv"
-    compare_to_csv(args.scan_a, args.scan_b, out_csv)
+    compare_to_csv(
+        args.scan_a, args.scan_b, out_csv, bands=args.bands, scores_json=args.scores_json
+    )
     print(f"Compare CSV: {out_csv}")
+    if args.scores_json:
+        print(f"Compare scores: {args.scores_json}")
+    return 0
+
+
+def cmd_compare_batch(args: argparse.Namespace) -> int:
+    config, _ = load_config(args.config)
+    output_cfg = config.get("output", {}) if isinstance(config, dict) else {}
+    reports_dir = Path(output_cfg.get("reports_dir", "data/reports"))
+    device_cfg = config.get("device", {}) if isinstance(config, dict) else {}
+    workers = args.workers if args.workers is not None else int(device_cfg.get("workers", 1))
+
+    out_matrix = Path(args.out_matrix) if args.out_matrix else reports_dir / "compare_matrix.csv"
+    out_ranked = Path(args.out_ranked) if args.out_ranked else reports_dir / "compare_ranked.csv"
+    result = compare_batch(args.scans, reference=args.reference, workers=workers)
+    write_score_matrix_csv(result, out_matrix, metric=args.metric)
+    write_ranked_csv(result, out_ranked, metric=args.metric)
+    print(f"Compared {len(result.paths)} scans over {result.n_bins} bins")
+    print(f"Score matrix CSV: {out_matrix}")
+    print(f"Ranked CSV: {out_ranked}")
     return 0
 
 
@@ -472,6 +599,7 @@ def cmd_monitor(args: argparse.Namespace) -> int:
     scan_cfg = config.get("scan", {}) if isinstance(config, dict) else {}
     device_cfg = config.get("device", {}) if isinstance(config, dict) else {}
     output_cfg = config.get("output", {}) if isinstance(config, dict) else {}
+    alerts_cfg = config.get("alerts", {}) if isinstance(config, dict) else {}
 
     start_hz = args.start_hz or scan_cfg.get("start_hz")
     stop_hz = args.stop_hz or scan_cfg.get("stop_hz")
@@ -481,17 +609,22 @@ def cmd_monitor(args: argparse.Namespace) -> int:
 
     mode = args.mode or scan_cfg.get("mode", "real")
 
-    interval_sec = int(args.interval_sec)
+    interval_sec = float(args.interval_sec)
+    duration_sec = None
     if args.duration_min is not None:
-        iterations = max(1, int((args.duration_min * 60) // interval_sec))
+        # The scheduler stops at the duration; iterations is only an upper bound.
+        duration_sec = float(args.duration_min) * 60.0
+        iterations = max(1, math.ceil(duration_sec / interval_sec))
     else:
         iterations = int(args.iterations)
 
     base_dir = _resolve_base_dir(config_path)
     reports_dir = _resolve_path(base_dir, Path(output_cfg.get("reports_dir", "data/reports")))
+    cache_dir = _resolve_path(base_dir, Path(output_cfg.get("cache_dir", "data/cache")))
 
     session = args.session or "monitor"
     out_dir = reports_dir / f"monitor_{session}"
+    alert_rules = args.alert_rules or alerts_cfg.get("rules_file")
 
     settings = MonitorSettings(
         mode=mode,
@@ -509,6 +642,33 @@ def cmd_monitor(args: argparse.Namespace) -> int:
         iterations=iterations,
         seed=args.seed,
         bookmarks_file=Path(args.bookmarks_file) if args.bookmarks_file else None,
+        plan_cache_dir=cache_dir,
+        queue_depth=int(device_cfg.get("queue_depth", 4)),
+        workers=int(device_cfg.get("workers", 1)),
+        segments=int(args.segments or device_cfg.get("segments", 1)),
+        overlap=float(args.overlap if args.overlap is not None else device_cfg.get("overlap", 0.0)),
+        averaging=args.averaging or device_cfg.get("averaging", "db"),
+        scan_format=args.scan_format or output_cfg.get("scan_format", "csv"),
+        baseline_csv=_baseline_csv_from_args(args, base_dir),
+        alert_rules=_resolve_path(base_dir, Path(alert_rules)) if alert_rules else None,
+        alert_hysteresis_db=float(
+            args.alert_hysteresis_db
+            if args.alert_hysteresis_db is not None
+            else alerts_cfg.get("hysteresis_db", 3.0)
+        ),
+        alert_hold_sec=float(
+            args.alert_hold_sec if args.alert_hold_sec is not None else alerts_cfg.get("hold_sec", 0.0)
+        ),
+        alert_cooldown_sec=float(
+            args.alert_cooldown_sec
+            if args.alert_cooldown_sec is not None
+            else alerts_cfg.get("cooldown_sec", 0.0)
+        ),
+        alert_sinks=tuple(args.alert_sink or alerts_cfg.get("sinks") or ()),
+        alert_queue_size=int(args.alert_queue_size or alerts_cfg.get("queue_size", 1024)),
+        duration_sec=duration_sec,
+        write_queue_depth=int(args.write_queue_depth or output_cfg.get("write_queue_depth", 4)),
+        write_policy=args.write_policy or output_cfg.get("write_policy", "block"),
     )
 
     summary_path = run_monitor(settings, out_dir=out_dir)
@@ -564,6 +724,17 @@ def build_parser() -> argparse.ArgumentParser:
     scan_parser.add_argument("--step-hz", type=float, help="Sweep step size (Hz)")
     scan_parser.add_argument("--sweeps", type=int, help="Number of sweeps to average")
     scan_parser.add_argument("--dwell-ms", type=int, help="Delay between center steps (ms)")
+    scan_parser.add_argument(
+        "--segments", type=int, help="FFT segments averaged per center step (Welch)"
+    )
+    scan_parser.add_argument(
+        "--overlap", type=float, help="Fractional overlap between segments, 0 <= overlap < 1"
+    )
+    scan_parser.add_argument(
+        "--averaging",
+        choices=["db", "linear"],
+        help="Average in dB (legacy) or in linear power",
+    )
     scan_parser.set_defaults(func=cmd_scan)
 
     baseline_capture_parser = subparsers.add_parser(
@@ -585,6 +756,17 @@ def build_parser() -> argparse.ArgumentParser:
     baseline_capture_parser.add_argument("--step-hz", type=float, help="Sweep step size (Hz)")
     baseline_capture_parser.add_argument("--sweeps", type=int, help="Number of sweeps to average")
     baseline_capture_parser.add_argument("--dwell-ms", type=int, help="Delay between center steps (ms)")
+    baseline_capture_parser.add_argument(
+        "--segments", type=int, help="FFT segments averaged per center step (Welch)"
+    )
+    baseline_capture_parser.add_argument(
+        "--overlap", type=float, help="Fractional overlap between segments, 0 <= overlap < 1"
+    )
+    baseline_capture_parser.add_argument(
+        "--averaging",
+        choices=["db", "linear"],
+        help="Average in dB (legacy) or in linear power",
+    )
     baseline_capture_parser.set_defaults(func=cmd_baseline_capture)
 
     baseline_tag_parser = subparsers.add_parser(
@@ -609,13 +791,22 @@ def build_parser() -> argparse.ArgumentParser:
     baseline_parser = subparsers.add_parser(
         "baseline-apply", help="Apply baseline to an existing scan CSV"
     )
-    baseline_parser.add_argument("--scan-csv", required=True, help="Input scan CSV")
-    baseline_parser.add_argument("--baseline-csv", required=True, help="Baseline CSV")
+    baseline_parser.add_argument("--scan-csv", required=True, help="Input scan (CSV or .alscan)")
+    baseline_parser.add_argument("--baseline-csv", required=True, help="Baseline scan (CSV or .alscan)")
     baseline_parser.add_argument("--out-csv", required=True, help="Output CSV")
     baseline_parser.set_defaults(func=cmd_baseline_apply)
 
+    convert_scan_parser = subparsers.add_parser(
+        "convert-scan", help="Convert a scan between CSV and .alscan"
+    )
+    convert_scan_parser.add_argument("--in-path", required=True, help="Input scan (CSV or .alscan)")
+    convert_scan_parser.add_argument(
+        "--out-path", required=True, help="Output scan; format chosen by extension"
+    )
+    convert_scan_parser.set_defaults(func=cmd_convert_scan)
+
     plot_parser = subparsers.add_parser("plot-scan", help="Plot a scan CSV to PNG")
-    plot_parser.add_argument("--in-csv", required=True, help="Input scan CSV")
+    plot_parser.add_argument("--in-csv", required=True, help="Input scan (CSV or .alscan)")
     plot_parser.add_argument(
         "--out-png",
         default="data/reports/scan.png",
@@ -636,6 +827,19 @@ def build_parser() -> argparse.ArgumentParser:
         help="Delay between slices (ms)",
     )
     waterfall_parser.add_argument("--out-csv", help="Output waterfall CSV path")
+    waterfall_parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=1,
+        help="Flush the waterfall file to disk every N slices",
+    )
+    waterfall_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Append to an existing waterfall CSV, continuing its slice numbering",
+    )
+    waterfall_parser.add_argument("--baseline-csv", help="Baseline scan to subtract from every slice")
+    waterfall_parser.add_argument("--baseline-tag", help="Baseline tag to apply to every slice")
     waterfall_parser.add_argument("--seed", type=int, help="Random seed for simulated mode")
     waterfall_parser.add_argument("--sample-rate", type=float, help="RTL-SDR sample rate (Hz)")
     waterfall_parser.add_argument("--gain", help="RTL-SDR gain (auto or dB)")
@@ -643,12 +847,25 @@ def build_parser() -> argparse.ArgumentParser:
     waterfall_parser.add_argument("--step-hz", type=float, help="Sweep step size (Hz)")
     waterfall_parser.add_argument("--sweeps", type=int, help="Number of sweeps to average")
     waterfall_parser.add_argument("--dwell-ms", type=int, help="Delay between center steps (ms)")
+    waterfall_parser.add_argument(
+        "--segments", type=int, help="FFT segments averaged per center step (Welch)"
+    )
+    waterfall_parser.add_argument(
+        "--overlap", type=float, help="Fractional overlap between segments, 0 <= overlap < 1"
+    )
+    waterfall_parser.add_argument(
+        "--averaging",
+        choices=["db", "linear"],
+        help="Average in dB (legacy) or in linear power",
+    )
     waterfall_parser.set_defaults(func=cmd_waterfall)
 
     waterfall_plot_parser = subparsers.add_parser(
         "plot-waterfall", help="Plot a waterfall CSV to PNG"
     )
-    waterfall_plot_parser.add_argument("--in-csv", required=True, help="Input waterfall CSV")
+    waterfall_plot_parser.add_argument(
+        "--in-csv", required=True, help="Input waterfall (CSV or .alwf)"
+    )
     waterfall_plot_parser.add_argument(
         "--out-png",
         default="data/reports/waterfall.png",
@@ -668,12 +885,18 @@ def build_parser() -> argparse.ArgumentParser:
         type=float,
         help="Upper bound for color scale",
     )
+    waterfall_plot_parser.add_argument("--start-hz", type=float, help="Window start frequency (Hz)")
+    waterfall_plot_parser.add_argument("--stop-hz", type=float, help="Window stop frequency (Hz)")
+    waterfall_plot_parser.add_argument("--first-slice", type=int, help="First slice index to include")
+    waterfall_plot_parser.add_argument("--stop-slice", type=int, help="Slice index to stop before")
     waterfall_plot_parser.set_defaults(func=cmd_plot_waterfall)
 
     waterfall_html_parser = subparsers.add_parser(
         "waterfall-html", help="Generate a self-contained HTML waterfall viewer"
     )
-    waterfall_html_parser.add_argument("--in-csv", required=True, help="Input waterfall CSV")
+    waterfall_html_parser.add_argument(
+        "--in-csv", required=True, help="Input waterfall (CSV or .alwf)"
+    )
     waterfall_html_parser.add_argument(
         "--out-html",
         default="data/reports/waterfall.html",
@@ -681,7 +904,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     waterfall_html_parser.add_argument(
         "--palette",
-        choices=["heat", "gray"],
+        choices=list(PALETTE_NAMES),
         default="heat",
         help="Color palette",
     )
@@ -695,8 +918,81 @@ def build_parser() -> argparse.ArgumentParser:
         type=float,
         help="Upper bound for color scale",
     )
+    waterfall_html_parser.add_argument("--start-hz", type=float, help="Window start frequency (Hz)")
+    waterfall_html_parser.add_argument("--stop-hz", type=float, help="Window stop frequency (Hz)")
+    waterfall_html_parser.add_argument("--first-slice", type=int, help="First slice index to include")
+    waterfall_html_parser.add_argument("--stop-slice", type=int, help="Slice index to stop before")
+    waterfall_html_parser.add_argument(
+        "--width", type=int, default=1200, help="Canvas width; wider grids are max-pooled"
+    )
+    waterfall_html_parser.add_argument(
+        "--height", type=int, default=500, help="Canvas height; taller grids are max-pooled"
+    )
+    waterfall_html_parser.add_argument(
+        "--encoding",
+        choices=["uint8", "float32"],
+        default="uint8",
+        help="Embedded grid encoding (uint8 is quantized against vmin/vmax)",
+    )
     waterfall_html_parser.set_defaults(func=cmd_waterfall_html)
 
+    waterfall_tiles_parser = subparsers.add_parser(
+        "waterfall-tiles", help="Build a zoomable tiled HTML waterfall viewer"
+    )
+    waterfall_tiles_parser.add_argument(
+        "--in-csv", required=True, help="Input waterfall (CSV or .alwf)"
+    )
+    waterfall_tiles_parser.add_argument(
+        "--out-dir",
+        default="data/reports/waterfall_tiles",
+        help="Output folder for tiles, manifest and index.html",
+    )
+    waterfall_tiles_parser.add_argument(
+        "--tile-size", type=int, default=256, help="Tile edge length in cells (even)"
+    )
+    waterfall_tiles_parser.add_argument(
+        "--reducer",
+        choices=["max", "mean"],
+        default="max",
+        help="How coarser levels combine 2x2 cells",
+    )
+    waterfall_tiles_parser.add_argument(
+        "--tile-format",
+        choices=["js", "bin"],
+        default="js",
+        help="js tiles open from disk; bin tiles need an HTTP server",
+    )
+    waterfall_tiles_parser.add_argument(
+        "--palette",
+        choices=list(PALETTE_NAMES),
+        default="heat",
+        help="Color palette",
+    )
+    waterfall_tiles_parser.add_argument(
+        "--vmin",
+        type=float,
+        help="Lower bound for color scale",
+    )
+    waterfall_tiles_parser.add_argument(
+        "--vmax",
+        type=float,
+        help="Upper bound for color scale",
+    )
+    waterfall_tiles_parser.add_argument("--width", type=int, default=1200, help="Canvas width")
+    waterfall_tiles_parser.add_argument("--height", type=int, default=500, help="Canvas height")
+    waterfall_tiles_parser.set_defaults(func=cmd_waterfall_tiles)
+
+    convert_waterfall_parser = subparsers.add_parser(
+        "convert-waterfall", help="Convert a waterfall between CSV and .alwf"
+    )
+    convert_waterfall_parser.add_argument(
+        "--in-path", required=True, help="Input waterfall (CSV or .alwf)"
+    )
+    convert_waterfall_parser.add_argument(
+        "--out-path", required=True, help="Output waterfall; format chosen by extension"
+    )
+    convert_waterfall_parser.set_defaults(func=cmd_convert_waterfall)
+
     bookmarks_parser = subparsers.add_parser("bookmarks", help="Manage frequency bookmarks")
     bookmarks_sub = bookmarks_parser.add_subparsers(dest="bookmarks_cmd", required=True)
 
@@ -758,7 +1054,7 @@ def build_parser() -> argparse.ArgumentParser:
     bookmarks_match = bookmarks_sub.add_parser(
         "match", help="List bookmarks that fall within a scan's range"
     )
-    bookmarks_match.add_argument("--scan-csv", required=True, help="Scan CSV path")
+    bookmarks_match.add_argument("--scan-csv", required=True, help="Scan path (CSV or .alscan)")
     bookmarks_match.add_argument(
         "--file",
         default="config/bookmarks.csv",
@@ -767,27 +1063,73 @@ def build_parser() -> argparse.ArgumentParser:
     bookmarks_match.set_defaults(func=cmd_bookmark_match)
 
     noise_parser = subparsers.add_parser("noise-floor", help="Estimate noise floor")
-    noise_parser.add_argument("--in-csv", required=True, help="Input scan CSV path")
+    noise_parser.add_argument(
+        "--in-csv",
+        required=True,
+        help="Input scan (CSV or .alscan); a waterfall (CSV or .alwf) for minstats",
+    )
     noise_parser.add_argument("--out-csv", help="Output noise floor CSV path")
     noise_parser.add_argument(
         "--strategy",
+        choices=list(NOISE_FLOOR_STRATEGIES),
         default="avg",
-        help="Noise floor strategy (avg)",
+        help="avg copies avg_db; percentile/median slide across frequency; "
+        "minstats tracks the minimum over time in a waterfall",
+    )
+    noise_parser.add_argument(
+        "--window-bins", type=int, default=31, help="Frequency window for percentile/median (odd)"
+    )
+    noise_parser.add_argument(
+        "--percentile", type=float, default=10.0, help="Percentile for the percentile strategy"
+    )
+    noise_parser.add_argument(
+        "--smooth-slices", type=int, default=4, help="Slices averaged before minstats tracking"
+    )
+    noise_parser.add_argument(
+        "--window-slices", type=int, default=32, help="Slices in the minstats minimum window"
     )
     noise_parser.set_defaults(func=cmd_noise_floor)
 
     compare_parser = subparsers.add_parser("compare", help="Compare two scans")
-    compare_parser.add_argument("--scan-a", required=True, help="Scan A CSV path")
-    compare_parser.add_argument("--scan-b", required=True, help="Scan B CSV path")
+    compare_parser.add_argument("--scan-a", required=True, help="Scan A path (CSV or .alscan)")
+    compare_parser.add_argument("--scan-b", required=True, help="Scan B path (CSV or .alscan)")
     compare_parser.add_argument("--out-csv", help="Output compare CSV path")
+    compare_parser.add_argument(
+        "--bands", type=int, default=10, help="Number of equal-width bands to score separately"
+    )
+    compare_parser.add_argument(
+        "--scores-json", help="Write mean/RMS/percentile and per-band scores to this JSON path"
+    )
     compare_parser.set_defaults(func=cmd_compare)
 
+    compare_batch_parser = subparsers.add_parser(
+        "compare-batch", help="Score many scans against each other in one pass"
+    )
+    compare_batch_parser.add_argument(
+        "--scans", nargs="+", required=True, help="Scan paths (CSV or .alscan)"
+    )
+    compare_batch_parser.add_argument(
+        "--reference", help="Only score each scan against this one (added if not in --scans)"
+    )
+    compare_batch_parser.add_argument(
+        "--metric",
+        choices=list(METRICS),
+        default="rms",
+        help="Metric for the score matrix and ranking",
+    )
+    compare_batch_parser.add_argument(
+        "--workers", type=int, help="Processes for per-pair percentiles (default: device.workers)"
+    )
+    compare_batch_parser.add_argument("--out-matrix", help="Output score matrix CSV path")
+    compare_batch_parser.add_argument("--out-ranked", help="Output ranked pairs CSV path")
+    compare_batch_parser.set_defaults(func=cmd_compare_batch)
+
     alerts_parser = subparsers.add_parser("alerts", help="Run alert rules on a scan")
-    alerts_parser.add_argument("--scan-csv", required=True, help="Input scan CSV path")
+    alerts_parser.add_argument("--scan-csv", required=True, help="Input scan path (CSV or .alscan)")
     alerts_parser.add_argument(
         "--rules",
         default="config/alerts.csv",
-        help="Alert rules CSV (freq_hz,threshold_db)",
+        help="Alert rules CSV (freq_hz or start_hz:stop_hz,threshold_db[,avg|max])",
     )
     alerts_parser.add_argument(
         "--out-log",
@@ -824,11 +1166,15 @@ def build_parser() -> argparse.ArgumentParser:
     monitor_parser.add_argument("--start-hz", type=float, help="Scan start frequency (Hz)")
     monitor_parser.add_argument("--stop-hz", type=float, help="Scan stop frequency (Hz)")
     monitor_parser.add_argument("--bin-hz", type=float, help="Bin size (Hz)")
-    monitor_parser.add_argument("--interval-sec", type=int, default=60, help="Interval seconds")
+    monitor_parser.add_argument(
+        "--interval-sec", type=float, default=60.0, help="Scan period in seconds (sub-second allowed)"
+    )
     monitor_parser.add_argument("--iterations", type=int, default=10, help="Number of scans")
-    monitor_parser.add_argument("--duration-min", type=int, help="Total duration in minutes")
+    monitor_parser.add_argument("--duration-min", type=float, help="Total duration in minutes")
     monitor_parser.add_argument("--session", help="Session name")
     monitor_parser.add_argument("--seed", type=int, help="Random seed for simulated scan")
+    monitor_parser.add_argument("--baseline-csv", help="Baseline scan to subtract from every iteration")
+    monitor_parser.add_argument("--baseline-tag", help="Baseline tag to apply to every iteration")
     monitor_parser.add_argument("--bookmarks-file", default="config/bookmarks.csv", help="Bookmarks CSV file")
     monitor_parser.add_argument("--sample-rate", type=float, help="RTL-SDR sample rate (Hz)")
     monitor_parser.add_argument("--gain", help="RTL-SDR gain (auto or dB)")
@@ -836,6 +1182,58 @@ def build_parser() -> argparse.ArgumentParser:
     monitor_parser.add_argument("--step-hz", type=float, help="Sweep step size (Hz)")
     monitor_parser.add_argument("--sweeps", type=int, help="Number of sweeps to average")
     monitor_parser.add_argument("--dwell-ms", type=int, help="Delay between center steps (ms)")
+    monitor_parser.add_argument(
+        "--segments", type=int, help="FFT segments averaged per center step (Welch)"
+    )
+    monitor_parser.add_argument(
+        "--overlap", type=float, help="Fractional overlap between segments, 0 <= overlap < 1"
+    )
+    monitor_parser.add_argument(
+        "--averaging",
+        choices=["db", "linear"],
+        help="Average in dB (legacy) or in linear power",
+    )
+    monitor_parser.add_argument(
+        "--scan-format",
+        choices=list(SCAN_FORMATS),
+        help="Per-iteration scan file format (csv or alscan)",
+    )
+    monitor_parser.add_argument(
+        "--alert-rules", help="Alert rules CSV evaluated live on every iteration"
+    )
+    monitor_parser.add_argument(
+        "--alert-hysteresis-db",
+        type=float,
+        help="dB below threshold a rule must drop before it clears (default 3)",
+    )
+    monitor_parser.add_argument(
+        "--alert-hold-sec",
+        type=float,
+        help="Seconds a rule must stay above/below before it rises/clears",
+    )
+    monitor_parser.add_argument(
+        "--alert-cooldown-sec",
+        type=float,
+        help="Minimum seconds between two rises of the same rule",
+    )
+    monitor_parser.add_argument(
+        "--alert-sink",
+        action="append",
+        help="Forward alert edges to http://host:port/path, unix:/socket/path or a .jsonl file",
+    )
+    monitor_parser.add_argument(
+        "--alert-queue-size", type=int, help="Bounded alert dispatch queue (default 1024)"
+    )
+    monitor_parser.add_argument(
+        "--write-queue-depth",
+        type=int,
+        help="Iterations buffered for the background writer (default 4)",
+    )
+    monitor_parser.add_argument(
+        "--write-policy",
+        choices=list(BACKPRESSURE_POLICIES),
+        help="When the writer falls behind: block capture or drop that iteration's files",
+    )
     monitor_parser.add_argument(
         "--report-pack",
         action="store_true",
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable
+from functools import cached_property
+from typing import Iterable, Iterator, Sequence, overload
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -12,13 +15,124 @@ class ScanBin:
     max_db: float
 
 
+def _float_column(values: object) -> np.ndarray:
+    column = np.asanyarray(values)
+    if column.dtype not in (np.float32, np.float64):
+        column = column.astype(np.float64)
+    return column
+
+
+@dataclass(frozen=True, eq=False)
+class Spectrum:
+    start_hz: float
+    bin_hz: float
+    avg_db: np.ndarray
+    max_db: np.ndarray
+
+    def __post_init__(self) -> None:
+        avg_db = _float_column(self.avg_db)
+        max_db = _float_column(self.max_db)
+        if avg_db.ndim != 1 or avg_db.shape != max_db.shape:
+            raise ValueError("avg_db and max_db must be 1-D columns of equal length")
+        object.__setattr__(self, "start_hz", float(self.start_hz))
+        object.__setattr__(self, "bin_hz", float(self.bin_hz))
+        object.__setattr__(self, "avg_db", avg_db)
+        object.__setattr__(self, "max_db", max_db)
+
+    @classmethod
+    def from_bins(
+        cls, bins: Iterable[ScanBin], *, start_hz: float, bin_hz: float
+    ) -> "Spectrum":
+        if isinstance(bins, Spectrum):
+            return bins
+        bins = list(bins)
+        # The grid replaces the per-bin frequencies, so they must agree with it.
+        freq_hz = np.fromiter((b.freq_hz for b in bins), dtype=np.float64, count=len(bins))
+        if not np.allclose(
+            freq_hz, start_hz + np.arange(len(bins)) * bin_hz, rtol=1e-9, atol=1e-6
+        ):
+            raise ValueError("scan bin frequencies do not match start_hz + i * bin_hz")
+        return cls(
+            start_hz=start_hz,
+            bin_hz=bin_hz,
+            avg_db=np.fromiter((b.avg_db for b in bins), dtype=np.float64, count=len(bins)),
+            max_db=np.fromiter((b.max_db for b in bins), dtype=np.float64, count=len(bins)),
+        )
+
+    @property
+    def freq_hz(self) -> np.ndarray:
+        return self.start_hz + np.arange(len(self)) * self.bin_hz
+
+    @property
+    def stop_hz(self) -> float:
+        return self.start_hz + len(self) * self.bin_hz
+
+    def index_of(self, freq_hz: float) -> int:
+        return int((freq_hz - self.start_hz) // self.bin_hz)
+
+    def slice_hz(self, start_hz: float, stop_hz: float) -> "Spectrum":
+        lo = max(0, int(np.ceil((start_hz - self.start_hz) / self.bin_hz)))
+        hi = min(len(self), int(np.ceil((stop_hz - self.start_hz) / self.bin_hz)))
+        return self[lo:max(lo, hi)]
+
+    def iter_bins(self) -> Iterator[ScanBin]:
+        start_hz = self.start_hz
+        bin_hz = self.bin_hz
+        for idx, (avg_db, max_db) in enumerate(zip(self.avg_db.tolist(), self.max_db.tolist())):
+            yield ScanBin(freq_hz=start_hz + idx * bin_hz, avg_db=avg_db, max_db=max_db)
+
+    def __len__(self) -> int:
+        return int(self.avg_db.shape[0])
+
+    def __iter__(self) -> Iterator[ScanBin]:
+        return self.iter_bins()
+
+    @overload
+    def __getitem__(self, index: int) -> ScanBin:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "Spectrum":
+        ...
+
+    def __getitem__(self, index: int | slice) -> ScanBin | "Spectrum":
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Spectrum slices must be contiguous")
+            return Spectrum(
+                start_hz=self.start_hz + start * self.bin_hz,
+                bin_hz=self.bin_hz,
+                avg_db=self.avg_db[start:stop],
+                max_db=self.max_db[start:stop],
+            )
+        idx = range(len(self))[index]
+        return ScanBin(
+            freq_hz=self.start_hz + idx * self.bin_hz,
+            avg_db=float(self.avg_db[idx]),
+            max_db=float(self.max_db[idx]),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Spectrum):
+            return NotImplemented
+        return (
+            self.start_hz == other.start_hz
+            and self.bin_hz == other.bin_hz
+            and np.array_equal(self.avg_db, other.avg_db, equal_nan=True)
+            and np.array_equal(self.max_db, other.max_db, equal_nan=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+
 @dataclass(frozen=True)
 class ScanResult:
     timestamp: str
     start_hz: float
     stop_hz: float
     bin_hz: float
-    bins: tuple[ScanBin, ...]
+    bins: Sequence[ScanBin]
     antenna_tag: str | None = None
     location_tag: str | None = None
 
@@ -26,6 +140,10 @@ class ScanResult:
     def now_iso() -> str:
         return datetime.now(timezone.utc).isoformat()
 
+    @cached_property
+    def spectrum(self) -> Spectrum:
+        return Spectrum.from_bins(self.bins, start_hz=self.start_hz, bin_hz=self.bin_hz)
+
     def iter_bins(self) -> Iterable[ScanBin]:
         return self.bins
 
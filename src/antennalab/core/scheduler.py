@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Tick:
+    index: int
+    slot: int
+    deadline: float
+    started: float
+    missed_before: int
+
+    @property
+    def lateness_sec(self) -> float:
+        return self.started - self.deadline
+
+
+@dataclass(frozen=True)
+class ScheduleStats:
+    interval_sec: float
+    ticks: int
+    missed_slots: int
+    lateness_mean_ms: float | None
+    lateness_p50_ms: float | None
+    lateness_p95_ms: float | None
+    lateness_max_ms: float | None
+    period_mean_sec: float | None
+    period_std_ms: float | None
+
+
+class DeadlineScheduler:
+    # Slot k is due at start + k * interval on the monotonic clock, so scan and
+    # write time never accumulate into the period. A slot that cannot start
+    # within max_lateness_sec of its deadline is skipped and counted as missed.
+    def __init__(
+        self,
+        interval_sec: float,
+        *,
+        iterations: int | None = None,
+        duration_sec: float | None = None,
+        max_lateness_sec: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be > 0")
+        if iterations is None and duration_sec is None:
+            raise ValueError("scheduler needs iterations or duration_sec")
+        if iterations is not None and iterations <= 0:
+            raise ValueError("iterations must be > 0")
+        if duration_sec is not None and duration_sec <= 0:
+            raise ValueError("duration_sec must be > 0")
+        self.interval_sec = float(interval_sec)
+        self.iterations = iterations
+        self.duration_sec = duration_sec
+        self.max_lateness_sec = (
+            self.interval_sec / 2.0 if max_lateness_sec is None else max_lateness_sec
+        )
+        self._clock = clock
+        self._sleep = sleep
+        self.ticks: list[Tick] = []
+        self.missed_slots = 0
+
+    def _in_range(self, slot: int, executed: int) -> bool:
+        if self.iterations is not None and executed >= self.iterations:
+            return False
+        # The tolerance keeps float rounding from adding a slot at the very end.
+        if self.duration_sec is not None:
+            return slot * self.interval_sec < self.duration_sec - 1e-9
+        return True
+
+    def __iter__(self) -> Iterator[Tick]:
+        start = self._clock()
+        slot = 0
+        missed = 0
+        while self._in_range(slot, len(self.ticks)):
+            deadline = start + slot * self.interval_sec
+            now = self._clock()
+            if now - deadline > self.max_lateness_sec:
+                # Jump to the first slot that can still start on time.
+                next_slot = math.ceil((now - start - self.max_lateness_sec) / self.interval_sec)
+                next_slot = max(next_slot, slot + 1)
+                missed += next_slot - slot
+                self.missed_slots += next_slot - slot
+                slot = next_slot
+                continue
+            if now < deadline:
+                self._sleep(deadline - now)
+                now = self._clock()
+            tick = Tick(
+                index=len(self.ticks),
+                slot=slot,
+                deadline=deadline,
+                started=now,
+                missed_before=missed,
+            )
+            self.ticks.append(tick)
+            missed = 0
+            yield tick
+            slot += 1
+
+    def stats(self) -> ScheduleStats:
+        lateness_ms = np.array([tick.lateness_sec for tick in self.ticks]) * 1000.0
+        periods = np.diff([tick.started for tick in self.ticks])
+        has_ticks = len(lateness_ms) > 0
+        has_periods = len(periods) > 0
+        return ScheduleStats(
+            interval_sec=self.interval_sec,
+            ticks=len(self.ticks),
+            missed_slots=self.missed_slots,
+            lateness_mean_ms=float(np.mean(lateness_ms)) if has_ticks else None,
+            lateness_p50_ms=float(np.percentile(lateness_ms, 50.0)) if has_ticks else None,
+            lateness_p95_ms=float(np.percentile(lateness_ms, 95.0)) if has_ticks else None,
+            lateness_max_ms=float(np.max(lateness_ms)) if has_ticks else None,
+            period_mean_sec=float(np.mean(periods)) if has_periods else None,
+            period_std_ms=float(np.std(periods) * 1000.0) if has_periods else None,
+        )
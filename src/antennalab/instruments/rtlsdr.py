@@ -1,14 +1,84 @@
 from __future__ import annotations
 
-import math
-import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from antennalab.analysis.spectrum import ScanSimulator
-from antennalab.core.models import ScanBin, ScanResult, SweepStatsBin
+from antennalab.core.models import ScanResult, Spectrum, SweepStatsBin
 from antennalab.core.plugins import HealthCheck, PluginInfo
 
+if TYPE_CHECKING:
+    from antennalab.analysis.scan import CaptureTimings
+
+
+class RTLSDRSession:
+    def __init__(self) -> None:
+        self._sdr = None
+        self._sample_rate_hz: float | None = None
+        self._gain_db: float | str | None = None
+        self._center_hz: float | None = None
+        self.opens = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._sdr is not None
+
+    def open(self) -> None:
+        if self._sdr is not None:
+            return
+        try:
+            from rtlsdr import RtlSdr
+        except ImportError as exc:  # pragma: no cover - depends on optional deps
+            raise SystemExit(
+                "Real mode requires numpy and pyrtlsdr. Install with: pip install numpy pyrtlsdr"
+            ) from exc
+        self._sdr = RtlSdr()
+        self.opens += 1
+
+    def configure(self, *, sample_rate_hz: float, gain_db: float | str) -> None:
+        self.open()
+        if sample_rate_hz != self._sample_rate_hz:
+            self._sdr.sample_rate = sample_rate_hz
+            self._sample_rate_hz = sample_rate_hz
+            self._center_hz = None
+        gain = "auto" if gain_db == "auto" else float(gain_db)
+        if gain != self._gain_db:
+            self._sdr.gain = gain
+            self._gain_db = gain
+
+    def tune(self, center_hz: float) -> None:
+        self.open()
+        if center_hz != self._center_hz:
+            self._sdr.center_freq = center_hz
+            self._center_hz = center_hz
+
+    def read_samples(self, count: int):
+        self.open()
+        return self._sdr.read_samples(count)
+
+    def close(self) -> None:
+        if self._sdr is None:
+            return
+        try:
+            self._sdr.close()
+        finally:
+            self._sdr = None
+            self._sample_rate_hz = None
+            self._gain_db = None
+            self._center_hz = None
+
+    def __enter__(self) -> "RTLSDRSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
 
 class RTLSDRPlugin:
+    def __init__(self, plan_cache_dir: str | Path | None = None) -> None:
+        self.plan_cache_dir = plan_cache_dir
+        self.last_timings: CaptureTimings | None = None
+
     def info(self) -> PluginInfo:
         return PluginInfo(
             name="rtl-sdr",
@@ -31,6 +101,9 @@ class RTLSDRPlugin:
             detail="Config looks valid; hardware check not implemented",
         )
 
+    def open_session(self) -> RTLSDRSession:
+        return RTLSDRSession()
+
     def scan_simulated(
         self,
         *,
@@ -65,6 +138,12 @@ class RTLSDRPlugin:
         missing_db: float,
         antenna_tag: str | None,
         location_tag: str | None,
+        session: RTLSDRSession | None = None,
+        queue_depth: int = 4,
+        workers: int = 1,
+        segments: int = 1,
+        overlap: float = 0.0,
+        averaging: str = "db",
     ) -> ScanResult:
         scan, _ = self.scan_real_with_sweep_stats(
             start_hz=start_hz,
@@ -79,6 +158,12 @@ class RTLSDRPlugin:
             missing_db=missing_db,
             antenna_tag=antenna_tag,
             location_tag=location_tag,
+            session=session,
+            queue_depth=queue_depth,
+            workers=workers,
+            segments=segments,
+            overlap=overlap,
+            averaging=averaging,
         )
         return scan
 
@@ -97,10 +182,22 @@ class RTLSDRPlugin:
         missing_db: float,
         antenna_tag: str | None,
         location_tag: str | None,
+        session: RTLSDRSession | None = None,
+        queue_depth: int = 4,
+        workers: int = 1,
+        segments: int = 1,
+        overlap: float = 0.0,
+        averaging: str = "db",
     ) -> tuple[ScanResult, tuple[SweepStatsBin, ...]]:
         try:
             import numpy as np
-            from rtlsdr import RtlSdr
+
+            from antennalab.analysis.scan import (
+                BinAccumulator,
+                SegmentLayout,
+                get_sweep_plan,
+                run_capture_pipeline,
+            )
         except ImportError as exc:  # pragma: no cover - depends on optional deps
             raise SystemExit(
                 "Real mode requires numpy and pyrtlsdr. Install with: pip install numpy pyrtlsdr"
@@ -119,101 +216,58 @@ class RTLSDRPlugin:
         if dwell_ms < 0:
             raise ValueError("dwell_ms must be >= 0")
 
-        step = step_hz or sample_rate_hz * 0.8
-        n_bins = int(math.ceil((stop_hz - start_hz) / bin_hz))
-        sum_bins = [0.0] * n_bins
-        count_bins = [0] * n_bins
-        max_bins = [float("-inf")] * n_bins
-
-        sweep_min = [float("inf")] * n_bins
-        sweep_max = [float("-inf")] * n_bins
-        sweep_sum = [0.0] * n_bins
-        sweep_count = [0] * n_bins
+        layout = SegmentLayout(fft_size=fft_size, segments=segments, overlap=overlap)
+        plan = get_sweep_plan(
+            start_hz=start_hz,
+            stop_hz=stop_hz,
+            bin_hz=bin_hz,
+            sample_rate_hz=sample_rate_hz,
+            fft_size=fft_size,
+            step_hz=step_hz,
+            cache_dir=self.plan_cache_dir,
+        )
+        n_bins = plan.n_bins
+        accumulator = BinAccumulator(n_bins, sweeps, averaging=averaging)
 
-        sdr = RtlSdr()
+        owns_session = session is None
+        if session is None:
+            session = self.open_session()
         try:
-            sdr.sample_rate = sample_rate_hz
-            if gain_db == "auto":
-                sdr.gain = "auto"
-            else:
-                sdr.gain = float(gain_db)
-
-            window = np.hanning(fft_size)
-            for _ in range(sweeps):
-                per_sweep_sum = [0.0] * n_bins
-                per_sweep_count = [0] * n_bins
-                center = start_hz + sample_rate_hz / 2.0
-                while center < stop_hz:
-                    sdr.center_freq = center
-                    samples = sdr.read_samples(fft_size)
-                    spectrum = np.fft.fftshift(np.fft.fft(samples * window))
-                    power = 20 * np.log10(np.abs(spectrum) + 1e-12)
-                    freqs = np.fft.fftshift(
-                        np.fft.fftfreq(fft_size, d=1.0 / sample_rate_hz)
-                    )
-                    freqs = freqs + center
-
-                    for freq_hz, power_db in zip(freqs, power):
-                        if freq_hz < start_hz or freq_hz >= stop_hz:
-                            continue
-                        idx = int((freq_hz - start_hz) // bin_hz)
-                        if idx < 0 or idx >= n_bins:
-                            continue
-                        sum_bins[idx] += float(power_db)
-                        count_bins[idx] += 1
-                        if power_db > max_bins[idx]:
-                            max_bins[idx] = float(power_db)
-                        per_sweep_sum[idx] += float(power_db)
-                        per_sweep_count[idx] += 1
-
-                    if dwell_ms:
-                        time.sleep(dwell_ms / 1000.0)
-                    center += step
-
-                for idx in range(n_bins):
-                    if per_sweep_count[idx] == 0:
-                        sweep_avg = missing_db
-                    else:
-                        sweep_avg = per_sweep_sum[idx] / per_sweep_count[idx]
-                    sweep_sum[idx] += sweep_avg
-                    sweep_count[idx] += 1
-                    if sweep_avg < sweep_min[idx]:
-                        sweep_min[idx] = sweep_avg
-                    if sweep_avg > sweep_max[idx]:
-                        sweep_max[idx] = sweep_avg
+            session.configure(sample_rate_hz=sample_rate_hz, gain_db=gain_db)
+            self.last_timings = run_capture_pipeline(
+                session,
+                plan,
+                accumulator,
+                sweeps=sweeps,
+                dwell_ms=dwell_ms,
+                queue_depth=queue_depth,
+                workers=workers,
+                layout=layout,
+            )
         finally:
-            sdr.close()
-
-        bins: list[ScanBin] = []
-        sweep_bins: list[SweepStatsBin] = []
-        for idx in range(n_bins):
-            freq = start_hz + idx * bin_hz
-            if count_bins[idx] == 0:
-                avg_db = missing_db
-                max_db = missing_db
-            else:
-                avg_db = sum_bins[idx] / count_bins[idx]
-                max_db = max_bins[idx]
-            bins.append(ScanBin(freq_hz=freq, avg_db=avg_db, max_db=max_db))
-
-            mean_sweep = sweep_sum[idx] / sweep_count[idx] if sweep_count[idx] else missing_db
-            min_sweep = sweep_min[idx] if sweep_min[idx] != float("inf") else missing_db
-            max_sweep = sweep_max[idx] if sweep_max[idx] != float("-inf") else missing_db
-            sweep_bins.append(
-                SweepStatsBin(
-                    freq_hz=freq,
-                    sweep_avg_min_db=min_sweep,
-                    sweep_avg_mean_db=mean_sweep,
-                    sweep_avg_max_db=max_sweep,
-                )
+            if owns_session:
+                session.close()
+
+        avg_db, max_db, sweep_min, sweep_mean, sweep_max = accumulator.finish(missing_db)
+        freqs_out = (start_hz + np.arange(n_bins) * bin_hz).tolist()
+        sweep_bins = [
+            SweepStatsBin(
+                freq_hz=freq,
+                sweep_avg_min_db=low,
+                sweep_avg_mean_db=mean,
+                sweep_avg_max_db=high,
+            )
+            for freq, low, mean, high in zip(
+                freqs_out, sweep_min.tolist(), sweep_mean.tolist(), sweep_max.tolist()
             )
+        ]
 
         scan = ScanResult(
             timestamp=ScanResult.now_iso(),
             start_hz=start_hz,
             stop_hz=stop_hz,
             bin_hz=bin_hz,
-            bins=tuple(bins),
+            bins=Spectrum(start_hz=start_hz, bin_hz=bin_hz, avg_db=avg_db, max_db=max_db),
             antenna_tag=antenna_tag,
             location_tag=location_tag,
         )
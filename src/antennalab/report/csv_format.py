@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+import numpy as np
+
+BLOCK_ROWS = 1 << 16
+
+_MAX_EXACT = 2.0**52
+
+
+class _Column:
+    def __init__(self, values: np.ndarray, decimals: int) -> None:
+        self.values = np.asarray(values, dtype=np.float64)
+        self.decimals = decimals
+        self.table: np.ndarray | None = None
+        self.index: np.ndarray | None = None
+        self.digits_width = 0
+        if decimals == 0 and self._plain_integers():
+            self.integers = np.rint(self.values).astype(np.int64)
+            self.digits_width = len(str(int(self.integers.max()))) if len(self.integers) else 1
+        else:
+            self._build_table()
+
+    def _plain_integers(self) -> bool:
+        values = self.values
+        return bool(
+            len(values) == 0
+            or (np.isfinite(values).all() and values.min() >= 0 and values.max() < _MAX_EXACT)
+        )
+
+    def _build_table(self) -> None:
+        # Every distinct rounded value gets one label; values that sit on a
+        # rounding tie (or are not finite) are formatted individually.
+        values = self.values
+        scaled = values * 10.0**self.decimals
+        finite = np.isfinite(scaled) & (np.abs(scaled) < _MAX_EXACT)
+        scaled = np.where(finite, scaled, 0.0)
+        steps = np.rint(scaled).astype(np.int64)
+        tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-12 * np.maximum(1.0, np.abs(scaled))
+        exact = finite & ~tie
+        low = int(steps.min()) if len(steps) else 0
+        high = int(steps.max()) if len(steps) else 0
+        if high - low > 2 * len(values) + 4096:
+            labels = [f"{value:.{self.decimals}f}" for value in values.tolist()]
+            index = np.arange(len(values))
+        else:
+            scale = 10.0**self.decimals
+            labels = [f"{step / scale:.{self.decimals}f}" for step in range(low, high + 1)]
+            index = steps - low
+            negative_zero = exact & (steps == 0) & np.signbit(values)
+            if negative_zero.any():
+                index[negative_zero] = len(labels)
+                labels.append(f"{-0.0:.{self.decimals}f}")
+            for pos in np.flatnonzero(~exact).tolist():
+                index[pos] = len(labels)
+                labels.append(f"{values[pos]:.{self.decimals}f}")
+        encoded = np.array([label.encode("ascii") for label in labels] or [b"0"], dtype=np.bytes_)
+        self.table = encoded.view(np.uint8).reshape(len(encoded), -1)
+        self.index = index
+
+    def block(self, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+        if self.table is not None:
+            chars = self.table[self.index[start:stop]]
+            return chars, chars != 0
+        rest = self.integers[start:stop].copy()
+        chars = np.empty((stop - start, self.digits_width), dtype=np.uint8)
+        for pos in range(self.digits_width - 1, -1, -1):
+            rest, chars[:, pos] = np.divmod(rest, 10)
+        valid = np.logical_or.accumulate(chars != 0, axis=1)
+        valid[:, -1] = True
+        chars += ord("0")
+        return chars, valid
+
+
+def iter_csv_blocks(
+    columns: Sequence[np.ndarray],
+    decimals: Sequence[int],
+    *,
+    block_rows: int = BLOCK_ROWS,
+    prefix: str = "",
+) -> Iterator[str]:
+    if len(columns) != len(decimals):
+        raise ValueError("columns and decimals must have the same length")
+    prepared = [_Column(values, digits) for values, digits in zip(columns, decimals)]
+    n_rows = len(prepared[0].values) if prepared else 0
+    if any(len(col.values) != n_rows for col in prepared):
+        raise ValueError("columns must have the same length")
+
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        chars: list[np.ndarray] = []
+        valid: list[np.ndarray] = []
+        if prefix:
+            lead = np.frombuffer(prefix.encode("ascii"), dtype=np.uint8)
+            chars.append(np.tile(lead, (stop - start, 1)))
+            valid.append(np.ones((stop - start, len(lead)), dtype=bool))
+        for pos, column in enumerate(prepared):
+            if pos:
+                chars.append(np.full((stop - start, 1), ord(","), dtype=np.uint8))
+                valid.append(np.ones((stop - start, 1), dtype=bool))
+            block_chars, block_valid = column.block(start, stop)
+            chars.append(block_chars)
+            valid.append(block_valid)
+        chars.append(np.tile(np.frombuffer(b"\r\n", dtype=np.uint8), (stop - start, 1)))
+        valid.append(np.ones((stop - start, 2), dtype=bool))
+        rows = np.concatenate(chars, axis=1)
+        mask = np.concatenate(valid, axis=1)
+        yield rows[mask].tobytes().decode("ascii")
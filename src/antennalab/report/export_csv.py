@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import csv
+import warnings
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
-from antennalab.core.models import ScanBin, ScanResult, SweepStatsBin
+import numpy as np
+
+from antennalab.core.models import ScanResult, Spectrum, SweepStatsBin
+from antennalab.report.csv_format import iter_csv_blocks
 
 
 @dataclass(frozen=True)
@@ -45,19 +49,16 @@ def write_scan_csv(scan: ScanResult, path: str | Path) -> Path:
             ]
         )
         writer.writerow(["freq_hz", "avg_db", "max_db"])
-        for scan_bin in scan.iter_bins():
-            writer.writerow(
-                [
-                    f"{scan_bin.freq_hz:.0f}",
-                    f"{scan_bin.avg_db:.2f}",
-                    f"{scan_bin.max_db:.2f}",
-                ]
-            )
+        spectrum = scan.spectrum
+        for block in iter_csv_blocks(
+            (spectrum.freq_hz, spectrum.avg_db, spectrum.max_db), (0, 2, 2)
+        ):
+            handle.write(block)
 
     return output_path
 
 
-def read_scan_csv(path: str | Path) -> tuple[ScanMeta, list[ScanBin]]:
+def read_scan_csv(path: str | Path) -> tuple[ScanMeta, Spectrum]:
     input_path = Path(path)
     with input_path.open("r", newline="", encoding="utf-8") as handle:
         reader = csv.reader(handle)
@@ -73,31 +74,63 @@ def read_scan_csv(path: str | Path) -> tuple[ScanMeta, list[ScanBin]]:
             antenna_tag=values[4] or None,
             location_tag=values[5] or None,
         )
-        bins_header = next(reader)
+        bins_header = handle.readline().rstrip("\r\n").split(",")
         if bins_header[:3] != ["freq_hz", "avg_db", "max_db"]:
             raise ValueError("unexpected scan CSV bins header")
-        bins: list[ScanBin] = []
-        for row in reader:
-            if not row:
-                continue
-            bins.append(
-                ScanBin(
-                    freq_hz=float(row[0]),
-                    avg_db=float(row[1]),
-                    max_db=float(row[2]),
-                )
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="loadtxt: input contained no data")
+            columns = np.loadtxt(
+                handle, delimiter=",", usecols=(0, 1, 2), dtype=np.float64, ndmin=2
             )
-    return meta, bins
+    freq_hz, avg_db, max_db = columns[:, 0], columns[:, 1], columns[:, 2]
+    expected = meta.start_hz + np.arange(len(freq_hz)) * meta.bin_hz
+    if np.all(np.abs(freq_hz - expected) <= _freq_tolerance(expected)):
+        spectrum = Spectrum(
+            start_hz=meta.start_hz, bin_hz=meta.bin_hz, avg_db=avg_db, max_db=max_db
+        )
+    else:
+        spectrum = _spectrum_from_rows(meta, freq_hz, avg_db, max_db)
+    return meta, spectrum
+
+
+def _freq_tolerance(freq_hz: np.ndarray) -> np.ndarray:
+    # freq_hz is written rounded to whole Hz.
+    return 0.5 + 1e-9 * np.abs(freq_hz)
+
+
+def _spectrum_from_rows(
+    meta: ScanMeta, freq_hz: np.ndarray, avg_db: np.ndarray, max_db: np.ndarray
+) -> Spectrum:
+    # Cropped or gapped files: place each row on the header grid by its own
+    # frequency and leave the missing bins as NaN.
+    index = np.rint((freq_hz - meta.start_hz) / meta.bin_hz).astype(np.int64)
+    on_grid = meta.start_hz + index * meta.bin_hz
+    if np.any(np.abs(freq_hz - on_grid) > _freq_tolerance(on_grid)):
+        raise ValueError("scan CSV frequencies do not lie on the start_hz/bin_hz grid")
+    if len(np.unique(index)) != len(index):
+        raise ValueError("scan CSV has duplicate frequency rows")
+    first = int(index.min())
+    n_bins = int(index.max()) - first + 1
+    grid_avg = np.full(n_bins, np.nan)
+    grid_max = np.full(n_bins, np.nan)
+    grid_avg[index - first] = avg_db
+    grid_max[index - first] = max_db
+    return Spectrum(
+        start_hz=meta.start_hz + first * meta.bin_hz,
+        bin_hz=meta.bin_hz,
+        avg_db=grid_avg,
+        max_db=grid_max,
+    )
 
 
 def scan_from_csv(path: str | Path) -> ScanResult:
-    meta, bins = read_scan_csv(path)
+    meta, spectrum = read_scan_csv(path)
     return ScanResult(
         timestamp=meta.timestamp,
         start_hz=meta.start_hz,
         stop_hz=meta.stop_hz,
         bin_hz=meta.bin_hz,
-        bins=tuple(bins),
+        bins=spectrum,
         antenna_tag=meta.antenna_tag,
         location_tag=meta.location_tag,
     )
@@ -143,13 +176,10 @@ def write_noise_floor_csv(
             ]
         )
         writer.writerow(["freq_hz", "noise_floor_db"])
-        for bin_ in result.bins:
-            writer.writerow(
-                [
-                    f"{bin_.freq_hz:.0f}",
-                    f"{bin_.noise_floor_db:.2f}",
-                ]
-            )
+        for freq_hz, noise_floor_db in zip(
+            result.freq_hz.tolist(), result.noise_floor_db.tolist()
+        ):
+            writer.writerow([f"{freq_hz:.0f}", f"{noise_floor_db:.2f}"])
 
     return output_path
 
@@ -168,14 +198,13 @@ def write_compare_csv(result: "CompareResult", path: str | Path) -> Path:
         writer.writerow(["scan_a", "scan_b", "score"])
         writer.writerow([result.scan_a, result.scan_b, f"{result.score:.3f}"])
         writer.writerow(["freq_hz", "delta_avg_db", "delta_max_db"])
-        for bin_ in result.bins:
-            writer.writerow(
-                [
-                    f"{bin_.freq_hz:.0f}",
-                    f"{bin_.delta_avg_db:.2f}",
-                    f"{bin_.delta_max_db:.2f}",
-                ]
-            )
+        columns = (result.freq_hz, result.delta_avg_db, result.delta_max_db)
+        # Bins either scan left empty have no delta to report.
+        finite = np.isfinite(result.delta_avg_db) & np.isfinite(result.delta_max_db)
+        if not finite.all():
+            columns = tuple(column[finite] for column in columns)
+        for block in iter_csv_blocks(columns, (0, 2, 2)):
+            handle.write(block)
 
     return output_path
 
@@ -22,6 +22,8 @@ def plot_monitor_summary(input_json: str | Path, output_png: str | Path) -> Path
     max_max: list[float] = []
 
     for record in records:
+        if not record.get("queued", True):
+            continue
         report_path = Path(record["report_json"])
         report = json.loads(report_path.read_text(encoding="utf-8"))
         ts = report.get("timestamp")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import base64
+import colorsys
+
+import numpy as np
+
+BUILTIN_PALETTES = ("heat", "gray")
+MATPLOTLIB_PALETTES = ("viridis", "plasma", "inferno", "magma", "cividis", "turbo")
+PALETTE_NAMES = BUILTIN_PALETTES + MATPLOTLIB_PALETTES
+
+# Code 0 is reserved for missing cells (see waterfall_grid.quantize).
+MISSING_RGBA = (0, 0, 0, 255)
+
+
+def palette_lut(name: str) -> np.ndarray:
+    if name not in PALETTE_NAMES:
+        raise ValueError(f"unsupported palette: {name}")
+    levels = np.linspace(0.0, 1.0, 255)
+    lut = np.empty((256, 4), dtype=np.uint8)
+    lut[0] = MISSING_RGBA
+    lut[1:, 3] = 255
+    if name == "gray":
+        lut[1:, :3] = np.floor(levels * 255.0)[:, None]
+    elif name == "heat":
+        # blue -> red through the hue wheel, as the original per-pixel renderer did.
+        rgb = [colorsys.hls_to_rgb((1.0 - c) * 240.0 / 360.0, 0.5, 1.0) for c in levels]
+        lut[1:, :3] = np.rint(np.asarray(rgb) * 255.0)
+    else:
+        try:
+            from matplotlib import colormaps
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise SystemExit(
+                f"palette {name} requires matplotlib. Install with: pip install matplotlib"
+            ) from exc
+        lut[1:] = np.rint(colormaps[name](levels) * 255.0)
+        lut[1:, 3] = 255
+    return lut
+
+
+def available_palettes() -> tuple[str, ...]:
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:  # pragma: no cover - optional dependency
+        return BUILTIN_PALETTES
+    return PALETTE_NAMES
+
+
+def palette_luts_b64(names: tuple[str, ...]) -> dict[str, str]:
+    return {name: base64.b64encode(palette_lut(name).tobytes()).decode("ascii") for name in names}
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from antennalab.report.export_csv import scan_from_csv
+from antennalab.report.scan_io import load_scan
 
 
 def plot_scan_csv(input_csv: str | Path, output_png: str | Path) -> Path:
@@ -11,10 +11,10 @@ def plot_scan_csv(input_csv: str | Path, output_png: str | Path) -> Path:
     except ImportError as exc:  # pragma: no cover - optional dependency
         raise SystemExit("plot-scan requires matplotlib. Install with: pip install matplotlib") from exc
 
-    scan = scan_from_csv(input_csv)
-    freqs = [b.freq_hz / 1e6 for b in scan.bins]
-    avg_vals = [b.avg_db for b in scan.bins]
-    max_vals = [b.max_db for b in scan.bins]
+    spectrum = load_scan(input_csv).spectrum
+    freqs = spectrum.freq_hz / 1e6
+    avg_vals = spectrum.avg_db
+    max_vals = spectrum.max_db
 
     output_path = Path(output_png)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -16,6 +16,8 @@ def write_run_report(
     output_path = Path(path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    spectrum = scan.spectrum
+    has_bins = len(spectrum) > 0
     payload: dict[str, Any] = {
         "timestamp": scan.timestamp,
         "start_hz": scan.start_hz,
@@ -23,14 +25,14 @@ def write_run_report(
         "bin_hz": scan.bin_hz,
         "antenna_tag": scan.antenna_tag,
         "location_tag": scan.location_tag,
-        "bins": len(scan.bins),
+        "bins": len(spectrum),
         "avg_db_range": {
-            "min": min(b.avg_db for b in scan.bins) if scan.bins else None,
-            "max": max(b.avg_db for b in scan.bins) if scan.bins else None,
+            "min": float(spectrum.avg_db.min()) if has_bins else None,
+            "max": float(spectrum.avg_db.max()) if has_bins else None,
         },
         "max_db_range": {
-            "min": min(b.max_db for b in scan.bins) if scan.bins else None,
-            "max": max(b.max_db for b in scan.bins) if scan.bins else None,
+            "min": float(spectrum.max_db.min()) if has_bins else None,
+            "max": float(spectrum.max_db.max()) if has_bins else None,
         },
     }
 
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.export_csv import ScanMeta, read_scan_csv, write_scan_csv
+
+SCAN_MAGIC = b"ALSCAN\x00\x01"
+SCAN_BINARY_SUFFIX = ".alscan"
+SCAN_FORMATS = ("csv", "alscan")
+
+_DTYPE = "<f4"
+_ALIGN = 16
+_LENGTH = struct.Struct("<I")
+
+
+def is_scan_binary(path: str | Path) -> bool:
+    input_path = Path(path)
+    if input_path.suffix.lower() == SCAN_BINARY_SUFFIX:
+        return True
+    try:
+        with input_path.open("rb") as handle:
+            return handle.read(len(SCAN_MAGIC)) == SCAN_MAGIC
+    except OSError:
+        return False
+
+
+def scan_suffix(scan_format: str) -> str:
+    if scan_format not in SCAN_FORMATS:
+        raise ValueError(f"unsupported scan format: {scan_format}")
+    return SCAN_BINARY_SUFFIX if scan_format == "alscan" else ".csv"
+
+
+def write_scan_binary(scan: ScanResult, path: str | Path) -> Path:
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    spectrum = scan.spectrum
+    header = json.dumps(
+        {
+            "timestamp": scan.timestamp,
+            "start_hz": scan.start_hz,
+            "stop_hz": scan.stop_hz,
+            "bin_hz": scan.bin_hz,
+            "antenna_tag": scan.antenna_tag,
+            "location_tag": scan.location_tag,
+            "spectrum_start_hz": spectrum.start_hz,
+            "n_bins": len(spectrum),
+            "dtype": _DTYPE,
+        }
+    ).encode("utf-8")
+    used = len(SCAN_MAGIC) + _LENGTH.size + len(header)
+    padding = -used % _ALIGN
+
+    with output_path.open("wb") as handle:
+        handle.write(SCAN_MAGIC)
+        handle.write(_LENGTH.pack(len(header) + padding))
+        handle.write(header)
+        handle.write(b" " * padding)
+        np.asarray(spectrum.avg_db, dtype=_DTYPE).tofile(handle)
+        np.asarray(spectrum.max_db, dtype=_DTYPE).tofile(handle)
+
+    return output_path
+
+
+def read_scan_binary(path: str | Path) -> tuple[ScanMeta, Spectrum]:
+    input_path = Path(path)
+    with input_path.open("rb") as handle:
+        if handle.read(len(SCAN_MAGIC)) != SCAN_MAGIC:
+            raise ValueError("unexpected scan binary header")
+        (header_len,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+        header = json.loads(handle.read(header_len).decode("utf-8"))
+
+    meta = ScanMeta(
+        timestamp=header["timestamp"],
+        start_hz=float(header["start_hz"]),
+        stop_hz=float(header["stop_hz"]),
+        bin_hz=float(header["bin_hz"]),
+        antenna_tag=header.get("antenna_tag") or None,
+        location_tag=header.get("location_tag") or None,
+    )
+    n_bins = int(header["n_bins"])
+    offset = len(SCAN_MAGIC) + _LENGTH.size + header_len
+    if n_bins:
+        columns = np.memmap(
+            input_path, dtype=header.get("dtype", _DTYPE), mode="r", offset=offset, shape=(2, n_bins)
+        )
+        avg_db, max_db = columns[0], columns[1]
+    else:
+        avg_db = max_db = np.empty(0, dtype=_DTYPE)
+    spectrum = Spectrum(
+        start_hz=header.get("spectrum_start_hz", meta.start_hz),
+        bin_hz=meta.bin_hz,
+        avg_db=avg_db,
+        max_db=max_db,
+    )
+    return meta, spectrum
+
+
+def read_scan(path: str | Path) -> tuple[ScanMeta, Spectrum]:
+    if is_scan_binary(path):
+        return read_scan_binary(path)
+    return read_scan_csv(path)
+
+
+def write_scan(scan: ScanResult, path: str | Path) -> Path:
+    if Path(path).suffix.lower() == SCAN_BINARY_SUFFIX:
+        return write_scan_binary(scan, path)
+    return write_scan_csv(scan, path)
+
+
+def load_scan(path: str | Path) -> ScanResult:
+    meta, spectrum = read_scan(path)
+    return ScanResult(
+        timestamp=meta.timestamp,
+        start_hz=meta.start_hz,
+        stop_hz=meta.stop_hz,
+        bin_hz=meta.bin_hz,
+        bins=spectrum,
+        antenna_tag=meta.antenna_tag,
+        location_tag=meta.location_tag,
+    )
+
+
+def convert_scan(in_path: str | Path, out_path: str | Path) -> Path:
+    return write_scan(load_scan(in_path), out_path)
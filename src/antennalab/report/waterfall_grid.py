@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import io
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_BYTES = 1 << 22
+
+
+def iso_to_epoch(timestamp: str) -> float:
+    if not timestamp:
+        return float("nan")
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except ValueError:
+        return float("nan")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class WaterfallGridBuilder:
+    def __init__(self, freq_hz: np.ndarray, *, slices_hint: int = 0) -> None:
+        self.freq_hz = np.asarray(freq_hz, dtype=np.float64)
+        capacity = max(int(slices_hint), 1)
+        self.timestamps = np.full(capacity, np.nan)
+        self.avg_db = np.full((capacity, len(self.freq_hz)), np.nan, dtype=np.float32)
+        self.max_db = np.full((capacity, len(self.freq_hz)), np.nan, dtype=np.float32)
+        self.n_slices = 0
+        self.dropped = 0
+
+    def _reserve(self, n_slices: int) -> None:
+        capacity = len(self.timestamps)
+        if n_slices <= capacity:
+            return
+        capacity = max(n_slices, capacity * 2)
+        self.timestamps = _grow(self.timestamps, capacity)
+        self.avg_db = _grow(self.avg_db, capacity)
+        self.max_db = _grow(self.max_db, capacity)
+
+    def add(
+        self,
+        slice_index: np.ndarray,
+        freq_hz: np.ndarray,
+        avg_db: np.ndarray,
+        max_db: np.ndarray,
+    ) -> None:
+        if len(slice_index) == 0:
+            return
+        if len(self.freq_hz) == 0:
+            self.dropped += len(slice_index)
+            return
+        rows = np.asarray(slice_index, dtype=np.int64)
+        cols = np.searchsorted(self.freq_hz, freq_hz)
+        cols_clipped = np.minimum(cols, len(self.freq_hz) - 1)
+        known = (rows >= 0) & (self.freq_hz[cols_clipped] == freq_hz)
+        self.dropped += int(len(known) - np.count_nonzero(known))
+        if not known.all():
+            rows, cols_clipped = rows[known], cols_clipped[known]
+            avg_db, max_db = avg_db[known], max_db[known]
+        if len(rows) == 0:
+            return
+        top = int(rows.max()) + 1
+        self._reserve(top)
+        self.avg_db[rows, cols_clipped] = avg_db
+        self.max_db[rows, cols_clipped] = max_db
+        self.n_slices = max(self.n_slices, top)
+
+    def set_timestamp(self, slice_index: int, epoch: float) -> None:
+        if slice_index < 0:
+            return
+        self._reserve(slice_index + 1)
+        if self.timestamps[slice_index] != self.timestamps[slice_index]:
+            self.timestamps[slice_index] = epoch
+        self.n_slices = max(self.n_slices, slice_index + 1)
+
+    def finish(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        n = self.n_slices
+        return self.timestamps[:n], self.avg_db[:n], self.max_db[:n]
+
+
+def _grow(values: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.full((capacity,) + values.shape[1:], np.nan, dtype=values.dtype)
+    grown[: len(values)] = values
+    return grown
+
+
+def _parse_rows(data: bytes) -> np.ndarray:
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="loadtxt: input contained no data")
+        return np.loadtxt(
+            io.StringIO(data.decode("utf-8")),
+            delimiter=",",
+            usecols=(1, 2, 3, 4),
+            dtype=np.float64,
+            ndmin=2,
+        )
+
+
+def _row_starts(data: bytes) -> np.ndarray:
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    # loadtxt skips blank lines, so they must not count as rows here either.
+    return starts[newlines - starts > 1]
+
+
+def _add_block(builder: WaterfallGridBuilder, data: bytes) -> None:
+    rows = _parse_rows(data)
+    if len(rows) == 0:
+        return
+    slice_index = rows[:, 0].astype(np.int64)
+    builder.add(slice_index, rows[:, 1], rows[:, 2], rows[:, 3])
+    starts = _row_starts(data)
+    first_rows = np.concatenate(([0], np.flatnonzero(np.diff(slice_index)) + 1))
+    for row in first_rows.tolist():
+        start = int(starts[row])
+        stamp = data[start : data.index(b",", start)].decode("utf-8")
+        builder.set_timestamp(int(slice_index[row]), iso_to_epoch(stamp))
+
+
+def stream_waterfall_csv(
+    path: str | Path, *, chunk_bytes: int = CHUNK_BYTES
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    input_path = Path(path)
+    total_bytes = input_path.stat().st_size
+    with input_path.open("rb") as handle:
+        header = handle.readline().decode("utf-8").rstrip("\r\n").split(",")
+        if header[:3] != ["timestamp", "slice_index", "freq_hz"]:
+            raise ValueError("unexpected waterfall CSV header")
+
+        # The first slice defines the frequency axis and the bytes-per-slice estimate.
+        first_lines: list[bytes] = []
+        first_index = None
+        pending = b""
+        for line in handle:
+            if not line.strip():
+                continue
+            index = line.split(b",", 2)[1]
+            if first_index is None:
+                first_index = index
+            if index != first_index:
+                pending = line
+                break
+            first_lines.append(line)
+        first_block = b"".join(first_lines)
+        first = _parse_rows(first_block)
+        freq_hz = np.unique(first[:, 1]) if len(first) else np.empty(0)
+        slices_hint = total_bytes // max(len(first_block), 1) + 1
+        builder = WaterfallGridBuilder(freq_hz, slices_hint=slices_hint)
+        _add_block(builder, first_block)
+
+        while True:
+            chunk = handle.read(chunk_bytes)
+            data = pending + chunk
+            if chunk:
+                cut = data.rfind(b"\n") + 1
+                data, pending = data[:cut], data[cut:]
+            if data:
+                if not data.endswith(b"\n"):
+                    data += b"\n"
+                _add_block(builder, data)
+            if not chunk:
+                break
+
+    timestamps, avg_db, max_db = builder.finish()
+    return freq_hz, timestamps, avg_db, max_db
+
+
+def max_pool(values: np.ndarray, max_rows: int, max_cols: int) -> np.ndarray:
+    rows, cols = values.shape
+    fy = max(1, -(-rows // max_rows)) if max_rows > 0 else 1
+    fx = max(1, -(-cols // max_cols)) if max_cols > 0 else 1
+    if fy == 1 and fx == 1:
+        return np.asarray(values)
+    out_rows = -(-rows // fy)
+    out_cols = -(-cols // fx)
+    padded = np.full((out_rows * fy, out_cols * fx), np.nan, dtype=np.float32)
+    padded[:rows, :cols] = values
+    # fmax ignores NaN, so gaps only survive where a whole block is empty.
+    pooled = np.fmax.reduce(padded.reshape(out_rows, fy, out_cols, fx), axis=3)
+    return np.fmax.reduce(pooled, axis=1)
+
+
+def quantize(values: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float32)
+    finite = np.isfinite(values)
+    span = vmax - vmin if vmax != vmin else 1.0
+    scaled = np.clip((np.where(finite, values, vmin) - vmin) / span, 0.0, 1.0)
+    codes = np.rint(scaled * 254.0).astype(np.uint8) + 1
+    codes[~finite] = 0
+    return codes
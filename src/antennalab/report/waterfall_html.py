@@ -1,25 +1,25 @@
 from __future__ import annotations
 
-import csv
+import base64
+import json
 from pathlib import Path
 
+import numpy as np
 
-PALETTES = {
-    "gray": "gray",
-    "heat": "heat",
-}
+from antennalab.report.palettes import PALETTE_NAMES, available_palettes, palette_luts_b64
+from antennalab.report.waterfall_grid import max_pool, quantize
+from antennalab.report.waterfall_io import read_waterfall
 
 
-def _build_grid(rows: list[tuple[int, float, float]]) -> tuple[list[float], list[list[float]]]:
-    freqs = sorted({freq for _, freq, _ in rows})
-    freq_index = {f: i for i, f in enumerate(freqs)}
-    max_slice = max(slice_idx for slice_idx, _, _ in rows) if rows else -1
-    slices = max_slice + 1
+ENCODINGS = ("uint8", "float32")
 
-    grid = [[float("nan") for _ in freqs] for _ in range(slices)]
-    for slice_idx, freq_hz, avg_db in rows:
-        grid[slice_idx][freq_index[freq_hz]] = avg_db
-    return freqs, grid
+
+def _palette_assets(palette: str) -> tuple[str, str]:
+    names = available_palettes()
+    if palette not in names:
+        names = names + (palette,)
+    options = "\n".join(f'        <option value="{name}">{name}</option>' for name in names)
+    return json.dumps(palette_luts_b64(names)), options
 
 
 def write_waterfall_html(
@@ -29,33 +29,40 @@ def write_waterfall_html(
     palette: str = "heat",
     vmin: float | None = None,
     vmax: float | None = None,
+    start_hz: float | None = None,
+    stop_hz: float | None = None,
+    first_slice: int | None = None,
+    stop_slice: int | None = None,
+    width: int = 1200,
+    height: int = 500,
+    encoding: str = "uint8",
 ) -> Path:
-    if palette not in PALETTES:
+    if palette not in PALETTE_NAMES:
         raise ValueError(f"unsupported palette: {palette}")
+    luts_json, options = _palette_assets(palette)
+    if encoding not in ENCODINGS:
+        raise ValueError(f"unsupported encoding: {encoding}")
 
-    input_path = Path(input_csv)
-    rows: list[tuple[int, float, float]] = []
-
-    with input_path.open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.reader(handle)
-        header = next(reader)
-        if header[:3] != ["timestamp", "slice_index", "freq_hz"]:
-            raise ValueError("unexpected waterfall CSV header")
-        for row in reader:
-            if not row:
-                continue
-            rows.append((int(row[1]), float(row[2]), float(row[3])))
-
-    freqs, grid = _build_grid(rows)
-    flat_values = [val for row in grid for val in row if val == val]
-    if not flat_values:
-        raise ValueError("waterfall CSV has no data")
-
-    data_min = min(flat_values)
-    data_max = max(flat_values)
+    data = read_waterfall(input_csv).window(
+        start_hz=start_hz, stop_hz=stop_hz, first_slice=first_slice, stop_slice=stop_slice
+    )
+    if data.n_slices == 0 or data.n_bins == 0:
+        raise ValueError("waterfall has no data")
+    data_min = float(np.nanmin(data.avg_db)) if np.isfinite(data.avg_db).any() else None
+    if data_min is None:
+        raise ValueError("waterfall has no data")
+    data_max = float(np.nanmax(data.avg_db))
     vmin = data_min if vmin is None else vmin
     vmax = data_max if vmax is None else vmax
 
+    grid = max_pool(data.avg_db, height, width)
+    grid_height, grid_width = grid.shape
+    if encoding == "uint8":
+        payload = quantize(grid, vmin, vmax)
+    else:
+        payload = np.ascontiguousarray(grid, dtype="<f4")
+    payload_b64 = base64.b64encode(payload.tobytes()).decode("ascii")
+
     output_path = Path(output_html)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -77,82 +84,71 @@ def write_waterfall_html(
   <div class=\"controls\">
     <label>Palette
       <select id=\"palette\">
-        <option value=\"heat\">heat</option>
-        <option value=\"gray\">gray</option>
+{options}
       </select>
     </label>
     <span class=\"meta\">Data range: {data_min:.2f} to {data_max:.2f}</span>
     <span class=\"meta\">Scale: vmin {vmin:.2f} / vmax {vmax:.2f}</span>
+    <span class=\"meta\">Grid: {grid_width}x{grid_height} (from {data.n_bins} bins x {data.n_slices} slices, max-pooled)</span>
   </div>
-    <canvas id=\"wf\" width=\"1200\" height=\"500\"></canvas>
+    <canvas id=\"wf\" width=\"{width}\" height=\"{height}\"></canvas>
 
   <script>
-    const data = {grid};
+    const encoding = '{encoding}';
+    const payload = '{payload_b64}';
+    const dataWidth = {grid_width};
+    const dataHeight = {grid_height};
     const vmin = {vmin};
     const vmax = {vmax};
+
+    const paletteLuts = {luts_json};
+    const luts = {{}};
+
+    function decodeBase64(text) {{
+      const raw = atob(text);
+      const bytes = new Uint8Array(raw.length);
+      for (let i = 0; i < raw.length; i++) {{
+        bytes[i] = raw.charCodeAt(i);
+      }}
+      return bytes;
+    }}
+    const bytes = decodeBase64(payload);
+    const data = encoding === 'uint8' ? bytes : new Float32Array(bytes.buffer);
     const paletteSelect = document.getElementById('palette');
     paletteSelect.value = '{palette}';
     const canvas = document.getElementById('wf');
     const ctx = canvas.getContext('2d');
-    const dataWidth = data[0].length;
-    const dataHeight = data.length;
     const offscreen = document.createElement('canvas');
     offscreen.width = dataWidth;
     offscreen.height = dataHeight;
     const offctx = offscreen.getContext('2d');
 
-    function clamp(val, min, max) {{
-      return Math.max(min, Math.min(max, val));
+    function lutFor(name) {{
+      if (!luts[name]) luts[name] = new Uint32Array(decodeBase64(paletteLuts[name]).buffer);
+      return luts[name];
     }}
 
-    function colorFor(value, palette) {{
-      const t = (value - vmin) / (vmax - vmin);
-      const c = clamp(t, 0, 1);
-      if (palette === 'gray') {{
-        const g = Math.floor(c * 255);
-        return [g, g, g];
+    function toCodes(values) {{
+      if (encoding === 'uint8') return values;
+      // Quantize once; palette changes then only re-run the lookup pass.
+      const codes = new Uint8Array(values.length);
+      const span = vmax !== vmin ? vmax - vmin : 1;
+      for (let i = 0; i < values.length; i++) {{
+        const v = values[i];
+        if (Number.isNaN(v)) continue;
+        const t = Math.min(1, Math.max(0, (v - vmin) / span));
+        codes[i] = 1 + Math.round(t * 254);
       }}
-      // heat: blue -> red
-      const hue = (1 - c) * 240; // 240 blue to 0 red
-      const [r, g, b] = hslToRgb(hue / 360, 1.0, 0.5);
-      return [r, g, b];
-    }}
-
-    function hslToRgb(h, s, l) {{
-      let r, g, b;
-      if (s === 0) {{
-        r = g = b = l;
-      }} else {{
-        const hue2rgb = function hue2rgb(p, q, t) {{
-          if (t < 0) t += 1;
-          if (t > 1) t -= 1;
-          if (t < 1/6) return p + (q - p) * 6 * t;
-          if (t < 1/2) return q;
-          if (t < 2/3) return p + (q - p) * (2/3 - t) * 6;
-          return p;
-        }};
-        const q = l < 0.5 ? l * (1 + s) : l + s - l * s;
-        const p = 2 * l - q;
-        r = hue2rgb(p, q, h + 1/3);
-        g = hue2rgb(p, q, h);
-        b = hue2rgb(p, q, h - 1/3);
-      }}
-      return [Math.round(r * 255), Math.round(g * 255), Math.round(b * 255)];
+      return codes;
     }}
+    const codes = toCodes(data);
+    const img = offctx.createImageData(dataWidth, dataHeight);
+    const pixels = new Uint32Array(img.data.buffer);
 
     function render() {{
-      const img = offctx.createImageData(dataWidth, dataHeight);
-      let idx = 0;
-      for (let y = 0; y < dataHeight; y++) {{
-        const row = data[y];
-        for (let x = 0; x < dataWidth; x++) {{
-          const val = row[x];
-          const [r, g, b] = colorFor(val, paletteSelect.value);
-          img.data[idx++] = r;
-          img.data[idx++] = g;
-          img.data[idx++] = b;
-          img.data[idx++] = 255;
-        }}
+      const lut = lutFor(paletteSelect.value);
+      for (let i = 0; i < codes.length; i++) {{
+        pixels[i] = lut[codes[i]];
       }}
       offctx.putImageData(img, 0, 0);
       ctx.imageSmoothingEnabled = false;
@@ -169,3 +165,296 @@ def write_waterfall_html(
 
     output_path.write_text(html, encoding="utf-8")
     return output_path
+
+
+def write_tiled_waterfall_html(
+    tiles_dir: str | Path,
+    *,
+    palette: str = "heat",
+    width: int = 1200,
+    height: int = 500,
+    max_cached_tiles: int = 512,
+) -> Path:
+    if palette not in PALETTE_NAMES:
+        raise ValueError(f"unsupported palette: {palette}")
+    luts_json, options = _palette_assets(palette)
+    tiles_path = Path(tiles_dir)
+    if not (tiles_path / "manifest.js").exists():
+        raise ValueError(f"no tile manifest in {tiles_path}")
+    output_path = tiles_path / "index.html"
+
+    html = f"""<!doctype html>
+<html lang=\"en\">
+<head>
+  <meta charset=\"utf-8\" />
+  <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
+  <title>AntennaLab Waterfall</title>
+  <style>
+    body {{ font-family: Arial, sans-serif; margin: 16px; }}
+    canvas {{ border: 1px solid #ccc; cursor: grab; }}
+    .controls {{ display: flex; gap: 12px; align-items: center; margin-bottom: 12px; flex-wrap: wrap; }}
+    .meta {{ color: #555; font-size: 12px; }}
+  </style>
+</head>
+<body>
+  <h2>AntennaLab Waterfall</h2>
+  <div class=\"controls\">
+    <label>Palette
+      <select id=\"palette\">
+{options}
+      </select>
+    </label>
+    <button id=\"reset\">Reset view</button>
+    <span class=\"meta\" id=\"info\"></span>
+    <span class=\"meta\" id=\"cursor\"></span>
+  </div>
+  <canvas id=\"wf\" width=\"{width}\" height=\"{height}\"></canvas>
+  <p class=\"meta\">Wheel zooms, shift+wheel zooms frequency only, drag pans.</p>
+
+  <script>
+    const maxCachedTiles = {max_cached_tiles};
+    const tiles = new Map();
+    let manifest = null;
+    let view = null;
+    let frame = 0;
+    const paletteSelect = document.getElementById('palette');
+    paletteSelect.value = '{palette}';
+    const canvas = document.getElementById('wf');
+    const ctx = canvas.getContext('2d');
+
+    const paletteLuts = {luts_json};
+    const luts = {{}};
+
+    function lutFor(name) {{
+      if (!luts[name]) luts[name] = new Uint32Array(decodeBase64(paletteLuts[name]).buffer);
+      return luts[name];
+    }}
+
+    function paintTile(entry) {{
+      const size = manifest.tile_size;
+      if (!entry.canvas) {{
+        entry.canvas = document.createElement('canvas');
+        entry.canvas.width = size;
+        entry.canvas.height = size;
+      }}
+      const tctx = entry.canvas.getContext('2d');
+      const img = tctx.createImageData(size, size);
+      const out = new Uint32Array(img.data.buffer);
+      const lut = lutFor(paletteSelect.value);
+      const codes = entry.codes;
+      for (let i = 0; i < codes.length; i++) {{
+        out[i] = lut[codes[i]];
+      }}
+      tctx.putImageData(img, 0, 0);
+      entry.palette = paletteSelect.value;
+    }}
+
+    function decodeBase64(text) {{
+      const raw = atob(text);
+      const bytes = new Uint8Array(raw.length);
+      for (let i = 0; i < raw.length; i++) {{
+        bytes[i] = raw.charCodeAt(i);
+      }}
+      return bytes;
+    }}
+
+    function storeTile(key, codes) {{
+      const entry = tiles.get(key) || {{}};
+      entry.codes = codes;
+      entry.state = 'ready';
+      tiles.set(key, entry);
+      scheduleRender();
+    }}
+
+    function antennalabTile(key, payload) {{
+      storeTile(key, decodeBase64(payload));
+    }}
+
+    function requestTile(lod, row, col) {{
+      const key = lod + '/' + row + '_' + col;
+      const entry = tiles.get(key);
+      if (entry) {{
+        tiles.delete(key);
+        tiles.set(key, entry);
+        return entry;
+      }}
+      const pending = {{ state: 'loading' }};
+      tiles.set(key, pending);
+      const url = 'tiles/' + key + '.' + manifest.tile_format;
+      if (manifest.tile_format === 'bin') {{
+        fetch(url)
+          .then((response) => response.arrayBuffer())
+          .then((buffer) => storeTile(key, new Uint8Array(buffer)))
+          .catch(() => {{ pending.state = 'missing'; }});
+      }} else {{
+        const script = document.createElement('script');
+        script.src = url;
+        script.onerror = () => {{ pending.state = 'missing'; }};
+        script.onload = () => script.remove();
+        document.head.appendChild(script);
+      }}
+      return pending;
+    }}
+
+    function evictTiles(keep) {{
+      for (const key of tiles.keys()) {{
+        if (tiles.size <= maxCachedTiles) break;
+        if (!keep.has(key) && tiles.get(key).state !== 'loading') tiles.delete(key);
+      }}
+    }}
+
+    function levelExtent(lod) {{
+      const scale = Math.pow(2, lod);
+      return [Math.ceil(manifest.n_slices / scale), Math.ceil(manifest.n_bins / scale)];
+    }}
+
+    function pickLevel() {{
+      const density = Math.max(view.binsPerPx, view.slicesPerPx, 1);
+      let lod = Math.min(manifest.levels - 1, Math.floor(Math.log2(density)));
+      // Anisotropic zoom can still expose too many tiles; step up until it fits.
+      while (lod < manifest.levels - 1) {{
+        const span = manifest.tile_size * Math.pow(2, lod);
+        const cols = canvas.width * view.binsPerPx / span + 1;
+        const rows = canvas.height * view.slicesPerPx / span + 1;
+        if (cols * rows <= maxCachedTiles / 4) break;
+        lod += 1;
+      }}
+      return lod;
+    }}
+
+    function drawTile(entry, lod, row, col, srcX, srcY, srcW, srcH) {{
+      const span = manifest.tile_size * Math.pow(2, lod);
+      const cell = Math.pow(2, lod);
+      if (entry.palette !== paletteSelect.value) paintTile(entry);
+      const binX = col * span + srcX * cell;
+      const sliceY = row * span + srcY * cell;
+      const x = (binX - view.x0) / view.binsPerPx;
+      const y = (sliceY - view.y0) / view.slicesPerPx;
+      ctx.drawImage(
+        entry.canvas, srcX, srcY, srcW, srcH,
+        x, y, srcW * cell / view.binsPerPx, srcH * cell / view.slicesPerPx
+      );
+    }}
+
+    function drawFallback(lod, row, col) {{
+      // Show a coarser cached tile while the exact one is loading.
+      const size = manifest.tile_size;
+      for (let up = 1; lod + up < manifest.levels; up++) {{
+        const factor = Math.pow(2, up);
+        const parentRow = Math.floor(row / factor);
+        const parentCol = Math.floor(col / factor);
+        const entry = tiles.get((lod + up) + '/' + parentRow + '_' + parentCol);
+        if (entry && entry.state === 'ready') {{
+          const part = size / factor;
+          drawTile(
+            entry, lod + up, parentRow, parentCol,
+            (col % factor) * part, (row % factor) * part, part, part
+          );
+          return;
+        }}
+      }}
+    }}
+
+    function render() {{
+      frame = 0;
+      if (!manifest) return;
+      ctx.imageSmoothingEnabled = false;
+      ctx.fillStyle = '#000';
+      ctx.fillRect(0, 0, canvas.width, canvas.height);
+      const lod = pickLevel();
+      const span = manifest.tile_size * Math.pow(2, lod);
+      const [levelRows, levelCols] = levelExtent(lod);
+      const tileRows = Math.ceil(levelRows / manifest.tile_size);
+      const tileCols = Math.ceil(levelCols / manifest.tile_size);
+      const col0 = Math.max(0, Math.floor(view.x0 / span));
+      const col1 = Math.min(tileCols - 1, Math.floor((view.x0 + canvas.width * view.binsPerPx) / span));
+      const row0 = Math.max(0, Math.floor(view.y0 / span));
+      const row1 = Math.min(tileRows - 1, Math.floor((view.y0 + canvas.height * view.slicesPerPx) / span));
+      const keep = new Set();
+      for (let row = row0; row <= row1; row++) {{
+        for (let col = col0; col <= col1; col++) {{
+          const entry = requestTile(lod, row, col);
+          keep.add(lod + '/' + row + '_' + col);
+          if (entry.state === 'ready') {{
+            drawTile(entry, lod, row, col, 0, 0, manifest.tile_size, manifest.tile_size);
+          }} else {{
+            drawFallback(lod, row, col);
+          }}
+        }}
+      }}
+      evictTiles(keep);
+      document.getElementById('info').textContent =
+        'Level ' + lod + ' of ' + (manifest.levels - 1) + ' (' + manifest.reducer + ')' +
+        ', ' + manifest.n_bins + ' bins x ' + manifest.n_slices + ' slices' +
+        ', scale ' + manifest.vmin.toFixed(2) + ' to ' + manifest.vmax.toFixed(2) + ' dB' +
+        ', ' + manifest.first_timestamp + ' to ' + manifest.last_timestamp;
+    }}
+
+    function scheduleRender() {{
+      if (!frame) frame = requestAnimationFrame(render);
+    }}
+
+    function resetView() {{
+      view = {{
+        x0: 0,
+        y0: 0,
+        binsPerPx: manifest.n_bins / canvas.width,
+        slicesPerPx: manifest.n_slices / canvas.height,
+      }};
+      scheduleRender();
+    }}
+
+    function antennalabManifest(data) {{
+      manifest = data;
+      resetView();
+    }}
+
+    canvas.addEventListener('wheel', (event) => {{
+      if (!view) return;
+      event.preventDefault();
+      const factor = event.deltaY < 0 ? 0.8 : 1.25;
+      const px = event.offsetX;
+      const py = event.offsetY;
+      const bin = view.x0 + px * view.binsPerPx;
+      const slice = view.y0 + py * view.slicesPerPx;
+      view.binsPerPx = Math.max(view.binsPerPx * factor, 1 / 64);
+      view.x0 = bin - px * view.binsPerPx;
+      if (!event.shiftKey) {{
+        view.slicesPerPx = Math.max(view.slicesPerPx * factor, 1 / 64);
+        view.y0 = slice - py * view.slicesPerPx;
+      }}
+      scheduleRender();
+    }}, {{ passive: false }});
+
+    let drag = null;
+    canvas.addEventListener('mousedown', (event) => {{
+      drag = {{ x: event.clientX, y: event.clientY }};
+    }});
+    window.addEventListener('mouseup', () => {{ drag = null; }});
+    window.addEventListener('mousemove', (event) => {{
+      if (!drag || !view) return;
+      view.x0 -= (event.clientX - drag.x) * view.binsPerPx;
+      view.y0 -= (event.clientY - drag.y) * view.slicesPerPx;
+      drag = {{ x: event.clientX, y: event.clientY }};
+      scheduleRender();
+    }});
+    canvas.addEventListener('mousemove', (event) => {{
+      if (!view) return;
+      const bin = Math.floor(view.x0 + event.offsetX * view.binsPerPx);
+      const slice = Math.floor(view.y0 + event.offsetY * view.slicesPerPx);
+      const freq = manifest.start_hz + bin * manifest.bin_hz;
+      document.getElementById('cursor').textContent =
+        (freq / 1e6).toFixed(4) + ' MHz, slice ' + slice;
+    }});
+    document.getElementById('reset').addEventListener('click', () => {{
+      if (manifest) resetView();
+    }});
+    paletteSelect.addEventListener('change', scheduleRender);
+  </script>
+  <script src=\"manifest.js\"></script>
+</body>
+</html>
+"""
+
+    output_path.write_text(html, encoding="utf-8")
+    return output_path
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.core.models import ScanResult
+from antennalab.report.csv_format import iter_csv_blocks
+from antennalab.report.waterfall_grid import iso_to_epoch, stream_waterfall_csv
+
+WATERFALL_MAGIC = b"ALWF\x00\x00\x00\x01"
+WATERFALL_BINARY_SUFFIX = ".alwf"
+WATERFALL_CSV_HEADER = "timestamp,slice_index,freq_hz,avg_db,max_db\r\n"
+
+_ALIGN = 16
+_LENGTH = struct.Struct("<I")
+
+
+@dataclass(frozen=True, eq=False)
+class WaterfallData:
+    start_hz: float
+    bin_hz: float
+    timestamps: np.ndarray
+    avg_db: np.ndarray
+    max_db: np.ndarray
+
+    @property
+    def n_slices(self) -> int:
+        return int(self.avg_db.shape[0])
+
+    @property
+    def n_bins(self) -> int:
+        return int(self.avg_db.shape[1])
+
+    @property
+    def stop_hz(self) -> float:
+        return self.start_hz + self.n_bins * self.bin_hz
+
+    @property
+    def freq_hz(self) -> np.ndarray:
+        return self.start_hz + np.arange(self.n_bins) * self.bin_hz
+
+    def window(
+        self,
+        *,
+        start_hz: float | None = None,
+        stop_hz: float | None = None,
+        first_slice: int | None = None,
+        stop_slice: int | None = None,
+    ) -> "WaterfallData":
+        lo = 0 if start_hz is None else int(np.ceil((start_hz - self.start_hz) / self.bin_hz))
+        hi = self.n_bins if stop_hz is None else int(np.ceil((stop_hz - self.start_hz) / self.bin_hz))
+        lo = min(max(lo, 0), self.n_bins)
+        hi = min(max(hi, lo), self.n_bins)
+        rows = slice(first_slice, stop_slice)
+        return WaterfallData(
+            start_hz=self.start_hz + lo * self.bin_hz,
+            bin_hz=self.bin_hz,
+            timestamps=self.timestamps[rows],
+            avg_db=self.avg_db[rows, lo:hi],
+            max_db=self.max_db[rows, lo:hi],
+        )
+
+    def iso_timestamp(self, slice_index: int) -> str:
+        value = float(self.timestamps[slice_index])
+        if value != value:
+            return ""
+        return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+def _record_dtype(n_bins: int) -> np.dtype:
+    return np.dtype(
+        [("timestamp", "<f8"), ("avg_db", "<f4", (n_bins,)), ("max_db", "<f4", (n_bins,))]
+    )
+
+
+def is_waterfall_binary(path: str | Path) -> bool:
+    input_path = Path(path)
+    if input_path.suffix.lower() == WATERFALL_BINARY_SUFFIX:
+        return True
+    try:
+        with input_path.open("rb") as handle:
+            return handle.read(len(WATERFALL_MAGIC)) == WATERFALL_MAGIC
+    except OSError:
+        return False
+
+
+def _read_header(handle) -> tuple[dict, int]:
+    if handle.read(len(WATERFALL_MAGIC)) != WATERFALL_MAGIC:
+        raise ValueError("unexpected waterfall binary header")
+    (header_len,) = _LENGTH.unpack(handle.read(_LENGTH.size))
+    header = json.loads(handle.read(header_len).decode("utf-8"))
+    return header, len(WATERFALL_MAGIC) + _LENGTH.size + header_len
+
+
+class DenseWaterfallWriter:
+    def __init__(self, path: str | Path, *, flush_every: int = 1, resume: bool = False) -> None:
+        if flush_every <= 0:
+            raise ValueError("flush_every must be positive")
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.next_index = 0
+        self.written = 0
+        self._pending = 0
+        self._dtype: np.dtype | None = None
+        self._header: dict | None = None
+        self._rows = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists() and self.path.stat().st_size > 0:
+            with self.path.open("rb") as handle:
+                self._header, data_offset = _read_header(handle)
+            self._dtype = _record_dtype(int(self._header["n_bins"]))
+            complete = (self.path.stat().st_size - data_offset) // self._dtype.itemsize
+            with self.path.open("r+b") as handle:
+                handle.truncate(data_offset + complete * self._dtype.itemsize)
+            self.next_index = self._rows = int(complete)
+            self._handle = self.path.open("ab")
+        else:
+            self._handle = self.path.open("wb")
+
+    def _write_header(self, scan: ScanResult) -> None:
+        spectrum = scan.spectrum
+        self._header = {
+            "start_hz": spectrum.start_hz,
+            "stop_hz": scan.stop_hz,
+            "bin_hz": spectrum.bin_hz,
+            "n_bins": len(spectrum),
+            "dtype": "<f4",
+        }
+        self._dtype = _record_dtype(len(spectrum))
+        header = json.dumps(self._header).encode("utf-8")
+        padding = -(len(WATERFALL_MAGIC) + _LENGTH.size + len(header)) % _ALIGN
+        self._handle.write(WATERFALL_MAGIC)
+        self._handle.write(_LENGTH.pack(len(header) + padding))
+        self._handle.write(header + b" " * padding)
+
+    def append(self, scan: ScanResult, *, timestamp: str | None = None) -> int:
+        if self._header is None:
+            self._write_header(scan)
+        spectrum = scan.spectrum
+        if (
+            len(spectrum) != self._header["n_bins"]
+            or spectrum.start_hz != self._header["start_hz"]
+            or spectrum.bin_hz != self._header["bin_hz"]
+        ):
+            raise ValueError("scan does not match the waterfall frequency axis")
+        if self.next_index < self._rows:
+            raise ValueError("slice index already written")
+        # Rows are addressed by slice index, so gaps become NaN rows.
+        if self.next_index > self._rows:
+            gap = np.zeros(self.next_index - self._rows, dtype=self._dtype)
+            for name in self._dtype.names:
+                gap[name] = np.nan
+            self._handle.write(gap.tobytes())
+            self._rows = self.next_index
+        record = np.zeros(1, dtype=self._dtype)
+        record["timestamp"] = iso_to_epoch(timestamp or scan.timestamp)
+        record["avg_db"] = spectrum.avg_db
+        record["max_db"] = spectrum.max_db
+        self._handle.write(record.tobytes())
+        self._rows += 1
+        slice_index = self.next_index
+        self.next_index += 1
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+        return slice_index
+
+    def flush(self) -> None:
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self.flush()
+        self._handle.close()
+        # The header is written with the first slice; without one the file
+        # would be an unreadable empty .alwf.
+        if self._header is None:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "DenseWaterfallWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def read_waterfall_binary(path: str | Path) -> WaterfallData:
+    input_path = Path(path)
+    with input_path.open("rb") as handle:
+        header, data_offset = _read_header(handle)
+    dtype = _record_dtype(int(header["n_bins"]))
+    n_slices = (input_path.stat().st_size - data_offset) // dtype.itemsize
+    if n_slices:
+        records = np.memmap(input_path, dtype=dtype, mode="r", offset=data_offset, shape=(n_slices,))
+        timestamps, avg_db, max_db = records["timestamp"], records["avg_db"], records["max_db"]
+    else:
+        timestamps = np.empty(0)
+        avg_db = max_db = np.empty((0, int(header["n_bins"])), dtype=np.float32)
+    return WaterfallData(
+        start_hz=float(header["start_hz"]),
+        bin_hz=float(header["bin_hz"]),
+        timestamps=timestamps,
+        avg_db=avg_db,
+        max_db=max_db,
+    )
+
+
+def read_waterfall_csv(path: str | Path) -> WaterfallData:
+    freq_hz, timestamps, avg_db, max_db = stream_waterfall_csv(path)
+    return WaterfallData(
+        start_hz=float(freq_hz[0]) if len(freq_hz) else 0.0,
+        bin_hz=float((freq_hz[-1] - freq_hz[0]) / (len(freq_hz) - 1)) if len(freq_hz) > 1 else 1.0,
+        timestamps=timestamps,
+        avg_db=avg_db,
+        max_db=max_db,
+    )
+
+
+def read_waterfall(path: str | Path) -> WaterfallData:
+    if is_waterfall_binary(path):
+        return read_waterfall_binary(path)
+    return read_waterfall_csv(path)
+
+
+def write_waterfall_data(data: WaterfallData, path: str | Path) -> Path:
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    freq_hz = data.freq_hz
+    if output_path.suffix.lower() == WATERFALL_BINARY_SUFFIX:
+        dtype = _record_dtype(data.n_bins)
+        header = json.dumps(
+            {
+                "start_hz": data.start_hz,
+                "stop_hz": data.stop_hz,
+                "bin_hz": data.bin_hz,
+                "n_bins": data.n_bins,
+                "dtype": "<f4",
+            }
+        ).encode("utf-8")
+        padding = -(len(WATERFALL_MAGIC) + _LENGTH.size + len(header)) % _ALIGN
+        records = np.zeros(data.n_slices, dtype=dtype)
+        records["timestamp"] = data.timestamps
+        records["avg_db"] = data.avg_db
+        records["max_db"] = data.max_db
+        with output_path.open("wb") as handle:
+            handle.write(WATERFALL_MAGIC)
+            handle.write(_LENGTH.pack(len(header) + padding))
+            handle.write(header + b" " * padding)
+            records.tofile(handle)
+        return output_path
+
+    with output_path.open("w", newline="", encoding="utf-8") as handle:
+        handle.write(WATERFALL_CSV_HEADER)
+        for slice_index in range(data.n_slices):
+            avg_db = np.asarray(data.avg_db[slice_index], dtype=np.float64)
+            if np.isnan(avg_db).all() and data.timestamps[slice_index] != data.timestamps[slice_index]:
+                continue
+            for block in iter_csv_blocks(
+                (freq_hz, avg_db, np.asarray(data.max_db[slice_index], dtype=np.float64)),
+                (0, 2, 2),
+                prefix=f"{data.iso_timestamp(slice_index)},{slice_index},",
+            ):
+                handle.write(block)
+    return output_path
+
+
+def convert_waterfall(in_path: str | Path, out_path: str | Path) -> Path:
+    return write_waterfall_data(read_waterfall(in_path), out_path)
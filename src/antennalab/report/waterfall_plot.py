@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import csv
 from pathlib import Path
 
+from antennalab.report.waterfall_io import read_waterfall
+
 
 def plot_waterfall_csv(
     input_csv: str | Path,
@@ -11,44 +12,26 @@ def plot_waterfall_csv(
     cmap: str = "viridis",
     vmin: float | None = None,
     vmax: float | None = None,
+    start_hz: float | None = None,
+    stop_hz: float | None = None,
+    first_slice: int | None = None,
+    stop_slice: int | None = None,
 ) -> Path:
     try:
         import matplotlib.pyplot as plt
-        import numpy as np
     except ImportError as exc:  # pragma: no cover - optional dependency
         raise SystemExit(
-            "plot-waterfall requires matplotlib and numpy. Install with: pip install matplotlib numpy"
+            "plot-waterfall requires matplotlib. Install with: pip install matplotlib"
         ) from exc
 
-    input_path = Path(input_csv)
-    rows: list[tuple[int, float, float]] = []
-    freqs: list[float] = []
-    max_slice = -1
-
-    with input_path.open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.reader(handle)
-        header = next(reader)
-        if header[:3] != ["timestamp", "slice_index", "freq_hz"]:
-            raise ValueError("unexpected waterfall CSV header")
-        for row in reader:
-            if not row:
-                continue
-            slice_index = int(row[1])
-            freq_hz = float(row[2])
-            avg_db = float(row[3])
-            rows.append((slice_index, freq_hz, avg_db))
-            if freq_hz not in freqs:
-                freqs.append(freq_hz)
-            if slice_index > max_slice:
-                max_slice = slice_index
-
-    freqs = sorted(freqs)
-    freq_index = {f: i for i, f in enumerate(freqs)}
-    slices = max_slice + 1
-
-    grid = np.full((slices, len(freqs)), np.nan, dtype=float)
-    for slice_index, freq_hz, avg_db in rows:
-        grid[slice_index, freq_index[freq_hz]] = avg_db
+    data = read_waterfall(input_csv).window(
+        start_hz=start_hz, stop_hz=stop_hz, first_slice=first_slice, stop_slice=stop_slice
+    )
+    if data.n_slices == 0 or data.n_bins == 0:
+        raise ValueError("waterfall has no data")
+    freqs = data.freq_hz
+    slices = data.n_slices
+    grid = data.avg_db
 
     output_path = Path(output_png)
     output_path.parent.mkdir(parents=True, exist_ok=True)
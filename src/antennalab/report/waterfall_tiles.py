@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import base64
+import json
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.report.waterfall_grid import quantize
+from antennalab.report.waterfall_io import WaterfallData, read_waterfall
+
+REDUCERS = ("max", "mean")
+TILE_FORMATS = ("js", "bin")
+
+_SCAN_ROWS = 4096
+
+
+def _data_range(data: WaterfallData) -> tuple[float, float]:
+    low = np.inf
+    high = -np.inf
+    for start in range(0, data.n_slices, _SCAN_ROWS):
+        block = np.asarray(data.avg_db[start : start + _SCAN_ROWS], dtype=np.float32)
+        finite = block[np.isfinite(block)]
+        if finite.size:
+            low = min(low, float(finite.min()))
+            high = max(high, float(finite.max()))
+    if low > high:
+        raise ValueError("waterfall has no data")
+    return low, high
+
+
+def _pad_even(values: np.ndarray, fill: float) -> np.ndarray:
+    rows, cols = values.shape
+    if rows % 2 == 0 and cols % 2 == 0:
+        return values
+    padded = np.full((rows + rows % 2, cols + cols % 2), fill, dtype=values.dtype)
+    padded[:rows, :cols] = values
+    return padded
+
+
+class _Level:
+    def __init__(self, lod: int, reducer: str) -> None:
+        self.lod = lod
+        self.reducer = reducer
+        self.values: list[np.ndarray] = []
+        self.counts: list[np.ndarray] = []
+        self.rows = 0
+        self.next_row = 0
+
+    def push(self, values: np.ndarray, counts: np.ndarray) -> None:
+        self.values.append(values)
+        self.counts.append(counts)
+        self.rows += len(values)
+
+    def take(self, rows: int) -> tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self.values)
+        counts = np.concatenate(self.counts)
+        self.values = [values[rows:]] if len(values) > rows else []
+        self.counts = [counts[rows:]] if len(counts) > rows else []
+        self.rows = len(values) - min(rows, len(values))
+        return values[:rows], counts[:rows]
+
+    def reduce(self, values: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        fill = np.nan if self.reducer == "max" else 0.0
+        values = _pad_even(values, fill)
+        counts = _pad_even(counts, 0)
+        rows, cols = values.shape
+        counts = counts.reshape(rows // 2, 2, cols // 2, 2).sum(axis=(1, 3))
+        blocks = values.reshape(rows // 2, 2, cols // 2, 2)
+        if self.reducer == "max":
+            reduced = np.fmax.reduce(np.fmax.reduce(blocks, axis=3), axis=1)
+        else:
+            reduced = blocks.sum(axis=(1, 3))
+        return reduced, counts
+
+
+class TilePyramidBuilder:
+    def __init__(
+        self,
+        out_dir: Path,
+        *,
+        n_slices: int,
+        n_bins: int,
+        tile_size: int,
+        reducer: str,
+        vmin: float,
+        vmax: float,
+        tile_format: str,
+    ) -> None:
+        self.out_dir = out_dir
+        self.tile_size = tile_size
+        self.reducer = reducer
+        self.vmin = vmin
+        self.vmax = vmax
+        self.tile_format = tile_format
+        extent = max(n_slices, n_bins, 1)
+        self.levels = 1
+        while extent > tile_size:
+            extent = -(-extent // 2)
+            self.levels += 1
+        self._levels = [_Level(lod, reducer) for lod in range(self.levels)]
+        self.tiles_written = 0
+
+    def add_rows(self, avg_db: np.ndarray) -> None:
+        values = np.asarray(avg_db, dtype=np.float32)
+        counts = np.isfinite(values).astype(np.int32)
+        if self.reducer == "mean":
+            values = np.where(counts > 0, values, 0.0).astype(np.float32)
+        self._push(0, values, counts)
+
+    def _push(self, lod: int, values: np.ndarray, counts: np.ndarray) -> None:
+        level = self._levels[lod]
+        level.push(values, counts)
+        while level.rows >= self.tile_size:
+            self._emit(level, *level.take(self.tile_size))
+
+    def _emit(self, level: _Level, values: np.ndarray, counts: np.ndarray) -> None:
+        if self.reducer == "mean":
+            display = np.where(counts > 0, values / np.maximum(counts, 1), np.nan)
+        else:
+            display = values
+        tile_row = level.next_row // self.tile_size
+        level.next_row += len(values)
+        for tile_col, start in enumerate(range(0, display.shape[1], self.tile_size)):
+            tile = np.zeros((self.tile_size, self.tile_size), dtype=np.uint8)
+            block = display[:, start : start + self.tile_size]
+            tile[: block.shape[0], : block.shape[1]] = quantize(block, self.vmin, self.vmax)
+            self._write_tile(level.lod, tile_row, tile_col, tile)
+        if level.lod + 1 < self.levels:
+            self._push(level.lod + 1, *level.reduce(values, counts))
+
+    def _write_tile(self, lod: int, tile_row: int, tile_col: int, tile: np.ndarray) -> None:
+        lod_dir = self.out_dir / "tiles" / str(lod)
+        lod_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{tile_row}_{tile_col}"
+        if self.tile_format == "bin":
+            (lod_dir / f"{name}.bin").write_bytes(tile.tobytes())
+        else:
+            payload = base64.b64encode(tile.tobytes()).decode("ascii")
+            (lod_dir / f"{name}.js").write_text(
+                f'antennalabTile("{lod}/{name}","{payload}");\n', encoding="utf-8"
+            )
+        self.tiles_written += 1
+
+    def finish(self) -> None:
+        for level in self._levels:
+            if level.rows:
+                self._emit(level, *level.take(level.rows))
+
+
+def build_tile_pyramid(
+    input_path: str | Path,
+    out_dir: str | Path,
+    *,
+    tile_size: int = 256,
+    reducer: str = "max",
+    vmin: float | None = None,
+    vmax: float | None = None,
+    tile_format: str = "js",
+) -> Path:
+    if reducer not in REDUCERS:
+        raise ValueError(f"unsupported reducer: {reducer}")
+    if tile_format not in TILE_FORMATS:
+        raise ValueError(f"unsupported tile format: {tile_format}")
+    if tile_size < 2 or tile_size % 2:
+        raise ValueError("tile_size must be a positive even number")
+
+    data = read_waterfall(input_path)
+    if data.n_slices == 0 or data.n_bins == 0:
+        raise ValueError("waterfall has no data")
+    data_min, data_max = _data_range(data)
+    vmin = data_min if vmin is None else vmin
+    vmax = data_max if vmax is None else vmax
+
+    output_dir = Path(out_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    builder = TilePyramidBuilder(
+        output_dir,
+        n_slices=data.n_slices,
+        n_bins=data.n_bins,
+        tile_size=tile_size,
+        reducer=reducer,
+        vmin=vmin,
+        vmax=vmax,
+        tile_format=tile_format,
+    )
+    for start in range(0, data.n_slices, tile_size):
+        builder.add_rows(data.avg_db[start : start + tile_size])
+    builder.finish()
+
+    manifest = {
+        "start_hz": data.start_hz,
+        "bin_hz": data.bin_hz,
+        "n_bins": data.n_bins,
+        "n_slices": data.n_slices,
+        "first_timestamp": data.iso_timestamp(0),
+        "last_timestamp": data.iso_timestamp(data.n_slices - 1),
+        "tile_size": tile_size,
+        "levels": builder.levels,
+        "reducer": reducer,
+        "tile_format": tile_format,
+        "vmin": vmin,
+        "vmax": vmax,
+        "data_min": data_min,
+        "data_max": data_max,
+    }
+    manifest_path = output_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    (output_dir / "manifest.js").write_text(
+        f"antennalabManifest({json.dumps(manifest)});\n", encoding="utf-8"
+    )
+    return manifest_path
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+BACKPRESSURE_POLICIES = ("block", "drop")
+
+
+@dataclass(frozen=True)
+class WriterStats:
+    submitted: int
+    written: int
+    dropped: int
+    blocked_sec: float
+    drain_sec: float
+    write_sec: float
+    max_depth: int
+
+
+class WriteBehindWriter:
+    # Output jobs run on one writer thread, in submission order. When the
+    # queue is full "block" makes the caller wait (counted in blocked_sec) and
+    # "drop" skips the job. Waiting for the queue to empty on close is counted
+    # in drain_sec. Writer errors are raised in the caller.
+    def __init__(self, *, queue_depth: int = 4, policy: str = "block") -> None:
+        if queue_depth <= 0:
+            raise ValueError("queue_depth must be positive")
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"unsupported backpressure policy: {policy}")
+        self.queue_depth = queue_depth
+        self.policy = policy
+        self._jobs: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._thread: threading.Thread | None = None
+        self._errors: list[BaseException] = []
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._written = 0
+        self._dropped = 0
+        self._blocked_sec = 0.0
+        self._drain_sec = 0.0
+        self._write_sec = 0.0
+        self._max_depth = 0
+
+    def __enter__(self) -> "WriteBehindWriter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            raise RuntimeError("writer already started")
+        self._thread = threading.Thread(target=self._run, name="antennalab-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Callable[[], object], *, policy: str | None = None) -> bool:
+        # Returns whether the job was queued; policy overrides the default for
+        # jobs that must not be dropped.
+        if self._thread is None:
+            raise RuntimeError("writer is not running")
+        policy = policy or self.policy
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"unsupported backpressure policy: {policy}")
+        self._raise_pending()
+        self._submitted += 1
+        if policy == "drop":
+            try:
+                self._jobs.put_nowait(job)
+            except queue.Full:
+                self._dropped += 1
+                return False
+        else:
+            started = time.perf_counter()
+            self._jobs.put(job)
+            self._blocked_sec += time.perf_counter() - started
+        self._max_depth = max(self._max_depth, self._jobs.qsize())
+        return True
+
+    def close(self) -> WriterStats:
+        if self._thread is not None:
+            started = time.perf_counter()
+            self._jobs.put(None)
+            self._thread.join()
+            self._drain_sec += time.perf_counter() - started
+            self._thread = None
+        self._raise_pending()
+        return self.stats()
+
+    def stats(self) -> WriterStats:
+        with self._lock:
+            return WriterStats(
+                submitted=self._submitted,
+                written=self._written,
+                dropped=self._dropped,
+                blocked_sec=self._blocked_sec,
+                drain_sec=self._drain_sec,
+                write_sec=self._write_sec,
+                max_depth=self._max_depth,
+            )
+
+    def _raise_pending(self) -> None:
+        if self._errors:
+            raise self._errors[0]
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if self._errors:
+                continue
+            started = time.perf_counter()
+            try:
+                job()
+            except BaseException as exc:  # surfaced in the submitting thread
+                self._errors.append(exc)
+                continue
+            with self._lock:
+                self._written += 1
+                self._write_sec += time.perf_counter() - started
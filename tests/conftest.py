@@ -0,0 +1,39 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+
+class FakeRtlSdr:
+    instances: list["FakeRtlSdr"] = []
+
+    def __init__(self) -> None:
+        self.writes: list[str] = []
+        self._rng = np.random.default_rng(7)
+        self.reads = 0
+        self.closed = False
+        FakeRtlSdr.instances.append(self)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name in ("sample_rate", "gain", "center_freq"):
+            self.writes.append(name)
+        super().__setattr__(name, value)
+
+    def read_samples(self, count: int) -> np.ndarray:
+        self.reads += 1
+        noise = self._rng.normal(size=count) + 1j * self._rng.normal(size=count)
+        tone = np.exp(2j * np.pi * 0.1 * np.arange(count))
+        return (0.01 * noise + tone).astype(np.complex128)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_rtlsdr(monkeypatch: pytest.MonkeyPatch) -> type[FakeRtlSdr]:
+    FakeRtlSdr.instances = []
+    module = types.ModuleType("rtlsdr")
+    module.RtlSdr = FakeRtlSdr
+    monkeypatch.setitem(sys.modules, "rtlsdr", module)
+    return FakeRtlSdr
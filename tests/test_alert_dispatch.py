@@ -0,0 +1,129 @@
+import json
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from antennalab.analysis.alert_dispatch import (
+    AlertDispatcher,
+    HttpSink,
+    JsonlSink,
+    UnixSocketSink,
+    sink_from_target,
+)
+from antennalab.analysis.alerts import AlertEvent
+
+
+def _event(index: int) -> AlertEvent:
+    return AlertEvent(
+        timestamp=f"t{index}", edge="rise", freq_hz=100.0 + index, power_db=-20.0, threshold_db=-30.0
+    )
+
+
+def test_dispatcher_posts_batches_and_retries(tmp_path: Path) -> None:
+    received: list[dict] = []
+    attempts: list[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            attempts.append(1)
+            if len(attempts) == 1:
+                self.send_response(503)
+            else:
+                received.extend(json.loads(body)["events"])
+                self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+        dispatcher = AlertDispatcher([HttpSink(url)], batch_size=8, backoff_sec=0.01)
+        with dispatcher:
+            dispatcher.submit(_event(i) for i in range(5))
+        stats = dispatcher.stats()
+    finally:
+        server.shutdown()
+    assert [event["timestamp"] for event in received] == [f"t{i}" for i in range(5)]
+    assert stats.sent == 5
+    assert stats.retries == 1
+    assert stats.failed == 0
+    assert stats.depth == 0
+
+
+def test_dispatcher_unix_and_jsonl_sinks(tmp_path: Path) -> None:
+    lines: list[bytes] = []
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            lines.extend(self.rfile.readlines())
+
+    socket_path = tmp_path / "alerts.sock"
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    server.daemon_threads = False
+    server.block_on_close = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    jsonl_path = tmp_path / "alerts.jsonl"
+    try:
+        sinks = [sink_from_target(f"unix:{socket_path}"), sink_from_target(str(jsonl_path))]
+        assert isinstance(sinks[0], UnixSocketSink) and isinstance(sinks[1], JsonlSink)
+        with AlertDispatcher(sinks) as dispatcher:
+            dispatcher.submit([_event(0), _event(1)])
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert [json.loads(line)["freq_hz"] for line in lines] == [100.0, 101.0]
+    rows = jsonl_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(row)["timestamp"] for row in rows] == ["t0", "t1"]
+    with pytest.raises(ValueError):
+        sink_from_target("ftp://example")
+    with pytest.raises(ValueError, match="https"):
+        sink_from_target("https://example/hook")
+
+
+def test_dispatcher_drops_when_queue_full(tmp_path: Path) -> None:
+    dispatcher = AlertDispatcher([JsonlSink(tmp_path / "a.jsonl")], queue_size=1, batch_size=1)
+    with dispatcher:
+        dispatcher.submit(_event(i) for i in range(10))
+    stats = dispatcher.stats()
+    assert stats.queued == 1
+    assert stats.dropped == 9
+    assert stats.sent == 1
+    assert stats.max_depth == 1
+
+
+def test_dispatcher_counts_items_once_across_sinks(tmp_path: Path) -> None:
+    sinks = [JsonlSink(tmp_path / "a.jsonl"), JsonlSink(tmp_path / "b.jsonl")]
+    with AlertDispatcher(sinks) as dispatcher:
+        dispatcher.submit(_event(i) for i in range(4))
+    stats = dispatcher.stats()
+    assert stats.queued == 4
+    assert stats.sent == 4
+    assert stats.failed == 0
+
+
+def test_dispatcher_close_gives_up_on_silent_webhook() -> None:
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    try:
+        url = f"http://127.0.0.1:{listener.getsockname()[1]}/hook"
+        dispatcher = AlertDispatcher([HttpSink(url, timeout_sec=5.0)], batch_size=1)
+        dispatcher.start()
+        dispatcher.submit([_event(0), _event(1), _event(2)])
+        stats = dispatcher.close(timeout_sec=0.3)
+    finally:
+        listener.close()
+    assert stats.sent == 0
+    assert stats.failed == 1
+    assert stats.dropped == 2
+    assert stats.depth == 0
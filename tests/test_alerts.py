@@ -1,7 +1,17 @@
 from pathlib import Path
 
-from antennalab.analysis.alerts import AlertEngine, AlertRule, load_alert_rules
-from antennalab.core.models import ScanBin, ScanResult
+import numpy as np
+import pytest
+
+from antennalab.analysis.alerts import (
+    AlertEngine,
+    AlertEvent,
+    AlertRule,
+    AlertTracker,
+    append_alert_events,
+    load_alert_rules,
+)
+from antennalab.core.models import ScanBin, ScanResult, Spectrum
 from antennalab.report.export_csv import write_scan_csv
 
 
@@ -32,3 +42,74 @@ def test_load_alert_rules(tmp_path: Path) -> None:
     assert len(rules) == 1
     assert rules[0].freq_hz == 100.0
     assert rules[0].threshold_db == -30.0
+
+
+def test_alert_engine_off_edge_and_range_rules() -> None:
+    scan = ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=100.0,
+        stop_hz=150.0,
+        bin_hz=10.0,
+        bins=tuple(
+            ScanBin(freq_hz=100.0 + 10.0 * i, avg_db=avg, max_db=peak)
+            for i, (avg, peak) in enumerate(
+                [(-60.0, -50.0), (-45.0, -20.0), (-60.0, -55.0), (-35.0, -30.0), (-60.0, -58.0)]
+            )
+        ),
+    )
+    engine = AlertEngine(
+        [
+            AlertRule(freq_hz=134.0, threshold_db=-40.0, stop_hz=150.0, field="avg"),
+            AlertRule(freq_hz=113.5, threshold_db=-25.0),
+            AlertRule(freq_hz=100.0, threshold_db=-40.0, stop_hz=130.0, field="avg"),
+            AlertRule(freq_hz=500.0, threshold_db=-100.0),
+        ]
+    )
+    hits = engine.evaluate_scan(scan)
+    assert [(hit.freq_hz, hit.power_db) for hit in hits] == [(110.0, -20.0), (130.0, -35.0)]
+    assert all(hit.timestamp == scan.timestamp for hit in hits)
+    power = engine.measure(scan.spectrum)
+    assert power[:3].tolist() == [-45.0, -20.0, -35.0]
+    assert np.isnan(power[3])
+
+
+def test_load_alert_rules_ranges_and_fields(tmp_path: Path) -> None:
+    rules_path = tmp_path / "alerts.csv"
+    rules_path.write_text("# band plan\n100:200,-30,avg\n300,-40,max\n", encoding="utf-8")
+    rules = load_alert_rules(rules_path)
+    assert rules[0] == AlertRule(freq_hz=100.0, threshold_db=-30.0, stop_hz=200.0, field="avg")
+    assert rules[1] == AlertRule(freq_hz=300.0, threshold_db=-40.0)
+    rules_path.write_text("100,-30,peak\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_alert_rules(rules_path)
+
+
+def _point_spectrum(power_db: float) -> Spectrum:
+    return Spectrum(
+        start_hz=100.0, bin_hz=10.0, avg_db=np.array([power_db]), max_db=np.array([power_db])
+    )
+
+
+def test_alert_tracker_hysteresis_hold_and_cooldown() -> None:
+    engine = AlertEngine([AlertRule(freq_hz=100.0, threshold_db=-30.0)])
+    tracker = AlertTracker(engine, hysteresis_db=5.0, hold_sec=2.0, cooldown_sec=10.0)
+    edges = []
+    for now, power in enumerate([-40, -25, -20, -20, -32, -36, -36, -36] + [-20] * 6):
+        events = tracker.update(_point_spectrum(power), timestamp=str(now), now=float(now))
+        edges.extend((event.timestamp, event.edge) for event in events)
+    # Rises after a 2 s hold, ignores the dip inside the hysteresis band, clears
+    # after 2 s below -35 dB, then waits out the cooldown before rising again.
+    assert edges == [("3", "rise"), ("7", "fall"), ("13", "rise")]
+
+
+def test_append_alert_events_writes_header_once(tmp_path: Path) -> None:
+    event = AlertEvent(
+        timestamp="t", edge="rise", freq_hz=100.0, power_db=-20.0, threshold_db=-30.0
+    )
+    path = tmp_path / "alerts.csv"
+    append_alert_events([event], path)
+    append_alert_events([], path)
+    append_alert_events([event], path)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "timestamp,edge,freq_hz,power_db,threshold_db"
+    assert lines[1:] == ["t,rise,100,-20.00,-30.00"] * 2
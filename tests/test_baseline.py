@@ -1,8 +1,18 @@
+import json
+import os
 from pathlib import Path
 
-from antennalab.analysis.calibration import apply_baseline, load_baseline
-from antennalab.core.models import ScanBin, ScanResult
+import numpy as np
+
+from antennalab.analysis.calibration import BaselineStore, apply_baseline, load_baseline
+from antennalab.analysis.calibration_profiles import BaselineProfile, upsert_profile
+from antennalab.analysis.monitor import MonitorSettings, run_monitor
+from antennalab.analysis.spectrum import ScanSimulator
+from antennalab.analysis.waterfall import WaterfallSettings, run_waterfall
+from antennalab.core.models import ScanBin, ScanResult, Spectrum
 from antennalab.report.export_csv import write_scan_csv
+from antennalab.report.scan_io import read_scan
+from antennalab.report.waterfall_io import read_waterfall
 
 
 def test_apply_baseline(tmp_path: Path) -> None:
@@ -37,3 +47,72 @@ def test_apply_baseline(tmp_path: Path) -> None:
     assert adjusted.bins[0].max_db == 20.0
     assert adjusted.bins[1].avg_db == 10.0
     assert adjusted.bins[1].max_db == 21.0
+
+
+def _flat_scan(level_db: float) -> ScanResult:
+    return ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=100.0,
+        stop_hz=120.0,
+        bin_hz=5.0,
+        bins=Spectrum(
+            start_hz=100.0, bin_hz=5.0, avg_db=np.full(4, level_db), max_db=np.full(4, level_db)
+        ),
+    )
+
+
+def test_baseline_store_caches_until_file_changes(tmp_path: Path) -> None:
+    path = write_scan_csv(_flat_scan(-60.0), tmp_path / "baseline.csv")
+    store = BaselineStore()
+    first = store.get(path)
+    assert store.get(path) is first
+    assert store.loads == 1
+
+    write_scan_csv(_flat_scan(-65.0), path)
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+    adjusted = store.apply(_flat_scan(-50.0), path)
+    assert store.loads == 2
+    assert adjusted.spectrum.avg_db.tolist() == [15.0] * 4
+
+
+def test_baseline_store_resolves_tags(tmp_path: Path) -> None:
+    profiles = tmp_path / "profiles.json"
+    upsert_profile(profiles, BaselineProfile(tag="night", csv_path="night.csv", created_at="t"))
+    store = BaselineStore(profiles)
+    assert store.resolve_tag("night") == "night.csv"
+    assert store.resolve_tag("day") is None
+    assert BaselineStore(tmp_path / "missing.json").resolve_tag("night") is None
+
+
+def test_monitor_and_waterfall_apply_baseline(tmp_path: Path) -> None:
+    path = write_scan_csv(_flat_scan(-100.0), tmp_path / "baseline.csv")
+    common = dict(
+        mode="sim",
+        start_hz=100.0,
+        stop_hz=120.0,
+        bin_hz=5.0,
+        sample_rate_hz=2_400_000,
+        gain_db="auto",
+        fft_size=1024,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        seed=1,
+        baseline_csv=path,
+    )
+    summary_path = run_monitor(
+        MonitorSettings(interval_sec=1, iterations=1, bookmarks_file=None, **common),
+        out_dir=tmp_path / "monitor",
+    )
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert summary["baseline_csv"] == str(path)
+    _, spectrum = read_scan(summary["records"][0]["scan_csv"])
+    expected = ScanSimulator(seed=1).simulate_scan(start_hz=100.0, stop_hz=120.0, bin_hz=5.0)
+    assert np.allclose(spectrum.avg_db, expected.spectrum.avg_db + 100.0, atol=0.01)
+
+    out_csv = run_waterfall(
+        WaterfallSettings(slices=1, interval_ms=0, **common), tmp_path / "wf.alwf"
+    )
+    data = read_waterfall(out_csv)
+    assert np.allclose(data.avg_db[0], expected.spectrum.avg_db + 100.0, atol=1e-3)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from antennalab.analysis.scan import BinAccumulator, SweepPlan, run_capture_pipeline
+from antennalab.instruments.rtlsdr import RTLSDRPlugin
+
+
+class _Session:
+    def __init__(self, fail_after: int | None = None) -> None:
+        self._rng = np.random.default_rng(3)
+        self.reads = 0
+        self.fail_after = fail_after
+
+    def tune(self, center_hz: float) -> None:
+        pass
+
+    def read_samples(self, count: int) -> np.ndarray:
+        self.reads += 1
+        if self.fail_after is not None and self.reads > self.fail_after:
+            raise OSError("usb transfer failed")
+        return self._rng.normal(size=count) + 1j * self._rng.normal(size=count)
+
+
+def _plan() -> SweepPlan:
+    return SweepPlan.build(
+        start_hz=100e6,
+        stop_hz=110e6,
+        bin_hz=50e3,
+        sample_rate_hz=2.4e6,
+        fft_size=512,
+        step_hz=None,
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_pipeline_matches_across_worker_counts(workers: int) -> None:
+    plan = _plan()
+    serial = BinAccumulator(plan.n_bins, 2)
+    run_capture_pipeline(_Session(), plan, serial, sweeps=2, dwell_ms=0, queue_depth=1, workers=1)
+
+    parallel = BinAccumulator(plan.n_bins, 2)
+    timings = run_capture_pipeline(
+        _Session(), plan, parallel, sweeps=2, dwell_ms=0, queue_depth=4, workers=workers
+    )
+
+    assert timings.blocks == 2 * len(plan.centers)
+    assert timings.wall_sec >= 0
+    for a, b in zip(serial.finish(-120.0), parallel.finish(-120.0)):
+        assert np.allclose(a, b)
+
+
+def test_pipeline_surfaces_read_errors() -> None:
+    plan = _plan()
+    acc = BinAccumulator(plan.n_bins, 1)
+    with pytest.raises(OSError):
+        run_capture_pipeline(
+            _Session(fail_after=2), plan, acc, sweeps=1, dwell_ms=0, queue_depth=2, workers=2
+        )
+
+
+def test_plugin_records_timings(fake_rtlsdr) -> None:
+    plugin = RTLSDRPlugin()
+    plugin.scan_real(
+        start_hz=100e6,
+        stop_hz=104e6,
+        bin_hz=25e3,
+        sample_rate_hz=2.4e6,
+        gain_db="auto",
+        fft_size=256,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        antenna_tag=None,
+        location_tag=None,
+        workers=2,
+    )
+    assert plugin.last_timings is not None
+    assert plugin.last_timings.blocks == fake_rtlsdr.instances[0].reads
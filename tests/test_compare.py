@@ -1,7 +1,11 @@
+import json
 from pathlib import Path
 
-from antennalab.analysis.compare import compare_scans
-from antennalab.core.models import ScanBin, ScanResult
+import numpy as np
+import pytest
+
+from antennalab.analysis.compare import compare_scans, compare_to_csv
+from antennalab.core.models import ScanBin, ScanResult, Spectrum
 from antennalab.report.export_csv import write_scan_csv
 
 
@@ -35,3 +39,75 @@ def test_compare_scans_score(tmp_path: Path) -> None:
     result = compare_scans(path_a, path_b)
     assert len(result.bins) == 2
     assert round(result.score, 3) == 2.5
+
+
+def _spectrum_scan(avg_db: np.ndarray, max_db: np.ndarray) -> ScanResult:
+    return ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=1e6,
+        stop_hz=1e6 + len(avg_db) * 1e3,
+        bin_hz=1e3,
+        bins=Spectrum(start_hz=1e6, bin_hz=1e3, avg_db=avg_db, max_db=max_db),
+    )
+
+
+def test_compare_scores_and_bands(tmp_path: Path) -> None:
+    rng = np.random.default_rng(1)
+    avg_a = rng.normal(-70.0, 2.0, size=1000)
+    delta = rng.normal(1.0, 0.5, size=1000)
+    delta[:100] += 10.0
+    path_a = write_scan_csv(_spectrum_scan(avg_a, avg_a + 3.0), tmp_path / "a.csv")
+    path_b = write_scan_csv(_spectrum_scan(avg_a + delta, avg_a + 3.0), tmp_path / "b.csv")
+
+    result = compare_scans(path_a, path_b, bands=10)
+    expected = np.round(avg_a + delta, 2) - np.round(avg_a, 2)
+    scores = result.scores
+    assert np.allclose(result.delta_avg_db, expected)
+    assert scores.mean_db == pytest.approx(expected.mean())
+    assert scores.rms_db == pytest.approx(np.sqrt(np.mean(expected**2)))
+    assert scores.p95_db == pytest.approx(np.percentile(expected, 95))
+    assert len(scores.bands) == 10
+    assert scores.bands[0].n_bins == 100
+    assert scores.bands[0].start_hz == 1e6 and scores.bands[0].stop_hz == 1e6 + 100 * 1e3
+    assert scores.bands[0].mean_db == pytest.approx(expected[:100].mean())
+    assert scores.bands[0].mean_db > scores.bands[1].mean_db + 5.0
+
+
+def test_compare_csv_format_and_scores_json(tmp_path: Path) -> None:
+    avg_a = np.array([-50.0, -55.0, -60.0])
+    path_a = write_scan_csv(_spectrum_scan(avg_a, avg_a + 1.0), tmp_path / "a.csv")
+    path_b = write_scan_csv(_spectrum_scan(avg_a + 2.5, avg_a), tmp_path / "b.csv")
+    out_csv = compare_to_csv(
+        path_a, path_b, tmp_path / "cmp.csv", bands=2, scores_json=tmp_path / "scores.json"
+    )
+    lines = out_csv.read_text(encoding="utf-8").splitlines()
+    assert lines[1].endswith(",2.500")
+    assert lines[2] == "freq_hz,delta_avg_db,delta_max_db"
+    assert lines[3:] == ["1000000,2.50,-1.00", "1001000,2.50,-1.00", "1002000,2.50,-1.00"]
+    scores = json.loads((tmp_path / "scores.json").read_text(encoding="utf-8"))
+    assert scores["rms_db"] == pytest.approx(2.5)
+    assert [band["n_bins"] for band in scores["bands"]] == [1, 2]
+
+
+def test_compare_partially_overlapping_scans(tmp_path: Path) -> None:
+    def write(start_hz: float, avg_db: list[float], name: str) -> Path:
+        avg = np.array(avg_db)
+        scan = ScanResult(
+            timestamp="2024-01-01T00:00:00+00:00",
+            start_hz=start_hz,
+            stop_hz=start_hz + 10.0 * len(avg),
+            bin_hz=10.0,
+            bins=Spectrum(start_hz=start_hz, bin_hz=10.0, avg_db=avg, max_db=avg + 5.0),
+        )
+        return write_scan_csv(scan, tmp_path / name)
+
+    path_a = write(100.0, [-50.0, -50.0, -50.0, -50.0, -50.0], "a.csv")
+    path_b = write(120.0, [-45.0, -44.0, -43.0, -42.0, -41.0], "b.csv")
+    result = compare_scans(path_a, path_b)
+    assert result.freq_hz.tolist() == [120.0, 130.0, 140.0]
+    assert result.delta_avg_db.tolist() == [5.0, 6.0, 7.0]
+
+    out_csv = compare_to_csv(path_a, path_b, tmp_path / "delta.csv")
+    rows = out_csv.read_text(encoding="utf-8").splitlines()[3:]
+    assert rows == ["120,5.00,5.00", "130,6.00,6.00", "140,7.00,7.00"]
+    assert "nan" not in out_csv.read_text(encoding="utf-8")
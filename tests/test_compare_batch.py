@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antennalab.analysis import compare_batch as batch
+from antennalab.analysis.compare import compare_scans
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.scan_io import write_scan
+
+
+def _write_scans(tmp_path: Path, count: int, suffix: str = ".alscan") -> list[Path]:
+    rng = np.random.default_rng(3)
+    base = rng.normal(-70.0, 4.0, size=500)
+    paths = []
+    for idx in range(count):
+        avg_db = base + idx + rng.normal(0.0, 0.5 * (idx + 1), size=500)
+        scan = ScanResult(
+            timestamp="2024-01-01T00:00:00+00:00",
+            start_hz=1e6,
+            stop_hz=1e6 + 500 * 1e3,
+            bin_hz=1e3,
+            bins=Spectrum(start_hz=1e6, bin_hz=1e3, avg_db=avg_db, max_db=avg_db + 2.0),
+            antenna_tag=f"ant{idx}",
+            location_tag="roof" if idx % 2 else None,
+        )
+        paths.append(write_scan(scan, tmp_path / f"scan{idx}{suffix}"))
+    return paths
+
+
+def test_batch_matrix_matches_pairwise_compare(tmp_path: Path) -> None:
+    paths = _write_scans(tmp_path, 4)
+    result = batch.compare_batch(paths)
+    assert result.labels == ("ant0", "ant1@roof", "ant2", "ant3@roof")
+    assert len(result.pairs) == 6
+    for pair in result.pairs:
+        single = compare_scans(paths[pair.index_a], paths[pair.index_b], bands=0)
+        assert pair.mean_db == pytest.approx(single.scores.mean_db, abs=1e-9)
+        assert pair.rms_db == pytest.approx(single.scores.rms_db, rel=1e-9)
+        assert pair.p95_abs_db == pytest.approx(
+            np.percentile(np.abs(single.delta_avg_db), 95.0), rel=1e-9
+        )
+    assert np.allclose(result.mean_db, -result.mean_db.T)
+    assert np.allclose(np.diag(result.rms_db), 0.0)
+    ranked = result.ranked("rms")
+    assert [pair.rms_db for pair in ranked] == sorted(pair.rms_db for pair in result.pairs)
+
+
+def test_reference_mode_and_csv_outputs(tmp_path: Path) -> None:
+    paths = _write_scans(tmp_path, 3, suffix=".csv")
+    result = batch.compare_batch(paths[1:], reference=paths[0])
+    assert result.paths[0] == paths[0]
+    assert [(pair.index_a, pair.index_b) for pair in result.pairs] == [(0, 1), (0, 2)]
+    assert np.isnan(result.p95_abs_db[1, 2])
+
+    matrix_csv = batch.write_score_matrix_csv(result, tmp_path / "matrix.csv", metric="p95")
+    rows = matrix_csv.read_text(encoding="utf-8").splitlines()
+    assert rows[0].split(",")[1:] == list(result.labels)
+    assert rows[2].split(",")[3] == ""
+    ranked_csv = batch.write_ranked_csv(result, tmp_path / "ranked.csv", metric="mean")
+    ranked = ranked_csv.read_text(encoding="utf-8").splitlines()
+    assert ranked[1].startswith("1,ant0,ant2,")
+
+
+def test_process_pool_matches_serial(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = _write_scans(tmp_path, 4)
+    serial = batch.compare_batch(paths)
+    monkeypatch.setattr(batch, "POOL_MIN_PAIRS", 1)
+    pooled = batch.compare_batch(paths, workers=2)
+    assert [p.p95_abs_db for p in pooled.pairs] == [p.p95_abs_db for p in serial.pairs]
+
+
+def test_batch_rejects_mismatched_grids(tmp_path: Path) -> None:
+    paths = _write_scans(tmp_path, 2)
+    other = ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=2e6,
+        stop_hz=2e6 + 500 * 1e3,
+        bin_hz=1e3,
+        bins=Spectrum(start_hz=2e6, bin_hz=1e3, avg_db=np.zeros(500), max_db=np.zeros(500)),
+    )
+    paths.append(write_scan(other, tmp_path / "other.alscan"))
+    with pytest.raises(ValueError):
+        batch.compare_batch(paths)
+
+
+def test_labels_stay_unique_for_files_sharing_a_stem(tmp_path: Path) -> None:
+    (tmp_path / "x").mkdir()
+    (tmp_path / "y").mkdir()
+    scan = ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=1e6,
+        stop_hz=1e6 + 10 * 1e3,
+        bin_hz=1e3,
+        bins=Spectrum(
+            start_hz=1e6, bin_hz=1e3, avg_db=np.full(10, -70.0), max_db=np.full(10, -68.0)
+        ),
+    )
+    paths = [
+        write_scan(scan, tmp_path / "x" / "b.csv"),
+        write_scan(scan, tmp_path / "x" / "b.alscan"),
+        write_scan(scan, tmp_path / "y" / "b.csv"),
+    ]
+    result = batch.compare_batch(paths)
+    assert result.labels == ("b (x/b.csv)", "b (x/b.alscan)", "b (y/b.csv)")
+    assert batch.compare_batch(paths[:2]).labels == ("b (b.csv)", "b (b.alscan)")
+    assert batch.compare_batch([paths[0], paths[0]]).labels == ("b (1)", "b (2)")
+
+
+def test_reference_matches_an_equivalent_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    paths = _write_scans(tmp_path, 3)
+    monkeypatch.chdir(tmp_path)
+    names = [Path(path.name) for path in paths]
+    result = batch.compare_batch(names, reference=f"./{paths[1].name}")
+    assert len(result.paths) == 3
+    assert [(pair.index_a, pair.index_b) for pair in result.pairs] == [(1, 0), (1, 2)]
@@ -0,0 +1,50 @@
+import math
+
+import numpy as np
+import pytest
+
+from antennalab.analysis.scan import BinAccumulator
+from antennalab.instruments.rtlsdr import RTLSDRPlugin
+
+
+def test_linear_accumulator_converts_once() -> None:
+    acc = BinAccumulator(3, 2, averaging="linear")
+    acc.add(0, np.array([0, 0]), np.array([1.0, 100.0]))
+    acc.add(1, np.array([0, 2]), np.array([10.0, 1000.0]))
+    avg, peak, low, mean, high = acc.finish(-120.0)
+
+    assert avg[0] == pytest.approx(10 * math.log10(37.0))
+    assert peak[0] == pytest.approx(20.0)
+    assert low[0] == pytest.approx(10.0)
+    assert high[0] == pytest.approx(10 * math.log10(50.5))
+    assert mean[0] == pytest.approx(10 * math.log10((50.5 + 10.0) / 2))
+    assert avg[1] == peak[1] == low[1] == mean[1] == high[1] == -120.0
+    assert avg[2] == pytest.approx(30.0)
+    assert low[2] == -120.0
+
+
+def test_unknown_averaging_mode() -> None:
+    with pytest.raises(ValueError):
+        BinAccumulator(3, 1, averaging="rms")
+
+
+def test_linear_scan_peak_matches_db_scan(fake_rtlsdr) -> None:
+    kwargs = dict(
+        start_hz=100e6,
+        stop_hz=102e6,
+        bin_hz=50e3,
+        sample_rate_hz=2.4e6,
+        gain_db="auto",
+        fft_size=256,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        antenna_tag=None,
+        location_tag=None,
+    )
+    plugin = RTLSDRPlugin()
+    legacy = plugin.scan_real(**kwargs)
+    linear = plugin.scan_real(averaging="linear", **kwargs)
+    assert [b.max_db for b in linear.bins] == pytest.approx([b.max_db for b in legacy.bins], abs=1e-6)
+    assert all(lin.avg_db >= db.avg_db - 1e-9 for lin, db in zip(linear.bins, legacy.bins))
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 from antennalab.analysis.monitor import MonitorSettings, run_monitor
@@ -28,3 +29,65 @@ def test_monitor_sim(tmp_path: Path) -> None:
     reports = list((out_dir / "reports").glob("report_*.json"))
     assert len(scans) == 2
     assert len(reports) == 2
+
+
+def test_monitor_live_alerts(tmp_path: Path) -> None:
+    rules_path = tmp_path / "rules.csv"
+    rules_path.write_text("100:110,-200\n", encoding="utf-8")
+    settings = MonitorSettings(
+        mode="sim",
+        start_hz=100.0,
+        stop_hz=110.0,
+        bin_hz=5.0,
+        sample_rate_hz=2_400_000,
+        gain_db="auto",
+        fft_size=1024,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        interval_sec=1,
+        iterations=2,
+        seed=1,
+        bookmarks_file=None,
+        alert_rules=rules_path,
+        alert_sinks=(str(tmp_path / "hooks.jsonl"),),
+    )
+    summary = json.loads(run_monitor(settings, out_dir=tmp_path / "monitor").read_text())
+    # The rule rises on the first scan and stays active, so only one edge is logged.
+    assert [record["alert_events"] for record in summary["records"]] == [1, 0]
+    lines = Path(summary["alerts_csv"]).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[1].split(",")[1] == "rise"
+    assert summary["alert_dispatch"]["sent"] == 1
+    assert summary["alert_dispatch"]["dropped"] == 0
+    assert len((tmp_path / "hooks.jsonl").read_text(encoding="utf-8").splitlines()) == 1
+
+
+def test_monitor_sub_second_schedule(tmp_path: Path) -> None:
+    out_dir = tmp_path / "monitor"
+    settings = MonitorSettings(
+        mode="sim",
+        start_hz=100.0,
+        stop_hz=110.0,
+        bin_hz=5.0,
+        sample_rate_hz=2_400_000,
+        gain_db="auto",
+        fft_size=1024,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        interval_sec=0.2,
+        iterations=100,
+        seed=1,
+        bookmarks_file=None,
+        duration_sec=0.6,
+    )
+    summary = json.loads(run_monitor(settings, out_dir=out_dir).read_text())
+    schedule = summary["schedule"]
+    assert schedule["ticks"] + schedule["missed_slots"] == 3
+    assert len(list((out_dir / "scans").glob("scan_*.csv"))) == schedule["ticks"]
+    assert [record["slot"] for record in summary["records"]][0] == 0
+    assert summary["writer"]["written"] == schedule["ticks"]
+    assert summary["writer"]["blocked_sec"] >= 0.0
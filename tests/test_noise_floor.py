@@ -1,8 +1,17 @@
 from pathlib import Path
 
-from antennalab.analysis.noise_floor import estimate_noise_floor
-from antennalab.core.models import ScanBin, ScanResult
+import numpy as np
+import pytest
+
+from antennalab.analysis.noise_floor import (
+    NoiseFloorEstimator,
+    estimate_noise_floor,
+    running_min,
+    sliding_percentile,
+)
+from antennalab.core.models import ScanBin, ScanResult, Spectrum
 from antennalab.report.export_csv import read_scan_csv, write_scan_csv
+from antennalab.report.waterfall_io import WaterfallData, write_waterfall_data
 
 
 def test_noise_floor_avg(tmp_path: Path) -> None:
@@ -30,3 +39,77 @@ def test_noise_floor_avg(tmp_path: Path) -> None:
     assert "noise_floor_db" in content
     assert "-50.00" in content
     assert "-55.00" in content
+
+
+def test_percentile_and_median_ignore_narrow_carriers() -> None:
+    rng = np.random.default_rng(0)
+    avg_db = rng.normal(-90.0, 1.0, size=2000)
+    avg_db[500:503] = -20.0
+    spectrum = Spectrum(start_hz=0.0, bin_hz=1.0, avg_db=avg_db, max_db=avg_db)
+    for strategy in ("percentile", "median"):
+        result = NoiseFloorEstimator(strategy, window_bins=31).estimate(spectrum)
+        assert len(result.noise_floor_db) == 2000
+        assert result.noise_floor_db[501] < -85.0
+
+    median = NoiseFloorEstimator("median", window_bins=5).estimate(spectrum).noise_floor_db
+    padded = np.pad(avg_db, 2, mode="edge")
+    expected = np.median(np.lib.stride_tricks.sliding_window_view(padded, 5), axis=1)
+    assert np.allclose(median, expected)
+
+
+def test_running_min_matches_brute_force() -> None:
+    values = np.random.default_rng(1).normal(size=(40, 3))
+    values[7, 1] = np.nan
+    result = running_min(values, 6)
+    expected = np.array([np.nanmin(values[i : i + 6], axis=0) for i in range(35)])
+    assert np.allclose(result, expected)
+
+
+def test_minstats_on_waterfall(tmp_path: Path) -> None:
+    rng = np.random.default_rng(2)
+    avg_db = rng.normal(-90.0, 1.0, size=(200, 50)).astype(np.float32)
+    avg_db[50:120, 10] = -30.0
+    avg_db[:, 20] = np.nan
+    data = WaterfallData(
+        start_hz=1e6, bin_hz=1e3, timestamps=np.arange(200.0), avg_db=avg_db, max_db=avg_db
+    )
+    path = write_waterfall_data(data, tmp_path / "wf.alwf")
+    out_path = estimate_noise_floor(
+        path, tmp_path / "noise.csv", strategy="minstats", smooth_slices=4, window_slices=16
+    )
+    lines = out_path.read_text(encoding="utf-8").splitlines()
+    assert lines[1].endswith(",minstats")
+    floor = np.array([float(line.split(",")[1]) for line in lines[3:]])
+    assert len(floor) == 50
+    assert np.all(floor[np.arange(50) != 20] < -88.0)
+    assert np.isnan(floor[20])
+    with pytest.raises(ValueError):
+        NoiseFloorEstimator("minstats").estimate(data.avg_db[0])
+
+
+def test_estimate_plain_bins_needs_a_uniform_grid() -> None:
+    bins = [ScanBin(freq_hz=100.0, avg_db=-50.0, max_db=-40.0)]
+    with pytest.raises(ValueError):
+        NoiseFloorEstimator().estimate(bins)
+    assert NoiseFloorEstimator().estimate(bins, bin_hz=10.0).bin_hz == 10.0
+
+    bins.append(ScanBin(freq_hz=110.0, avg_db=-55.0, max_db=-45.0))
+    bins.append(ScanBin(freq_hz=140.0, avg_db=-55.0, max_db=-45.0))
+    with pytest.raises(ValueError):
+        NoiseFloorEstimator().estimate(bins)
+
+
+def test_sliding_percentile_matches_partition_for_wide_windows() -> None:
+    rng = np.random.default_rng(5)
+    values = rng.normal(-90.0, 2.0, size=3000)
+    values[::37] = np.nan
+    values[100:140] = -95.0
+    for window in (65, 301, 7001):
+        size = min(window, 2 * len(values) - 1) | 1
+        padded = np.pad(values, size // 2, mode="edge")
+        view = np.lib.stride_tricks.sliding_window_view(padded, size)
+        for q in (0.0, 10.0, 50.0, 100.0):
+            rank = int(round(q / 100.0 * (size - 1)))
+            expected = np.partition(view, rank, axis=1)[:, rank]
+            actual = sliding_percentile(values, window, q)
+            assert np.array_equal(actual, expected, equal_nan=True)
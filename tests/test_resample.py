@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antennalab.analysis.alerts import AlertEngine, AlertRule
+from antennalab.analysis.calibration import Baseline, BaselineStore, apply_baseline
+from antennalab.analysis.compare import compare_scans
+from antennalab.analysis.resample import GridSignature, resample_spectrum
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.export_csv import ScanMeta
+from antennalab.report.scan_io import write_scan
+
+
+def _scan(start_hz: float, bin_hz: float, avg_db: np.ndarray) -> ScanResult:
+    avg_db = np.asarray(avg_db, dtype=np.float64)
+    return ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=start_hz,
+        stop_hz=start_hz + len(avg_db) * bin_hz,
+        bin_hz=bin_hz,
+        bins=Spectrum(start_hz=start_hz, bin_hz=bin_hz, avg_db=avg_db, max_db=avg_db + 3.0),
+    )
+
+
+def test_coarser_grid_averages_linear_power_and_keeps_peaks() -> None:
+    source = Spectrum(
+        start_hz=0.0,
+        bin_hz=10.0,
+        avg_db=np.array([-10.0, -20.0, -30.0, -40.0]),
+        max_db=np.array([1.0, 5.0, 2.0, 3.0]),
+    )
+    out = resample_spectrum(source, GridSignature(start_hz=0.0, bin_hz=20.0, n_bins=2))
+    assert out.avg_db[0] == pytest.approx(10.0 * np.log10((0.1 + 0.01) / 2.0))
+    assert out.max_db.tolist() == [5.0, 3.0]
+
+    shifted = resample_spectrum(source, GridSignature(start_hz=5.0, bin_hz=20.0, n_bins=2))
+    expected = 10.0 * np.log10((0.1 * 5 + 0.01 * 10 + 0.001 * 5) / 20.0)
+    assert shifted.avg_db[0] == pytest.approx(expected)
+    assert shifted.max_db.tolist() == [5.0, 3.0]
+
+
+def test_finer_grid_interpolates_and_marks_uncovered_bins() -> None:
+    source = Spectrum(
+        start_hz=0.0, bin_hz=10.0, avg_db=np.array([-10.0, -20.0]), max_db=np.array([0.0, 1.0])
+    )
+    out = resample_spectrum(source, GridSignature(start_hz=0.0, bin_hz=5.0, n_bins=5))
+    assert out.avg_db[:4].tolist() == [-10.0, -12.5, -17.5, -20.0]
+    assert out.max_db[:4].tolist() == [0.0, 0.0, 1.0, 1.0]
+    assert np.isnan(out.avg_db[4]) and np.isnan(out.max_db[4])
+
+
+def test_baseline_applies_across_bin_sizes() -> None:
+    base_scan = _scan(1e6, 25e3, np.full(40, -80.0))
+    baseline = Baseline(
+        meta=ScanMeta(
+            timestamp="",
+            start_hz=base_scan.start_hz,
+            stop_hz=base_scan.stop_hz,
+            bin_hz=base_scan.bin_hz,
+            antenna_tag=None,
+            location_tag=None,
+        ),
+        bins=base_scan.spectrum,
+    )
+    scan = _scan(1e6, 12.5e3, np.full(80, -70.0))
+    adjusted = apply_baseline(scan, baseline)
+    assert np.allclose(adjusted.spectrum.avg_db, 10.0)
+
+
+def test_baseline_store_caches_by_grid(tmp_path: Path) -> None:
+    path = write_scan(_scan(1e6, 25e3, np.full(40, -80.0)), tmp_path / "base.alscan")
+    store = BaselineStore(max_grids=2)
+    scan = _scan(1e6, 12.5e3, np.full(80, -70.0))
+    assert np.allclose(store.apply(scan, path).spectrum.avg_db, 10.0)
+    grid = GridSignature.of(scan.spectrum)
+    _, cached = store.on_grid(path, grid)
+    store.apply(scan, path)
+    assert store.on_grid(path, grid)[1] is cached
+    for bin_hz in (5e3, 10e3):
+        store.on_grid(path, GridSignature(start_hz=1e6, bin_hz=bin_hz, n_bins=10))
+    assert store.on_grid(path, grid)[1] is not cached
+    assert store.loads == 1
+
+
+def test_compare_and_alerts_on_mismatched_grids(tmp_path: Path) -> None:
+    path_a = write_scan(_scan(1e6, 10e3, np.full(100, -70.0)), tmp_path / "a.alscan")
+    path_b = write_scan(_scan(1e6, 5e3, np.full(200, -67.0)), tmp_path / "b.alscan")
+    result = compare_scans(path_a, path_b, bands=0)
+    assert len(result.delta_avg_db) == 100
+    assert result.score == pytest.approx(3.0)
+
+    engine = AlertEngine([AlertRule(freq_hz=1.0123e6, threshold_db=-70.0)])
+    hits = engine.evaluate(path_a)
+    assert [hit.freq_hz for hit in hits] == [1.01e6]
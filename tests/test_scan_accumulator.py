@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pytest
+
+from antennalab.analysis.scan import BinAccumulator, bin_indices
+from antennalab.instruments.rtlsdr import RTLSDRPlugin
+
+
+def _legacy_scan(samples_by_center, *, start_hz, stop_hz, bin_hz, sample_rate_hz, fft_size, sweeps):
+    n_bins = int(math.ceil((stop_hz - start_hz) / bin_hz))
+    sum_bins = [0.0] * n_bins
+    count_bins = [0] * n_bins
+    max_bins = [float("-inf")] * n_bins
+    sweep_avgs = []
+    window = np.hanning(fft_size)
+    reads = iter(samples_by_center)
+    for _ in range(sweeps):
+        per_sum = [0.0] * n_bins
+        per_count = [0] * n_bins
+        center = start_hz + sample_rate_hz / 2.0
+        while center < stop_hz:
+            spectrum = np.fft.fftshift(np.fft.fft(next(reads) * window))
+            power = 20 * np.log10(np.abs(spectrum) + 1e-12)
+            freqs = np.fft.fftshift(np.fft.fftfreq(fft_size, d=1.0 / sample_rate_hz)) + center
+            for freq_hz, power_db in zip(freqs, power):
+                if freq_hz < start_hz or freq_hz >= stop_hz:
+                    continue
+                idx = int((freq_hz - start_hz) // bin_hz)
+                sum_bins[idx] += float(power_db)
+                count_bins[idx] += 1
+                max_bins[idx] = max(max_bins[idx], float(power_db))
+                per_sum[idx] += float(power_db)
+                per_count[idx] += 1
+            center += sample_rate_hz * 0.8
+        sweep_avgs.append(
+            [per_sum[i] / per_count[i] if per_count[i] else -120.0 for i in range(n_bins)]
+        )
+    avg = [sum_bins[i] / count_bins[i] if count_bins[i] else -120.0 for i in range(n_bins)]
+    peak = [max_bins[i] if count_bins[i] else -120.0 for i in range(n_bins)]
+    return avg, peak, np.array(sweep_avgs)
+
+
+def test_bin_indices_drops_out_of_range() -> None:
+    freqs = np.array([90.0, 100.0, 104.9, 105.0, 119.9, 120.0])
+    valid, indices = bin_indices(freqs, start_hz=100.0, stop_hz=120.0, bin_hz=5.0, n_bins=4)
+    assert valid.tolist() == [False, True, True, True, True, False]
+    assert indices.tolist() == [0, 0, 1, 3]
+
+
+def test_accumulator_missing_bins() -> None:
+    acc = BinAccumulator(3, 2)
+    acc.add(0, np.array([0, 0, 2]), np.array([-10.0, -20.0, -5.0]))
+    acc.add(1, np.array([0]), np.array([-30.0]))
+    avg, peak, low, mean, high = acc.finish(-120.0)
+    assert avg.tolist() == [-20.0, -120.0, -5.0]
+    assert peak.tolist() == [-10.0, -120.0, -5.0]
+    assert low.tolist() == [-30.0, -120.0, -120.0]
+    assert high.tolist() == [-15.0, -120.0, -5.0]
+    assert mean[0] == pytest.approx(-22.5)
+
+
+def test_real_scan_matches_legacy_loop(fake_rtlsdr) -> None:
+    params = dict(
+        start_hz=100e6,
+        stop_hz=104e6,
+        bin_hz=25e3,
+        sample_rate_hz=2.4e6,
+        fft_size=512,
+        sweeps=2,
+    )
+    scan, stats = RTLSDRPlugin().scan_real_with_sweep_stats(
+        gain_db="auto",
+        step_hz=None,
+        dwell_ms=0,
+        missing_db=-120.0,
+        antenna_tag=None,
+        location_tag=None,
+        **params,
+    )
+
+    replay = fake_rtlsdr()
+    samples = [replay.read_samples(params["fft_size"]) for _ in range(fake_rtlsdr.instances[0].reads)]
+    avg, peak, sweep_avgs = _legacy_scan(samples, **params)
+
+    assert [b.avg_db for b in scan.bins] == pytest.approx(avg)
+    assert [b.max_db for b in scan.bins] == pytest.approx(peak)
+    assert [s.sweep_avg_min_db for s in stats] == pytest.approx(sweep_avgs.min(axis=0).tolist())
+    assert [s.sweep_avg_max_db for s in stats] == pytest.approx(sweep_avgs.max(axis=0).tolist())
+    assert [s.sweep_avg_mean_db for s in stats] == pytest.approx(sweep_avgs.mean(axis=0).tolist())
+    assert scan.bins[1].freq_hz == 100e6 + 25e3
+    assert fake_rtlsdr.instances[0].closed
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.analysis.compare import compare_scans
+from antennalab.analysis.monitor import MonitorSettings, run_monitor
+from antennalab.analysis.spectrum import ScanSimulator
+from antennalab.report.export_csv import write_scan_csv
+from antennalab.report.scan_io import (
+    SCAN_MAGIC,
+    convert_scan,
+    is_scan_binary,
+    load_scan,
+    read_scan,
+    write_scan,
+)
+
+
+def _scan():
+    return ScanSimulator(seed=3).simulate_scan(
+        start_hz=88e6, stop_hz=92e6, bin_hz=25e3, antenna_tag="dipole", location_tag=None
+    )
+
+
+def test_binary_round_trip_is_memory_mapped(tmp_path: Path) -> None:
+    scan = _scan()
+    path = write_scan(scan, tmp_path / "scan.alscan")
+    assert path.read_bytes().startswith(SCAN_MAGIC)
+
+    meta, spectrum = read_scan(path)
+    assert meta.start_hz == scan.start_hz
+    assert meta.antenna_tag == "dipole"
+    assert meta.location_tag is None
+    assert isinstance(spectrum.avg_db, np.memmap)
+    assert spectrum.avg_db.dtype == np.float32
+    assert np.allclose(spectrum.avg_db, scan.spectrum.avg_db, atol=1e-4)
+    assert np.allclose(spectrum.max_db, scan.spectrum.max_db, atol=1e-4)
+
+
+def test_format_detected_by_magic_bytes(tmp_path: Path) -> None:
+    scan = _scan()
+    binary = write_scan(scan, tmp_path / "scan.alscan")
+    renamed = binary.rename(tmp_path / "scan.dat")
+    assert is_scan_binary(renamed)
+    assert not is_scan_binary(write_scan_csv(scan, tmp_path / "scan.csv"))
+    assert len(load_scan(renamed).bins) == len(scan.bins)
+
+
+def test_convert_and_compare_across_formats(tmp_path: Path) -> None:
+    scan = _scan()
+    csv_path = write_scan_csv(scan, tmp_path / "scan.csv")
+    binary = convert_scan(csv_path, tmp_path / "scan.alscan")
+    back = convert_scan(binary, tmp_path / "back.csv")
+    assert back.read_text(encoding="utf-8") == csv_path.read_text(encoding="utf-8")
+
+    result = compare_scans(csv_path, binary)
+    assert len(result.bins) == len(scan.bins)
+    assert abs(result.score) < 1e-3
+
+
+def test_monitor_writes_binary_scans(tmp_path: Path) -> None:
+    settings = MonitorSettings(
+        mode="sim",
+        start_hz=88e6,
+        stop_hz=89e6,
+        bin_hz=50e3,
+        sample_rate_hz=2.4e6,
+        gain_db="auto",
+        fft_size=1024,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        interval_sec=1,
+        iterations=1,
+        seed=1,
+        bookmarks_file=None,
+        scan_format="alscan",
+    )
+    run_monitor(settings, out_dir=tmp_path)
+    scans = list((tmp_path / "scans").glob("scan_*.alscan"))
+    assert len(scans) == 1
+    assert is_scan_binary(scans[0])
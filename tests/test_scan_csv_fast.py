@@ -0,0 +1,96 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antennalab.core.models import ScanResult, Spectrum
+from antennalab.report.export_csv import read_scan_csv, write_scan_csv
+
+
+def _legacy_write(scan: ScanResult, path: Path) -> Path:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["timestamp", "start_hz", "stop_hz", "bin_hz", "antenna_tag", "location_tag"])
+        writer.writerow(
+            [
+                scan.timestamp,
+                scan.start_hz,
+                scan.stop_hz,
+                scan.bin_hz,
+                scan.antenna_tag or "",
+                scan.location_tag or "",
+            ]
+        )
+        writer.writerow(["freq_hz", "avg_db", "max_db"])
+        for bin_ in scan.bins:
+            writer.writerow([f"{bin_.freq_hz:.0f}", f"{bin_.avg_db:.2f}", f"{bin_.max_db:.2f}"])
+    return path
+
+
+def _legacy_read(path: Path) -> tuple[list[float], list[float]]:
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        rows = list(csv.reader(handle))[3:]
+    return [float(row[1]) for row in rows if row], [float(row[2]) for row in rows if row]
+
+
+def _scan(avg_db: np.ndarray, max_db: np.ndarray, *, start_hz: float = 24e6, bin_hz: float = 1e3) -> ScanResult:
+    return ScanResult(
+        timestamp="2024-01-01T00:00:00+00:00",
+        start_hz=start_hz,
+        stop_hz=start_hz + len(avg_db) * bin_hz,
+        bin_hz=bin_hz,
+        bins=Spectrum(start_hz=start_hz, bin_hz=bin_hz, avg_db=avg_db, max_db=max_db),
+        antenna_tag="yagi",
+    )
+
+
+def test_writer_is_byte_identical_on_edge_values(tmp_path: Path) -> None:
+    rng = np.random.default_rng(5)
+    avg_db = rng.normal(-70.0, 8.0, size=5000)
+    avg_db[:12] = [-0.0, 0.0, -0.001, 0.004999, 0.005, 0.015, 1.125, -2.675, np.nan, np.inf, -np.inf, 1e300]
+    max_db = np.round(rng.uniform(-120.0, 10.0, size=5000), 3)
+    scan = _scan(avg_db, max_db, start_hz=100e6 + 0.5, bin_hz=12.5)
+
+    fast = write_scan_csv(scan, tmp_path / "fast.csv")
+    legacy = _legacy_write(scan, tmp_path / "legacy.csv")
+    assert fast.read_bytes() == legacy.read_bytes()
+
+
+def test_reader_matches_csv_module(tmp_path: Path) -> None:
+    rng = np.random.default_rng(6)
+    scan = _scan(rng.normal(-60.0, 5.0, size=3000), rng.normal(-50.0, 5.0, size=3000))
+    path = _legacy_write(scan, tmp_path / "scan.csv")
+    meta, spectrum = read_scan_csv(path)
+    avg_db, max_db = _legacy_read(path)
+    assert meta.antenna_tag == "yagi"
+    assert spectrum.avg_db.tolist() == avg_db
+    assert spectrum.max_db.tolist() == max_db
+
+
+def test_reader_keeps_gapped_frequencies(tmp_path: Path) -> None:
+    path = tmp_path / "gapped.csv"
+    path.write_text(
+        "timestamp,start_hz,stop_hz,bin_hz,antenna_tag,location_tag\n"
+        "2024-01-01T00:00:00+00:00,100,150,5,,\n"
+        "freq_hz,avg_db,max_db\n"
+        "100,-50.00,-40.00\n105,-51.00,-41.00\n140,-52.00,-42.00\n",
+        encoding="utf-8",
+    )
+    _, spectrum = read_scan_csv(path)
+    finite = np.isfinite(spectrum.avg_db)
+    assert spectrum.freq_hz[finite].tolist() == [100.0, 105.0, 140.0]
+    assert spectrum.avg_db[finite].tolist() == [-50.0, -51.0, -52.0]
+
+    path.write_text(path.read_text(encoding="utf-8").replace("140,", "142,"), encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_scan_csv(path)
+
+
+def test_bulk_writer_matches_row_loop(tmp_path: Path) -> None:
+    rng = np.random.default_rng(7)
+    avg_db = rng.normal(-70.0, 5.0, size=20_000)
+    scan = _scan(avg_db, avg_db + 3.0)
+    fast_path = write_scan_csv(scan, tmp_path / "fast.csv")
+    legacy_path = _legacy_write(scan, tmp_path / "legacy.csv")
+    assert fast_path.read_bytes() == legacy_path.read_bytes()
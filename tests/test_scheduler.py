@@ -0,0 +1,50 @@
+import pytest
+
+from antennalab.core.scheduler import DeadlineScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_scheduler_holds_absolute_deadlines() -> None:
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(0.5, iterations=20, clock=clock, sleep=clock.sleep)
+    for _ in scheduler:
+        clock.now += 0.3  # scan + write time must not stretch the period
+    stats = scheduler.stats()
+    assert [tick.slot for tick in scheduler.ticks] == list(range(20))
+    assert scheduler.ticks[-1].deadline == pytest.approx(1000.0 + 19 * 0.5)
+    assert stats.period_mean_sec == pytest.approx(0.5)
+    assert stats.lateness_max_ms == pytest.approx(0.0)
+    assert stats.missed_slots == 0
+
+
+def test_scheduler_skips_missed_slots_within_duration() -> None:
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(1.0, duration_sec=10.0, clock=clock, sleep=clock.sleep)
+    for tick in scheduler:
+        clock.now += 2.6 if tick.index == 1 else 0.1
+    slots = [tick.slot for tick in scheduler.ticks]
+    # Slot 1 overran into slot 3; slots 2 and 3 were more than half an interval
+    # late and are skipped, slot 4 starts on time again.
+    assert slots == [0, 1, 4, 5, 6, 7, 8, 9]
+    assert scheduler.ticks[2].missed_before == 2
+    assert scheduler.stats().missed_slots == 2
+
+
+def test_scheduler_runs_slightly_late_slots() -> None:
+    clock = FakeClock()
+    scheduler = DeadlineScheduler(1.0, iterations=3, clock=clock, sleep=clock.sleep)
+    for tick in scheduler:
+        clock.now += 1.2 if tick.index == 0 else 0.1
+    assert [tick.slot for tick in scheduler.ticks] == [0, 1, 2]
+    assert scheduler.ticks[1].lateness_sec == pytest.approx(0.2)
+    assert scheduler.stats().lateness_max_ms == pytest.approx(200.0)
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from antennalab.analysis.waterfall import WaterfallSettings, run_waterfall
+from antennalab.instruments.rtlsdr import RTLSDRPlugin
+
+
+def test_session_skips_unchanged_settings(fake_rtlsdr) -> None:
+    with RTLSDRPlugin().open_session() as session:
+        assert not session.is_open
+        session.configure(sample_rate_hz=2.4e6, gain_db="auto")
+        session.configure(sample_rate_hz=2.4e6, gain_db="auto")
+        session.tune(100e6)
+        session.tune(100e6)
+        session.configure(sample_rate_hz=2.4e6, gain_db="20")
+        device = fake_rtlsdr.instances[0]
+        assert device.writes == ["sample_rate", "gain", "center_freq", "gain"]
+    assert device.closed
+    assert not session.is_open
+
+
+def test_real_waterfall_opens_device_once(fake_rtlsdr, tmp_path: Path) -> None:
+    settings = WaterfallSettings(
+        mode="real",
+        start_hz=100e6,
+        stop_hz=102e6,
+        bin_hz=50e3,
+        slices=5,
+        interval_ms=0,
+        sample_rate_hz=2.4e6,
+        gain_db="auto",
+        fft_size=256,
+        step_hz=None,
+        sweeps=2,
+        dwell_ms=0,
+        missing_db=-120.0,
+        seed=None,
+    )
+    out_csv = run_waterfall(settings, tmp_path / "waterfall.csv")
+    assert out_csv.exists()
+    assert len(fake_rtlsdr.instances) == 1
+    device = fake_rtlsdr.instances[0]
+    assert device.writes.count("sample_rate") == 1
+    assert device.closed
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from antennalab.analysis.scan import SegmentLayout
+from antennalab.instruments.rtlsdr import RTLSDRPlugin
+
+
+def test_layout_block_size() -> None:
+    assert SegmentLayout(256).block_size == 256
+    layout = SegmentLayout(256, segments=4, overlap=0.5)
+    assert layout.hop == 128
+    assert layout.block_size == 256 + 3 * 128
+    with pytest.raises(ValueError):
+        SegmentLayout(256, segments=2, overlap=1.0)
+
+
+def test_segment_average_reduces_variance() -> None:
+    rng = np.random.default_rng(0)
+    window = np.hanning(256)
+    single = SegmentLayout(256)
+    welch = SegmentLayout(256, segments=16, overlap=0.5)
+
+    block = rng.normal(size=welch.block_size) + 1j * rng.normal(size=welch.block_size)
+    one = single.power_db(block[:256], window)
+    many = welch.power_db(block, window)
+    assert many.shape == one.shape
+    assert many.std() < one.std() / 2
+
+
+def test_single_segment_matches_plain_fft() -> None:
+    rng = np.random.default_rng(1)
+    window = np.hanning(128)
+    block = rng.normal(size=128) + 1j * rng.normal(size=128)
+    expected = 20 * np.log10(np.abs(np.fft.fftshift(np.fft.fft(block * window))) + 1e-12)
+    assert np.array_equal(SegmentLayout(128).power_db(block, window), expected)
+
+
+def test_scan_reads_full_segment_block(fake_rtlsdr) -> None:
+    scan = RTLSDRPlugin().scan_real(
+        start_hz=100e6,
+        stop_hz=102e6,
+        bin_hz=50e3,
+        sample_rate_hz=2.4e6,
+        gain_db="auto",
+        fft_size=256,
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        antenna_tag=None,
+        location_tag=None,
+        segments=8,
+        overlap=0.5,
+    )
+    assert len(scan.bins) == 40
+    assert fake_rtlsdr.instances[0].reads == 1
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antennalab.analysis.noise_floor import NoiseFloorEstimator
+from antennalab.analysis.spectrum import ScanSimulator
+from antennalab.core.models import ScanBin, ScanResult, Spectrum
+from antennalab.report.export_csv import read_scan_csv, write_scan_csv
+
+
+def _spectrum() -> Spectrum:
+    return Spectrum(
+        start_hz=100e6,
+        bin_hz=1e3,
+        avg_db=np.arange(10, dtype=float),
+        max_db=np.arange(10, dtype=float) + 5,
+    )
+
+
+def test_spectrum_indexing_and_iteration() -> None:
+    spectrum = _spectrum()
+    assert len(spectrum) == 10
+    assert spectrum[3] == ScanBin(freq_hz=100_003_000.0, avg_db=3.0, max_db=8.0)
+    assert spectrum[-1].freq_hz == 100_009_000.0
+    assert list(spectrum)[2] == spectrum[2]
+    assert spectrum.stop_hz == 100_010_000.0
+
+
+def test_slice_hz_is_zero_copy_view() -> None:
+    spectrum = _spectrum()
+    window = spectrum.slice_hz(100_002_000, 100_005_000)
+    assert len(window) == 3
+    assert window.start_hz == 100_002_000.0
+    assert np.shares_memory(window.avg_db, spectrum.avg_db)
+    assert window[0] == spectrum[2]
+
+
+def test_scan_result_spectrum_from_tuple_bins() -> None:
+    bins = tuple(ScanBin(freq_hz=1e6 + i * 10, avg_db=-i, max_db=i) for i in range(4))
+    scan = ScanResult(
+        timestamp="t", start_hz=1e6, stop_hz=1e6 + 40, bin_hz=10, bins=bins
+    )
+    assert scan.spectrum.avg_db.tolist() == [0, -1, -2, -3]
+    assert list(scan.spectrum) == list(bins)
+
+
+def test_csv_round_trip_returns_spectrum(tmp_path: Path) -> None:
+    scan = ScanSimulator(seed=1).simulate_scan(
+        start_hz=88e6, stop_hz=90e6, bin_hz=50e3, antenna_tag=None, location_tag=None
+    )
+    assert isinstance(scan.bins, Spectrum)
+    path = write_scan_csv(scan, tmp_path / "scan.csv")
+    meta, spectrum = read_scan_csv(path)
+    assert isinstance(spectrum, Spectrum)
+    assert meta.start_hz == spectrum.start_hz
+    assert np.allclose(spectrum.avg_db, scan.spectrum.avg_db, atol=0.005)
+
+    floor = NoiseFloorEstimator().estimate(spectrum)
+    assert np.array_equal(floor.noise_floor_db, spectrum.avg_db)
+    assert floor.bins[0].freq_hz == 88e6
+
+
+def test_scan_result_rejects_bins_off_the_grid() -> None:
+    freqs = (1e6, 1e6 + 10, 1e6 + 30, 1e6 + 40)
+    bins = tuple(ScanBin(freq_hz=freq, avg_db=-1.0, max_db=1.0) for freq in freqs)
+    scan = ScanResult(timestamp="t", start_hz=1e6, stop_hz=1e6 + 40, bin_hz=10, bins=bins)
+    with pytest.raises(ValueError, match="start_hz"):
+        scan.spectrum
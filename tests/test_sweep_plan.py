@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.analysis.scan import SweepPlan, get_sweep_plan
+from antennalab.instruments.rtlsdr import RTLSDRPlugin
+
+PARAMS = dict(
+    start_hz=100e6,
+    stop_hz=104e6,
+    bin_hz=25e3,
+    sample_rate_hz=2.4e6,
+    fft_size=256,
+    step_hz=None,
+)
+
+
+def test_plan_centers_and_indices() -> None:
+    plan = SweepPlan.build(**PARAMS)
+    assert plan.step_hz == 2.4e6 * 0.8
+    assert plan.centers[0] == 100e6 + 1.2e6
+    assert all(c < 104e6 for c in plan.centers)
+    for _, mask, indices in plan.iter_centers():
+        assert mask.sum() == len(indices)
+        assert indices.min() >= 0 and indices.max() < plan.n_bins
+
+
+def test_plan_cached_in_memory_and_on_disk(tmp_path: Path) -> None:
+    first = get_sweep_plan(**PARAMS, cache_dir=tmp_path)
+    assert get_sweep_plan(**PARAMS, cache_dir=tmp_path) is first
+
+    files = list(tmp_path.glob("sweep_plan_*.npz"))
+    assert [f.name for f in files] == [f"sweep_plan_{first.key}.npz"]
+    loaded = SweepPlan.load(files[0])
+    assert loaded.params == first.params
+    assert np.array_equal(loaded.masks, first.masks)
+    for a, b in zip(loaded.indices, first.indices):
+        assert np.array_equal(a, b)
+
+
+def test_repeated_scans_reuse_plan(fake_rtlsdr, tmp_path: Path) -> None:
+    plugin = RTLSDRPlugin(plan_cache_dir=tmp_path)
+    kwargs = dict(
+        start_hz=PARAMS["start_hz"],
+        stop_hz=PARAMS["stop_hz"],
+        bin_hz=PARAMS["bin_hz"],
+        sample_rate_hz=PARAMS["sample_rate_hz"],
+        gain_db="auto",
+        fft_size=PARAMS["fft_size"],
+        step_hz=None,
+        sweeps=1,
+        dwell_ms=0,
+        missing_db=-120.0,
+        antenna_tag=None,
+        location_tag=None,
+    )
+    first = plugin.scan_real(**kwargs)
+    second = plugin.scan_real(**kwargs)
+    assert [b.avg_db for b in first.bins] == [b.avg_db for b in second.bins]
+    assert len(list(tmp_path.glob("sweep_plan_*.npz"))) == 1
@@ -0,0 +1,97 @@
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antennalab.analysis.spectrum import ScanSimulator
+from antennalab.analysis.waterfall import WaterfallSettings, run_waterfall
+from antennalab.report.waterfall_html import write_waterfall_html
+from antennalab.report.waterfall_io import (
+    WATERFALL_MAGIC,
+    DenseWaterfallWriter,
+    convert_waterfall,
+    is_waterfall_binary,
+    read_waterfall,
+)
+from antennalab.report.waterfall_plot import plot_waterfall_csv
+
+SETTINGS = WaterfallSettings(
+    mode="sim",
+    start_hz=100.0,
+    stop_hz=200.0,
+    bin_hz=5.0,
+    slices=4,
+    interval_ms=0,
+    sample_rate_hz=2_400_000,
+    gain_db="auto",
+    fft_size=1024,
+    step_hz=None,
+    sweeps=1,
+    dwell_ms=0,
+    missing_db=-120.0,
+    seed=1,
+)
+
+
+def test_binary_waterfall_is_dense_and_memory_mapped(tmp_path: Path) -> None:
+    path = run_waterfall(SETTINGS, tmp_path / "waterfall.alwf")
+    assert path.read_bytes().startswith(WATERFALL_MAGIC)
+
+    data = read_waterfall(path)
+    assert (data.n_slices, data.n_bins) == (4, 20)
+    assert isinstance(data.avg_db, np.memmap)
+    assert data.freq_hz[0] == 100.0 and data.stop_hz == 200.0
+    assert np.all(np.diff(data.timestamps) >= 0)
+
+    window = data.window(start_hz=150.0, stop_hz=160.0, first_slice=1, stop_slice=3)
+    assert window.avg_db.shape == (2, 2)
+    assert window.start_hz == 150.0
+    assert np.array_equal(window.avg_db, data.avg_db[1:3, 10:12])
+
+
+def test_csv_binary_round_trip(tmp_path: Path) -> None:
+    csv_path = run_waterfall(SETTINGS, tmp_path / "waterfall.csv")
+    binary = convert_waterfall(csv_path, tmp_path / "copy.alwf")
+    assert is_waterfall_binary(binary)
+    back = convert_waterfall(binary, tmp_path / "back.csv")
+    assert back.read_bytes() == csv_path.read_bytes()
+
+    from_csv = read_waterfall(csv_path)
+    from_binary = read_waterfall(binary)
+    assert np.array_equal(from_csv.avg_db, from_binary.avg_db)
+    assert np.array_equal(from_csv.timestamps, from_binary.timestamps)
+
+
+def test_binary_resume_drops_partial_record(tmp_path: Path) -> None:
+    path = run_waterfall(SETTINGS, tmp_path / "waterfall.alwf")
+    with path.open("ab") as handle:
+        handle.write(b"\x00" * 17)
+    run_waterfall(replace(SETTINGS, slices=2, resume=True), path)
+    assert read_waterfall(path).n_slices == 6
+
+
+def test_plot_and_html_accept_binary(tmp_path: Path) -> None:
+    path = run_waterfall(SETTINGS, tmp_path / "waterfall.alwf")
+    png = plot_waterfall_csv(path, tmp_path / "waterfall.png", start_hz=120.0, stop_hz=180.0)
+    assert png.exists()
+    html = write_waterfall_html(path, tmp_path / "waterfall.html", first_slice=1)
+    assert "AntennaLab Waterfall" in html.read_text(encoding="utf-8")
+
+
+def test_binary_writer_closed_without_slices_leaves_no_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.alwf"
+    with DenseWaterfallWriter(path):
+        pass
+    assert not path.exists()
+
+
+def test_binary_writer_rejects_a_different_bin_width(tmp_path: Path) -> None:
+    path = tmp_path / "waterfall.alwf"
+    run_waterfall(SETTINGS, path)
+    size = path.stat().st_size
+    scan = ScanSimulator(seed=2).simulate_scan(start_hz=100.0, stop_hz=300.0, bin_hz=10.0)
+    with pytest.raises(ValueError, match="frequency axis"):
+        with DenseWaterfallWriter(path, resume=True) as writer:
+            writer.append(scan)
+    assert path.stat().st_size == size
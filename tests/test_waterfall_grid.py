@@ -0,0 +1,68 @@
+import csv
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.analysis.spectrum import ScanSimulator
+from antennalab.analysis.waterfall import WaterfallWriter
+from antennalab.report.waterfall_grid import WaterfallGridBuilder, iso_to_epoch, stream_waterfall_csv
+
+
+def _write(path: Path, slices: int, n_bins: int) -> Path:
+    with WaterfallWriter(path) as writer:
+        for idx in range(slices):
+            scan = ScanSimulator(seed=idx).simulate_scan(
+                start_hz=1e6, stop_hz=1e6 + n_bins * 1e3, bin_hz=1e3
+            )
+            writer.append(scan, timestamp=f"2024-01-01T00:00:{idx:02d}+00:00")
+    return path
+
+
+def _reference(path: Path) -> tuple[list[float], np.ndarray]:
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        rows = [row for row in list(csv.reader(handle))[1:] if row]
+    freqs = sorted({float(row[2]) for row in rows})
+    grid = np.full((max(int(row[1]) for row in rows) + 1, len(freqs)), np.nan)
+    for row in rows:
+        grid[int(row[1]), freqs.index(float(row[2]))] = float(row[3])
+    return freqs, grid
+
+
+def test_streamed_grid_matches_row_by_row_reference(tmp_path: Path) -> None:
+    path = _write(tmp_path / "waterfall.csv", slices=6, n_bins=40)
+    freq_hz, timestamps, avg_db, max_db = stream_waterfall_csv(path, chunk_bytes=500)
+    freqs, grid = _reference(path)
+    assert freq_hz.tolist() == freqs
+    assert np.allclose(avg_db, grid, atol=1e-4)
+    assert avg_db.dtype == np.float32 and max_db.shape == avg_db.shape
+    assert timestamps[5] == iso_to_epoch("2024-01-01T00:00:05+00:00")
+
+
+def test_gaps_blank_lines_and_unknown_freqs(tmp_path: Path) -> None:
+    path = tmp_path / "waterfall.csv"
+    path.write_text(
+        "timestamp,slice_index,freq_hz,avg_db,max_db\r\n"
+        "t0,0,100,-1.00,0.00\r\n"
+        "t0,0,105,-2.00,0.00\r\n"
+        "\r\n"
+        "2024-01-01T00:00:00+00:00,3,100,-3.00,0.00\r\n"
+        "2024-01-01T00:00:00+00:00,3,110,-9.00,0.00\r\n",
+        encoding="utf-8",
+    )
+    freq_hz, timestamps, avg_db, _ = stream_waterfall_csv(path)
+    assert freq_hz.tolist() == [100.0, 105.0]
+    assert avg_db.shape == (4, 2)
+    assert avg_db[0].tolist() == [-1.0, -2.0]
+    assert np.isnan(avg_db[1:3]).all()
+    assert avg_db[3, 0] == -3.0 and np.isnan(avg_db[3, 1])
+    assert timestamps[3] == iso_to_epoch("2024-01-01T00:00:00+00:00")
+
+
+def test_builder_grows_past_estimate() -> None:
+    builder = WaterfallGridBuilder(np.array([1.0, 2.0]), slices_hint=1)
+    builder.add(np.array([0, 5]), np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([5.0, 6.0]))
+    builder.add(np.array([9]), np.array([7.0]), np.array([0.0]), np.array([0.0]))
+    _, avg_db, _ = builder.finish()
+    assert avg_db.shape == (6, 2)
+    assert avg_db[5, 1] == 4.0
+    assert builder.dropped == 1
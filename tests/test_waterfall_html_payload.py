@@ -0,0 +1,92 @@
+import base64
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+from antennalab.report.palettes import PALETTE_NAMES, palette_lut
+from antennalab.report.waterfall_grid import max_pool, quantize
+from antennalab.report.waterfall_html import write_waterfall_html
+from antennalab.report.waterfall_io import WaterfallData, write_waterfall_data
+
+
+def _payload(html: str) -> bytes:
+    return base64.b64decode(re.search(r"const payload = '([^']*)'", html).group(1))
+
+
+def test_max_pool_keeps_peaks_and_gaps() -> None:
+    values = np.full((4, 6), -90.0, dtype=np.float32)
+    values[1, 4] = -10.0
+    values[2:, :3] = np.nan
+    pooled = max_pool(values, 2, 2)
+    assert pooled.shape == (2, 2)
+    assert pooled[0, 1] == -10.0
+    assert np.isnan(pooled[1, 0])
+    assert pooled[1, 1] == -90.0
+
+
+def test_quantize_reserves_zero_for_missing() -> None:
+    codes = quantize(np.array([np.nan, -100.0, -50.0, 0.0, 10.0]), -100.0, 0.0)
+    assert codes.tolist() == [0, 1, 128, 255, 255]
+
+
+def test_html_embeds_decimated_uint8_grid(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    avg_db = rng.normal(-70.0, 3.0, size=(300, 2000)).astype(np.float32)
+    avg_db[10, 1234] = 0.0
+    avg_db[20, :] = np.nan
+    data = WaterfallData(
+        start_hz=100e6, bin_hz=1e3, timestamps=np.arange(300.0), avg_db=avg_db, max_db=avg_db
+    )
+    source = write_waterfall_data(data, tmp_path / "wf.alwf")
+
+    html = write_waterfall_html(source, tmp_path / "wf.html", width=400, height=100).read_text(
+        encoding="utf-8"
+    )
+    assert "= nan;" not in html.split("<script>")[1]
+    payload = np.frombuffer(_payload(html), dtype=np.uint8).reshape(100, 400)
+    assert payload.max() == 255
+    assert payload[3, 246] == 255
+    assert len(html) < avg_db.size
+
+
+def test_html_float32_payload_round_trips(tmp_path: Path) -> None:
+    avg_db = np.array([[-80.0, np.nan], [-60.5, -70.25]], dtype=np.float32)
+    data = WaterfallData(
+        start_hz=1e6, bin_hz=1e3, timestamps=np.arange(2.0), avg_db=avg_db, max_db=avg_db
+    )
+    source = write_waterfall_data(data, tmp_path / "wf.alwf")
+    html = write_waterfall_html(source, tmp_path / "wf.html", encoding="float32").read_text(
+        encoding="utf-8"
+    )
+    decoded = np.frombuffer(_payload(html), dtype="<f4").reshape(2, 2)
+    assert np.array_equal(decoded, avg_db, equal_nan=True)
+
+
+def test_palette_luts_match_matplotlib_and_reserve_missing() -> None:
+    from matplotlib import colormaps
+
+    lut = palette_lut("viridis")
+    assert lut.shape == (256, 4) and lut.dtype == np.uint8
+    assert tuple(lut[0]) == (0, 0, 0, 255)
+    expected = np.rint(np.asarray(colormaps["viridis"](np.linspace(0.0, 1.0, 255))) * 255.0)
+    assert np.array_equal(lut[1:], expected.astype(np.uint8))
+    heat = palette_lut("heat")
+    assert tuple(heat[1][:3]) == (0, 0, 255) and tuple(heat[255][:3]) == (255, 0, 0)
+
+
+def test_html_embeds_lookup_tables_for_each_palette(tmp_path: Path) -> None:
+    avg_db = np.array([[-80.0, -60.0]], dtype=np.float32)
+    data = WaterfallData(
+        start_hz=1e6, bin_hz=1e3, timestamps=np.arange(1.0), avg_db=avg_db, max_db=avg_db
+    )
+    source = write_waterfall_data(data, tmp_path / "wf.alwf")
+    html = write_waterfall_html(source, tmp_path / "wf.html", palette="magma").read_text(
+        encoding="utf-8"
+    )
+    luts = json.loads(re.search(r"const paletteLuts = (\{.*\});", html).group(1))
+    assert set(PALETTE_NAMES) <= set(luts)
+    assert base64.b64decode(luts["magma"]) == palette_lut("magma").tobytes()
+    assert '<option value="magma">magma</option>' in html
+    assert "colorFor" not in html
@@ -0,0 +1,84 @@
+import base64
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from antennalab.report.waterfall_grid import quantize
+from antennalab.report.waterfall_html import write_tiled_waterfall_html
+from antennalab.report.waterfall_io import WaterfallData, write_waterfall_data
+from antennalab.report.waterfall_tiles import build_tile_pyramid
+
+
+def _source(tmp_path: Path, avg_db: np.ndarray) -> Path:
+    data = WaterfallData(
+        start_hz=100e6,
+        bin_hz=1e3,
+        timestamps=np.arange(float(len(avg_db))),
+        avg_db=avg_db,
+        max_db=avg_db,
+    )
+    return write_waterfall_data(data, tmp_path / "wf.alwf")
+
+
+def _read_js_tile(path: Path, size: int) -> np.ndarray:
+    payload = re.search(r'antennalabTile\("[^"]*","([^"]*)"\)', path.read_text()).group(1)
+    return np.frombuffer(base64.b64decode(payload), dtype=np.uint8).reshape(size, size)
+
+
+def test_pyramid_levels_and_full_resolution_tiles(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    avg_db = rng.normal(-70.0, 3.0, size=(37, 21)).astype(np.float32)
+    avg_db[5, 3:6] = np.nan
+    manifest_path = build_tile_pyramid(
+        _source(tmp_path, avg_db), tmp_path / "tiles", tile_size=8, vmin=-80.0, vmax=-60.0
+    )
+    manifest = json.loads(manifest_path.read_text())
+    assert manifest["levels"] == 4
+    assert manifest["n_slices"] == 37 and manifest["n_bins"] == 21
+
+    expected = quantize(avg_db, -80.0, -60.0)
+    for row in range(5):
+        for col in range(3):
+            tile = _read_js_tile(tmp_path / "tiles" / "tiles" / "0" / f"{row}_{col}.js", 8)
+            block = expected[row * 8 : row * 8 + 8, col * 8 : col * 8 + 8]
+            assert np.array_equal(tile[: block.shape[0], : block.shape[1]], block)
+    top = sorted(p.name for p in (tmp_path / "tiles" / "tiles" / "3").iterdir())
+    assert top == ["0_0.js"]
+
+
+def test_max_and_mean_reducers(tmp_path: Path) -> None:
+    avg_db = np.full((4, 4), -80.0, dtype=np.float32)
+    avg_db[0, 0] = -20.0
+    avg_db[3, 3] = np.nan
+    source = _source(tmp_path, avg_db)
+    for reducer in ("max", "mean"):
+        out_dir = tmp_path / reducer
+        build_tile_pyramid(
+            source, out_dir, tile_size=2, reducer=reducer, vmin=-80.0, vmax=-20.0, tile_format="bin"
+        )
+        level1 = np.frombuffer((out_dir / "tiles" / "1" / "0_0.bin").read_bytes(), dtype=np.uint8)
+        level1 = level1.reshape(2, 2)
+        if reducer == "max":
+            assert level1[0, 0] == 255
+        else:
+            assert level1[0, 0] == quantize(np.array([-65.0]), -80.0, -20.0)[0]
+        # The missing cell does not drag the mean down or blank the block.
+        assert level1[1, 1] == 1
+
+
+def test_viewer_loads_manifest_and_tiles_lazily(tmp_path: Path) -> None:
+    avg_db = np.full((10, 10), -70.0, dtype=np.float32)
+    manifest_path = build_tile_pyramid(_source(tmp_path, avg_db), tmp_path / "tiles", tile_size=4)
+    html = write_tiled_waterfall_html(manifest_path.parent).read_text(encoding="utf-8")
+    assert '<script src="manifest.js"></script>' in html
+    assert "0_0" not in html
+    assert (manifest_path.parent / "manifest.js").read_text().startswith("antennalabManifest(")
+
+
+def test_pyramid_rejects_odd_tile_size(tmp_path: Path) -> None:
+    source = _source(tmp_path, np.zeros((2, 2), dtype=np.float32))
+    with pytest.raises(ValueError):
+        build_tile_pyramid(source, tmp_path / "tiles", tile_size=3)
@@ -0,0 +1,110 @@
+import csv
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from antennalab.analysis.spectrum import ScanSimulator
+from antennalab.analysis.waterfall import (
+    WaterfallSettings,
+    WaterfallWriter,
+    run_waterfall,
+    write_waterfall_csv,
+)
+
+SETTINGS = WaterfallSettings(
+    mode="sim",
+    start_hz=100.0,
+    stop_hz=150.0,
+    bin_hz=5.0,
+    slices=3,
+    interval_ms=0,
+    sample_rate_hz=2_400_000,
+    gain_db="auto",
+    fft_size=1024,
+    step_hz=None,
+    sweeps=1,
+    dwell_ms=0,
+    missing_db=-120.0,
+    seed=1,
+)
+
+
+def _rows(path: Path) -> list[list[str]]:
+    with path.open("r", newline="", encoding="utf-8") as handle:
+        return list(csv.reader(handle))
+
+
+def _scan(seed: int):
+    return ScanSimulator(seed=seed).simulate_scan(start_hz=100.0, stop_hz=150.0, bin_hz=5.0)
+
+
+def test_slices_are_on_disk_before_close(tmp_path: Path) -> None:
+    path = tmp_path / "waterfall.csv"
+    writer = WaterfallWriter(path)
+    writer.append(_scan(1))
+    assert len(_rows(path)) == 1 + 10
+    writer.append(_scan(2))
+    assert len(_rows(path)) == 1 + 20
+    writer.close()
+    assert [row[1] for row in _rows(path)[1:]] == ["0"] * 10 + ["1"] * 10
+
+
+def test_write_waterfall_csv_matches_csv_module(tmp_path: Path) -> None:
+    scan = _scan(3)
+    path = write_waterfall_csv(tmp_path / "waterfall.csv", [("t0", 0, scan), ("t1", 1, scan)])
+    expected = [["timestamp", "slice_index", "freq_hz", "avg_db", "max_db"]]
+    for stamp, idx in (("t0", 0), ("t1", 1)):
+        expected += [
+            [stamp, str(idx), f"{b.freq_hz:.0f}", f"{b.avg_db:.2f}", f"{b.max_db:.2f}"]
+            for b in scan.bins
+        ]
+    assert _rows(path) == expected
+    assert path.read_bytes().count(b"\r\n") == len(expected)
+
+
+def test_resume_drops_partial_slice_and_continues(tmp_path: Path) -> None:
+    path = tmp_path / "waterfall.csv"
+    run_waterfall(SETTINGS, path)
+    complete = path.read_bytes()
+    with path.open("ab") as handle:
+        handle.write(b"2024-01-01T00:00:00,3,100,-70.00,-65.00\r\n2024-01-01T00:00:00,3,10")
+
+    run_waterfall(replace(SETTINGS, slices=2, resume=True), path)
+    data = path.read_bytes()
+    assert data.startswith(complete)
+    rows = _rows(path)
+    assert [row[1] for row in rows[1:]] == [str(i) for i in range(5) for _ in range(10)]
+
+
+def test_resume_on_missing_file_starts_fresh(tmp_path: Path) -> None:
+    path = tmp_path / "waterfall.csv"
+    run_waterfall(replace(SETTINGS, resume=True, flush_every=2), path)
+    rows = _rows(path)
+    assert rows[0][0] == "timestamp"
+    assert len(rows) == 1 + 3 * 10
+
+
+def test_resume_rejects_a_different_grid(tmp_path: Path) -> None:
+    path = tmp_path / "waterfall.csv"
+    run_waterfall(SETTINGS, path)
+    complete = path.read_bytes()
+    for change in ({"stop_hz": 125.0}, {"start_hz": 105.0, "stop_hz": 155.0}):
+        with pytest.raises(ValueError, match="frequency axis"):
+            run_waterfall(replace(SETTINGS, resume=True, **change), path)
+        assert path.read_bytes() == complete
+    with pytest.raises(ValueError, match="frequency axis"):
+        with WaterfallWriter(path, resume=True) as writer:
+            writer.append(
+                ScanSimulator(seed=4).simulate_scan(start_hz=100.0, stop_hz=200.0, bin_hz=10.0)
+            )
+
+
+def test_writer_rejects_a_grid_change_between_slices(tmp_path: Path) -> None:
+    writer = WaterfallWriter(tmp_path / "waterfall.csv")
+    writer.append(_scan(1))
+    with pytest.raises(ValueError, match="frequency axis"):
+        writer.append(
+            ScanSimulator(seed=2).simulate_scan(start_hz=100.0, stop_hz=200.0, bin_hz=10.0)
+        )
+    writer.close()
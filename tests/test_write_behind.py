@@ -0,0 +1,61 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from antennalab.bookmarks import Bookmark, BookmarkCache, save_bookmarks
+from antennalab.report.write_behind import WriteBehindWriter
+
+
+def test_writer_runs_jobs_in_order(tmp_path: Path) -> None:
+    out = tmp_path / "out.txt"
+
+    def append(text: str) -> None:
+        with out.open("a", encoding="utf-8") as handle:
+            handle.write(text)
+
+    with WriteBehindWriter(queue_depth=2) as writer:
+        for index in range(10):
+            assert writer.submit(lambda index=index: append(f"{index},"))
+    stats = writer.stats()
+    assert out.read_text(encoding="utf-8") == "".join(f"{i}," for i in range(10))
+    assert stats.written == 10
+    assert stats.dropped == 0
+    assert stats.max_depth <= 2
+    assert stats.drain_sec >= 0.0
+
+
+def test_writer_drop_policy_and_errors() -> None:
+    gate = threading.Event()
+    writer = WriteBehindWriter(queue_depth=1, policy="drop")
+    writer.start()
+    accepted = [writer.submit(gate.wait) for _ in range(5)]
+    gate.set()
+    assert writer.submit(lambda: None, policy="block")
+    stats = writer.close()
+    # One job runs (blocked on the gate), one waits in the queue, the rest drop.
+    assert accepted.count(False) == stats.dropped
+    assert 3 <= stats.dropped <= 4
+    assert stats.written == 6 - stats.dropped
+
+    failing = WriteBehindWriter()
+    failing.start()
+    failing.submit(lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        failing.close()
+
+
+def test_bookmark_cache_reloads_on_change(tmp_path: Path) -> None:
+    path = tmp_path / "bookmarks.csv"
+    cache = BookmarkCache(path)
+    assert cache.get() == []
+    save_bookmarks(path, [Bookmark(freq_hz=100.0, label="a", notes="")])
+    assert [bm.label for bm in cache.get()] == ["a"]
+    assert [bm.label for bm in cache.get()] == ["a"]
+    assert cache.loads == 2
+    save_bookmarks(
+        path,
+        [Bookmark(freq_hz=100.0, label="a", notes=""), Bookmark(freq_hz=200.0, label="b", notes="")],
+    )
+    assert [bm.label for bm in cache.get()] == ["a", "b"]
+    assert cache.loads == 3